@@ -0,0 +1,67 @@
+"""Find related columns across every profiled table by values and by names.
+
+Reads data/profiles/ (run scripts/profile.py first) and writes the scored
+pairs to data/matches/value_overlap.json and data/matches/name_similarity.json.
+
+Usage:
+    python scripts/match.py
+    python scripts/match.py --database SalesDW --min-score 0.5 --top-k 3
+"""
+
+from __future__ import annotations
+
+import argparse
+import time
+
+from dw_profiler.config import ProfilerConfig
+from dw_profiler.matcher import ColumnRef, find_value_matches, write_matches
+from dw_profiler.name_index import find_name_matches
+from dw_profiler.store import read_profiles
+
+
+def main() -> None:
+    """Parse arguments, match the stored profiles and print the best pairs."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--database", help="Only match columns of this database")
+    parser.add_argument("--min-score", type=float, default=0.3)
+    parser.add_argument("--min-values", type=int, default=5)
+    parser.add_argument("--bands", type=int, default=32)
+    parser.add_argument("--num-perm", type=int, default=128)
+    parser.add_argument("--top-k", type=int, default=5, help="Name matches kept per column")
+    parser.add_argument("--min-name-score", type=float, default=0.6)
+    args = parser.parse_args()
+
+    settings = ProfilerConfig()
+    started = time.perf_counter()
+    profiles = read_profiles(settings.profiles_dir, args.database)
+    matches = find_value_matches(
+        profiles,
+        min_score=args.min_score,
+        min_values=args.min_values,
+        num_perm=args.num_perm,
+        bands=args.bands,
+    )
+    path = write_matches([m.to_dict() for m in matches], settings.matches_dir, "value_overlap")
+
+    for match in matches[:20]:
+        print(f"{match.confidence:.2f}  {match.source}  ->  {match.target}")
+    print(
+        f"\n{len(matches)} value-overlap pairs from {profiles.num_rows} columns "
+        f"in {time.perf_counter() - started:.1f}s, written to {path}"
+    )
+
+    started = time.perf_counter()
+    refs = [
+        ColumnRef(**row)
+        for row in profiles.select(["database", "schema", "table", "column"]).to_pylist()
+    ]
+    names = find_name_matches(refs, k=args.top_k, min_score=args.min_name_score)
+    path = write_matches([m.to_dict() for m in names], settings.matches_dir, "name_similarity")
+    print(
+        f"{len(names)} name-similarity pairs in {time.perf_counter() - started:.1f}s, "
+        f"written to {path}"
+    )
+
+
+if __name__ == "__main__":
+    main()
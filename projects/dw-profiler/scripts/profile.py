@@ -0,0 +1,72 @@
+"""Profile every table in a database and write the results under data/profiles/.
+
+Only tables whose catalog fingerprint moved since the last run are
+re-profiled; the rest keep their stored profile. --full re-profiles all.
+
+Usage:
+    python scripts/profile.py SalesDW
+    python scripts/profile.py SalesDW --schema dbo --workers 8
+    python scripts/profile.py SalesDW --table dbo.orders --table customers
+    python scripts/profile.py SalesDW --mode approx
+    python scripts/profile.py SalesDW --full
+"""
+
+from __future__ import annotations
+
+import argparse
+from dataclasses import replace
+
+from mssql_mcp.config import Config
+
+from dw_profiler.config import ProfilerConfig
+from dw_profiler.incremental import profile_incremental
+from dw_profiler.profiler import PROFILE_MODES
+
+
+def main() -> None:
+    """Parse arguments, profile the database and print a per-table summary."""
+    settings = ProfilerConfig()
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("database", nargs="?", help="Database to profile (default: MSSQL_DATABASE)")
+    parser.add_argument("--schema", default="", help="Only profile tables in this schema")
+    parser.add_argument(
+        "--table", action="append", dest="tables", help="Only profile this table (repeatable)"
+    )
+    parser.add_argument("--workers", type=int, default=settings.workers)
+    parser.add_argument("--top-n", type=int, default=settings.top_n)
+    parser.add_argument("--mode", choices=PROFILE_MODES, default=settings.mode)
+    parser.add_argument(
+        "--full", action="store_true", help="Re-profile every table, changed or not"
+    )
+    args = parser.parse_args()
+
+    cfg = Config()
+    settings = replace(settings, workers=args.workers, top_n=args.top_n, mode=args.mode)
+    run = profile_incremental(
+        cfg,
+        args.database or cfg.database,
+        settings,
+        schema=args.schema,
+        tables=args.tables,
+        full=args.full,
+    )
+
+    results = run.results
+    for result in results:
+        name = f"{result.schema}.{result.table}"
+        if result.error:
+            print(f"FAILED {name} ({result.elapsed_s:.1f}s): {result.error}")
+        else:
+            mode = "approximate" if result.approximate else "exact"
+            print(f"{name}: {len(result.profiles)} columns in {result.elapsed_s:.1f}s ({mode})")
+    for schema, table in run.removed:
+        print(f"Removed {schema}.{table} (no longer in the catalog)")
+    failed = sum(1 for result in results if result.error)
+    print(
+        f"\nProfiled {len(results) - failed} of {len(results)} tables "
+        f"into {settings.profiles_dir}; reused {len(run.reused)} unchanged"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,3 @@
+"""DW Profiler — profiles and relates columns across a SQL Server data warehouse."""
+
+__version__ = "0.1.0"
@@ -0,0 +1,80 @@
+"""Profiler settings loaded from environment variables.
+
+SQL Server connection settings are mssql_mcp's own MSSQL_* variables, so
+the profiler and the MCP server share one set of credentials and one
+connection pool implementation. The PROFILER_* variables here only
+control how profiling runs and where results are written.
+"""
+
+from __future__ import annotations
+
+import os
+from dataclasses import dataclass, field, replace
+from pathlib import Path
+
+from dotenv import load_dotenv
+from mssql_mcp.config import Config
+
+# Load .env from the project root (two levels up from this file)
+_env_path = Path(__file__).resolve().parents[2] / ".env"
+load_dotenv(_env_path)
+
+
+@dataclass(frozen=True)
+class ProfilerConfig:
+    """Immutable profiler configuration."""
+
+    # Tables profiled at once, each holding one pooled connection
+    workers: int = field(default_factory=lambda: int(os.getenv("PROFILER_WORKERS", "4")))
+
+    # Most frequent values kept per column
+    top_n: int = field(default_factory=lambda: int(os.getenv("PROFILER_TOP_N", "10")))
+
+    # Profiling queries scan whole tables, so they get far longer than
+    # the interactive MSSQL_QUERY_TIMEOUT
+    query_timeout: int = field(
+        default_factory=lambda: int(os.getenv("PROFILER_QUERY_TIMEOUT", "600"))
+    )
+
+    # "exact", "approx", or "auto" (approximate only tables of at least
+    # sample_threshold rows, by the sys.partitions row count)
+    mode: str = field(default_factory=lambda: os.getenv("PROFILER_MODE", "auto"))
+    sample_threshold: int = field(
+        default_factory=lambda: int(os.getenv("PROFILER_SAMPLE_THRESHOLD", "10000000"))
+    )
+
+    # Approximate mode reads about this many rows through TABLESAMPLE.
+    # Every profile keeps this many distinct values per column, those with
+    # the smallest hashes, for value-overlap matching
+    sample_rows: int = field(
+        default_factory=lambda: int(os.getenv("PROFILER_SAMPLE_ROWS", "100000"))
+    )
+    value_sample_size: int = field(
+        default_factory=lambda: int(os.getenv("PROFILER_VALUE_SAMPLE_SIZE", "1000"))
+    )
+
+    # Root of the data/ tree (metadata/, profiles/, matches/, ...)
+    data_dir: str = field(
+        default_factory=lambda: os.getenv(
+            "PROFILER_DATA_DIR", str(Path(__file__).resolve().parents[2] / "data")
+        )
+    )
+
+    @property
+    def profiles_dir(self) -> Path:
+        """Directory the per-table Parquet profiles are written to."""
+        return Path(self.data_dir) / "profiles"
+
+    @property
+    def matches_dir(self) -> Path:
+        """Directory the scored column pairs are written to."""
+        return Path(self.data_dir) / "matches"
+
+
+def connection_config(cfg: Config, settings: ProfilerConfig) -> Config:
+    """Return cfg sized for profiling: one pooled connection per worker, long timeouts."""
+    return replace(
+        cfg,
+        pool_size=max(cfg.pool_size, settings.workers),
+        query_timeout=settings.query_timeout,
+    )
@@ -0,0 +1,267 @@
+"""Incremental re-profiling: profile only the tables whose catalog fingerprint moved.
+
+A nightly crawl that re-scans every table wastes hours on tables nobody
+touched. Each table instead gets a fingerprint read from metadata alone:
+its sys.objects modify_date (moved by DDL), its row count from
+sys.partitions (moved by inserts and deletes), and, for tables with
+change tracking enabled, the latest SYS_CHANGE_VERSION in CHANGETABLE
+(moved by any committed change, updates included). Without change
+tracking, an update that leaves the row count alone goes unnoticed
+until the next full run.
+
+The fingerprints a database's profiles were built from are kept in its
+manifest.json, next to the Parquet files (see store.manifest_path). A
+run compares the current fingerprints with the manifest and re-profiles
+only tables that are new, moved, or lack a profile file; the cached
+Parquet profiles of everything else are reused as they are. A table
+that fails to profile is dropped from the manifest so the next run
+retries it. The manifest also records the settings that shape a
+profile, and any change to them makes every table stale.
+"""
+
+from __future__ import annotations
+
+import datetime
+import json
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Any
+
+import pyodbc
+from mssql_mcp.config import Config
+
+from dw_profiler.config import ProfilerConfig, connection_config
+from dw_profiler.profiler import (
+    TableResult,
+    choose_sample_percent,
+    fetch_rows,
+    profile_database,
+    quote_name,
+)
+from dw_profiler.store import manifest_path, profile_path
+
+_FINGERPRINT_SQL = """
+    SELECT
+        s.name AS [schema],
+        t.name AS [table],
+        t.modify_date AS modify_date,
+        SUM(p.rows) AS row_count,
+        CAST(CASE WHEN ctt.object_id IS NULL THEN 0 ELSE 1 END AS BIT) AS tracked
+    FROM sys.tables t
+    JOIN sys.schemas s ON s.schema_id = t.schema_id
+    JOIN sys.partitions p ON p.object_id = t.object_id AND p.index_id IN (0, 1)
+    LEFT JOIN sys.change_tracking_tables ctt ON ctt.object_id = t.object_id
+    WHERE t.is_ms_shipped = 0
+      AND (? = '' OR s.name = ?)
+    GROUP BY s.name, t.name, t.modify_date, ctt.object_id
+"""
+
+# Settings that change what a profile contains; cached profiles built
+# under different values are stale
+_PROFILE_SETTINGS = ("mode", "top_n", "sample_threshold", "sample_rows", "value_sample_size")
+
+
+@dataclass(frozen=True)
+class TableFingerprint:
+    """What the catalog says about a table, without reading the table."""
+
+    modify_date: str
+    row_count: int
+    change_version: int | None = None
+
+
+@dataclass
+class IncrementalRun:
+    """The outcome of an incremental profiling run."""
+
+    results: list[TableResult] = field(default_factory=list)
+    reused: list[tuple[str, str]] = field(default_factory=list)
+    removed: list[tuple[str, str]] = field(default_factory=list)
+    manifest: Path | None = None
+
+
+def _change_version_sql(schema: str, table: str) -> str:
+    """Build the query for the latest change-tracking version of a table after the given one.
+
+    Takes the last version seen (or NULL for all retained changes) as its
+    one parameter, so only changes since the previous run are read.
+    """
+    return (
+        "SELECT MAX(ct.SYS_CHANGE_VERSION) AS version\n"
+        f"FROM CHANGETABLE(CHANGES {quote_name(schema)}.{quote_name(table)}, ?) AS ct"
+    )
+
+
+def read_fingerprints(
+    cfg: Config,
+    database: str,
+    schema: str = "",
+    previous: dict[tuple[str, str], TableFingerprint] | None = None,
+    workers: int = 4,
+) -> dict[tuple[str, str], TableFingerprint]:
+    """Return every user table's current fingerprint, keyed by (schema, table).
+
+    Change-tracking versions are read only for tracked tables, starting
+    from the version in previous, and keep that version when nothing has
+    changed since. A table whose version can't be read (no VIEW CHANGE
+    TRACKING permission, or a last version older than the retention
+    period) gets None, which differs from any version it had before.
+    """
+    previous = previous or {}
+    rows = fetch_rows(cfg, database, _FINGERPRINT_SQL, (schema, schema))
+
+    def fingerprint(row: dict[str, Any]) -> TableFingerprint:
+        key = (row["schema"], row["table"])
+        version = None
+        if row["tracked"]:
+            last = previous[key].change_version if key in previous else None
+            try:
+                (latest,) = fetch_rows(cfg, database, _change_version_sql(*key), (last,))
+                version = latest["version"] if latest["version"] is not None else last
+            except pyodbc.Error:
+                version = None
+        modified = row["modify_date"]
+        if isinstance(modified, datetime.datetime):
+            modified = modified.isoformat()
+        return TableFingerprint(str(modified), int(row["row_count"] or 0), version)
+
+    if not rows:
+        return {}
+    with ThreadPoolExecutor(max_workers=max(1, min(workers, len(rows)))) as pool:
+        prints = list(pool.map(fingerprint, rows))
+    return {(row["schema"], row["table"]): fp for row, fp in zip(rows, prints)}
+
+
+def profile_settings(settings: ProfilerConfig) -> dict[str, Any]:
+    """Return the settings that shape a profile, as stored in the manifest."""
+    return {name: getattr(settings, name) for name in _PROFILE_SETTINGS}
+
+
+def read_manifest(
+    profiles_dir: Path | str, database: str, settings: ProfilerConfig | None = None
+) -> dict[tuple[str, str], TableFingerprint]:
+    """Read a database's manifest, or {} if there is none.
+
+    With settings given, a manifest written under different profile
+    settings also reads as {}, since none of its profiles are reusable.
+    """
+    path = manifest_path(profiles_dir, database)
+    if not path.exists():
+        return {}
+    data = json.loads(path.read_text())
+    if settings is not None and data.get("settings") != profile_settings(settings):
+        return {}
+    return {
+        (entry["schema"], entry["table"]): TableFingerprint(
+            entry["modify_date"], entry["row_count"], entry.get("change_version")
+        )
+        for entry in data.get("tables", [])
+    }
+
+
+def write_manifest(
+    fingerprints: dict[tuple[str, str], TableFingerprint],
+    profiles_dir: Path | str,
+    database: str,
+    settings: ProfilerConfig,
+) -> Path:
+    """Write a database's manifest, replacing any previous one."""
+    path = manifest_path(profiles_dir, database)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    data = {
+        "settings": profile_settings(settings),
+        "tables": [
+            {"schema": schema, "table": table, **asdict(fp)}
+            for (schema, table), fp in sorted(fingerprints.items())
+        ],
+    }
+    partial = path.with_suffix(".json.tmp")
+    partial.write_text(json.dumps(data, indent=2))
+    partial.replace(path)
+    return path
+
+
+def stale_tables(
+    current: dict[tuple[str, str], TableFingerprint],
+    previous: dict[tuple[str, str], TableFingerprint],
+    profiles_dir: Path | str,
+    database: str,
+) -> list[tuple[str, str]]:
+    """Return the tables whose fingerprint moved or whose profile file is missing, sorted."""
+    return sorted(
+        key
+        for key, fp in current.items()
+        if previous.get(key) != fp or not profile_path(profiles_dir, database, *key).exists()
+    )
+
+
+def profile_incremental(
+    cfg: Config,
+    database: str,
+    settings: ProfilerConfig | None = None,
+    schema: str = "",
+    tables: list[str] | None = None,
+    full: bool = False,
+) -> IncrementalRun:
+    """Re-profile only the tables that changed since the last run, and update the manifest.
+
+    Tables dropped since the last run lose their manifest entry and
+    profile file, so the matcher stops seeing them.
+
+    Args:
+        cfg: Server configuration.
+        database: Database to profile.
+        settings: Worker count, profiling mode and output directory.
+        schema: Only consider tables in this schema; all schemas if blank.
+        tables: Only consider these tables, as "schema.table" or "table".
+        full: Re-profile every table regardless of the manifest.
+
+    Returns:
+        The tables profiled this run, the ones whose cached profile was
+        reused, and the ones removed because they no longer exist.
+    """
+    settings = settings or ProfilerConfig()
+    choose_sample_percent(settings, 0)  # reject an unknown mode before any query runs
+    profiles_dir = settings.profiles_dir
+    previous = read_manifest(profiles_dir, database, settings)
+    current = read_fingerprints(
+        connection_config(cfg, settings), database, schema, previous, settings.workers
+    )
+
+    wanted = set(tables or ())
+
+    def in_scope(key: tuple[str, str]) -> bool:
+        if schema and key[0] != schema:
+            return False
+        return not wanted or key[1] in wanted or f"{key[0]}.{key[1]}" in wanted
+
+    current = {key: fp for key, fp in current.items() if in_scope(key)}
+    stale = sorted(current) if full else stale_tables(current, previous, profiles_dir, database)
+    run = IncrementalRun(reused=sorted(set(current) - set(stale)))
+
+    manifest = dict(previous)
+    for key in sorted(previous):
+        if in_scope(key) and key not in current:
+            del manifest[key]
+            profile_path(profiles_dir, database, *key).unlink(missing_ok=True)
+            run.removed.append(key)
+
+    if stale:
+        run.results = profile_database(
+            cfg,
+            database,
+            settings,
+            schema=schema,
+            tables=[f"{s}.{t}" for s, t in stale],
+            row_counts={key: current[key].row_count for key in stale},
+        )
+    for result in run.results:
+        key = (result.schema, result.table)
+        if result.error:
+            manifest.pop(key, None)
+        else:
+            manifest[key] = current[key]
+
+    run.manifest = write_manifest(manifest, profiles_dir, database, settings)
+    return run
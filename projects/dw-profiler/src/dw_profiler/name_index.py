@@ -0,0 +1,236 @@
+"""Phase 3, layer 2: relationships inferred from similar column names.
+
+Names are normalized before comparison. They are split on case changes,
+digits and separators (mssql_mcp's normalize_identifier), and common
+warehouse abbreviations are expanded. The words are then run together,
+so customer_id, CustomerID and cust_id all become "customerid". A last
+word naming a key (id, number or key, however abbreviated) is kept as a
+separate "#key" token instead, so customer_id, cust_no and CustomerKey
+all index as "customer#key". A pair that only matches through that
+class, like customer_id and cust_no, scores KEY_SUFFIX_WEIGHT of an
+exact match, so it still passes the default min_score but ranks and
+weighs below two columns with the same suffix. "code" is not a key
+suffix: StateCode and StateID name different things.
+
+Comparing every pair of names with a string distance is quadratic. Each
+distinct normalized name is instead split into character trigrams and
+added to an inverted index from trigram to names. A query walks only
+the postings of its own trigrams, so it touches just the names sharing
+a trigram with it. In a large index, trigrams found in more than max_df
+of all names (like "id$") add little evidence and are skipped while
+gathering candidates.
+Candidates are then scored exactly: the Jaccard similarity of the two
+trigram sets.
+"""
+
+from __future__ import annotations
+
+import heapq
+from collections import Counter, defaultdict
+from collections.abc import Iterable
+from dataclasses import dataclass
+from typing import Any
+
+from mssql_mcp.schema_index import normalize_identifier
+
+from dw_profiler.matcher import ColumnRef
+
+# Architecture scoring: name similarity is weighted 0.9 in edge confidence
+NAME_SIMILARITY_WEIGHT = 0.9
+
+# Share of the score kept when two names match only through their key
+# suffix class (customer_id and cust_no), not the same suffix
+KEY_SUFFIX_WEIGHT = 0.8
+
+# Postings a gram needs before it can count as too common to look up
+_MIN_COMMON_POSTINGS = 100
+
+ABBREVIATIONS = {
+    "acct": "account",
+    "addr": "address",
+    "amt": "amount",
+    "bal": "balance",
+    "cd": "code",
+    "cnt": "count",
+    "cust": "customer",
+    "dept": "department",
+    "desc": "description",
+    "dt": "date",
+    "emp": "employee",
+    "ident": "id",
+    "identifier": "id",
+    "nbr": "number",
+    "no": "number",
+    "num": "number",
+    "pct": "percent",
+    "prod": "product",
+    "qty": "quantity",
+    "ts": "timestamp",
+}
+
+
+# Last words that all mark a column as some entity's key
+KEY_SUFFIXES = frozenset({"id", "key", "number"})
+
+
+def _split_name(name: str) -> tuple[str, str]:
+    """Return (normalized name, key suffix as spelled, or "" if it has none)."""
+    words = [ABBREVIATIONS.get(word, word) for word in normalize_identifier(name).split()]
+    if len(words) > 1 and words[-1] in KEY_SUFFIXES:
+        return "".join(words[:-1]) + "#key", words[-1]
+    return "".join(words), ""
+
+
+def normalize_name(name: str) -> str:
+    """Reduce a column name to lowercase words with abbreviations expanded, run together.
+
+    A key suffix after at least one other word becomes the token "#key".
+    """
+    return _split_name(name)[0]
+
+
+def ngrams(text: str, n: int = 3) -> frozenset[str]:
+    """Return the character n-grams of text, padded so short names still have some."""
+    padded = f"${text}$"
+    if len(padded) <= n:
+        return frozenset({padded})
+    return frozenset(padded[i : i + n] for i in range(len(padded) - n + 1))
+
+
+@dataclass
+class NameMatch:
+    """A scored pair of columns whose names are similar."""
+
+    source: ColumnRef
+    target: ColumnRef
+    similarity: float
+
+    @property
+    def confidence(self) -> float:
+        """Edge confidence for the graph: the name similarity, weighted."""
+        return round(NAME_SIMILARITY_WEIGHT * self.similarity, 4)
+
+    def to_dict(self) -> dict[str, Any]:
+        """Flatten to the match record format the graph import reads."""
+        return {
+            "source_db": self.source.database,
+            "source_schema": self.source.schema,
+            "source_table": self.source.table,
+            "source_col": self.source.column,
+            "target_db": self.target.database,
+            "target_schema": self.target.schema,
+            "target_table": self.target.table,
+            "target_col": self.target.column,
+            "method": "name",
+            "name_similarity": round(self.similarity, 4),
+            "confidence": self.confidence,
+            "evidence": (
+                f"{self.source.column} and {self.target.column} normalize to names "
+                f"{self.similarity:.0%} similar by trigram overlap and key suffix"
+            ),
+        }
+
+
+class NameIndex:
+    """Character n-gram inverted index over column names."""
+
+    def __init__(self, columns: Iterable[ColumnRef], n: int = 3, max_df: float = 0.05) -> None:
+        self.n = n
+        self._columns: dict[str, list[ColumnRef]] = defaultdict(list)
+        self._suffixes: dict[ColumnRef, str] = {}
+        for ref in columns:
+            normalized, self._suffixes[ref] = _split_name(ref.column)
+            self._columns[normalized].append(ref)
+        self._grams = {name: ngrams(name, n) for name in self._columns}
+
+        self._postings: dict[str, list[str]] = defaultdict(list)
+        for name, grams in self._grams.items():
+            for gram in grams:
+                self._postings[gram].append(name)
+        # Very common grams would pull in most of the index for every query;
+        # small indexes are cheap to scan, so nothing is skipped there
+        limit = max(_MIN_COMMON_POSTINGS, int(max_df * len(self._grams)))
+        self._common = {gram for gram, names in self._postings.items() if len(names) > limit}
+        for refs in self._columns.values():
+            refs.sort()
+        self._cache: dict[tuple[str, int, float], list[tuple[str, float]]] = {}
+
+    def __len__(self) -> int:
+        return len(self._grams)
+
+    def similar_names(
+        self, name: str, k: int = 10, min_score: float = 0.0
+    ) -> list[tuple[str, float]]:
+        """Return up to k indexed normalized names most similar to name, best first.
+
+        The name itself is included (with score 1.0) if it is indexed.
+        """
+        normalized = normalize_name(name)
+        key = (normalized, k, min_score)
+        if key in self._cache:
+            return self._cache[key]
+
+        grams = self._grams.get(normalized) or ngrams(normalized, self.n)
+        rare = [gram for gram in grams if gram not in self._common] or list(grams)
+        shared: Counter[str] = Counter()
+        for gram in rare:
+            shared.update(self._postings.get(gram, ()))
+
+        # With no grams skipped, the posting counts are the exact overlaps
+        exact_counts = len(rare) == len(grams)
+        scored = []
+        for candidate, count in shared.items():
+            other = self._grams[candidate]
+            # Jaccard can't exceed the ratio of the two set sizes
+            if min(len(grams), len(other)) < min_score * max(len(grams), len(other)):
+                continue
+            overlap = count if exact_counts else len(grams & other)
+            score = overlap / (len(grams) + len(other) - overlap)
+            if score >= min_score:
+                scored.append((score, candidate))
+        result = [(c, s) for s, c in heapq.nlargest(k, scored)]
+        self._cache[key] = result
+        return result
+
+    def similar_columns(
+        self, ref: ColumnRef, k: int = 5, min_score: float = 0.6
+    ) -> list[tuple[ColumnRef, float]]:
+        """Return up to k columns in other tables whose names are most similar to ref's.
+
+        Columns with a different key suffix from ref's (id and number, say)
+        score KEY_SUFFIX_WEIGHT of their name similarity.
+        """
+        suffix = _split_name(ref.column)[1]
+        result: list[tuple[ColumnRef, float]] = []
+        for name, score in self.similar_names(ref.column, k + 1, min_score):
+            for other in self._columns[name]:
+                if (other.database, other.schema, other.table) == (
+                    ref.database, ref.schema, ref.table
+                ):
+                    continue
+                other_suffix = self._suffixes[other]
+                weighted = score
+                if suffix and other_suffix and other_suffix != suffix:
+                    weighted = score * KEY_SUFFIX_WEIGHT
+                if weighted >= min_score:
+                    result.append((other, weighted))
+        result.sort(key=lambda pair: (-pair[1], pair[0]))
+        return result[:k]
+
+
+def find_name_matches(
+    columns: Iterable[ColumnRef], k: int = 5, min_score: float = 0.6, n: int = 3
+) -> list[NameMatch]:
+    """Find each column's k most similar column names in other tables, best first.
+
+    Each pair appears once, however many of the two columns list the other.
+    """
+    columns = list(columns)
+    index = NameIndex(columns, n=n)
+    pairs: dict[tuple[ColumnRef, ColumnRef], float] = {}
+    for ref in columns:
+        for other, score in index.similar_columns(ref, k, min_score):
+            pairs[min(ref, other), max(ref, other)] = score
+    matches = [NameMatch(a, b, score) for (a, b), score in pairs.items()]
+    matches.sort(key=lambda m: (-m.similarity, m.source, m.target))
+    return matches
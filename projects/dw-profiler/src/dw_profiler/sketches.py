@@ -0,0 +1,197 @@
+"""Mergeable sketches of a column's values.
+
+All three sketches use fixed memory however many values they see. Two
+sketches built from different chunks of a column merge into the sketch
+of the combined chunks. That holds for fetch batches, table partitions,
+or separate profiling runs.
+
+HyperLogLog
+    Estimates the number of distinct values. Its relative standard error
+    is 1.04 / sqrt(2 ** precision), about 1.6% at the default precision.
+
+BottomK
+    Keeps the ``size`` distinct values with the smallest value_hash. The
+    bottom-k of combined chunks is the bottom-k of their bottom-k samples,
+    so merging loses nothing.
+
+HeavyHitters
+    Counts the most frequent values with at most ``capacity`` counters
+    (Misra-Gries). Every count is at most ``error`` below the true count,
+    and ``error`` never exceeds seen / (capacity + 1). Merging adds the
+    counters and prunes them back to capacity, keeping that bound.
+
+Value samples for matching are BottomK samples, not random ones: SQL
+Server computes the same value_hash as HASHBYTES('MD5', value), so exact
+profiles rank values in SQL and approximate profiles sketch the sampled
+rows in Python, in the same order. Every column is sampled in that
+order, so two related columns keep the same values.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import heapq
+import math
+from collections import Counter
+from typing import Any
+
+
+def stable_hash(value: Any) -> int:
+    """Hash a value to 64 bits, stable across processes (unlike hash())."""
+    data = value.encode() if isinstance(value, str) else str(value).encode()
+    return int.from_bytes(hashlib.blake2b(data, digest_size=8).digest(), "big")
+
+
+def value_hash(value: str) -> bytes:
+    """Return the MD5 digest SQL Server's HASHBYTES('MD5', value) gives an NVARCHAR value.
+
+    Comparing digests as bytes orders values the way ORDER BY HASHBYTES(...)
+    does, so samples drawn in SQL and in Python agree.
+    """
+    return hashlib.md5(value.encode("utf-16-le")).digest()
+
+
+class HyperLogLog:
+    """Distinct-count estimator with 2 ** precision one-byte registers."""
+
+    def __init__(self, precision: int = 12, registers: bytes | None = None) -> None:
+        if not 4 <= precision <= 16:
+            raise ValueError(f"precision must be between 4 and 16, got {precision}")
+        self.precision = precision
+        self._m = 1 << precision
+        self._registers = bytearray(registers) if registers is not None else bytearray(self._m)
+        if len(self._registers) != self._m:
+            raise ValueError(f"Expected {self._m} registers, got {len(self._registers)}")
+
+    @property
+    def relative_error(self) -> float:
+        """Standard error of estimate() as a fraction of the true count."""
+        return 1.04 / math.sqrt(self._m)
+
+    def add(self, value: Any) -> None:
+        """Count one value; None is ignored."""
+        if value is None:
+            return
+        x = stable_hash(value)
+        index = x >> (64 - self.precision)
+        rest = x & ((1 << (64 - self.precision)) - 1)
+        rank = (64 - self.precision) - rest.bit_length() + 1
+        if rank > self._registers[index]:
+            self._registers[index] = rank
+
+    def update(self, values: Any) -> None:
+        """Count every value in an iterable."""
+        for value in values:
+            self.add(value)
+
+    def merge(self, other: HyperLogLog) -> HyperLogLog:
+        """Return the sketch of both sketches' values combined."""
+        if other.precision != self.precision:
+            raise ValueError("Can't merge HyperLogLog sketches of different precision")
+        return HyperLogLog(self.precision, bytes(map(max, self._registers, other._registers)))
+
+    def estimate(self) -> int:
+        """Return the estimated number of distinct values added."""
+        m = self._m
+        alpha = 0.7213 / (1 + 1.079 / m)
+        estimate = alpha * m * m / sum(2.0**-r for r in self._registers)
+        zeros = self._registers.count(0)
+        if estimate <= 2.5 * m and zeros:
+            # Linear counting is more accurate while many registers are empty
+            estimate = m * math.log(m / zeros)
+        return round(estimate)
+
+    def to_bytes(self) -> bytes:
+        """Serialize the registers; HyperLogLog.from_bytes() reverses this."""
+        return bytes(self._registers)
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> HyperLogLog:
+        """Rebuild a sketch from to_bytes() output."""
+        return cls(int(math.log2(len(data))), data)
+
+
+class BottomK:
+    """The at most size distinct values with the smallest value_hash."""
+
+    def __init__(self, size: int = 1000) -> None:
+        if size < 0:
+            raise ValueError(f"size must not be negative, got {size}")
+        self.size = size
+        self._items: dict[bytes, str] = {}
+
+    @property
+    def values(self) -> list[str]:
+        """The kept values, in hash order."""
+        return [self._items[digest] for digest in sorted(self._items)]
+
+    def add(self, value: str | None) -> None:
+        """Offer one value to the sample; None is ignored."""
+        self.update((value,))
+
+    def update(self, values: Any) -> None:
+        """Offer every value in an iterable, trimming once at the end."""
+        for value in set(values):
+            if value is not None:
+                self._items[value_hash(value)] = value
+        self._trim()
+
+    def merge(self, other: BottomK) -> BottomK:
+        """Return the sample of both samples' values combined."""
+        merged = BottomK(max(self.size, other.size))
+        merged._items = {**self._items, **other._items}
+        merged._trim()
+        return merged
+
+    def _trim(self) -> None:
+        if len(self._items) > self.size:
+            self._items = dict(heapq.nsmallest(self.size, self._items.items()))
+
+
+class HeavyHitters:
+    """Frequent-value counts kept in at most capacity counters."""
+
+    def __init__(self, capacity: int = 1000) -> None:
+        if capacity < 1:
+            raise ValueError(f"capacity must be at least 1, got {capacity}")
+        self.capacity = capacity
+        self.seen = 0
+        self.error = 0
+        self.counts: dict[Any, int] = {}
+
+    def add(self, value: Any) -> None:
+        """Count one value; None is ignored."""
+        self.update((value,))
+
+    def update(self, values: Any) -> None:
+        """Count every value in an iterable, pruning once at the end."""
+        batch = Counter(value for value in values if value is not None)
+        self.seen += batch.total()
+        for value, count in batch.items():
+            self.counts[value] = self.counts.get(value, 0) + count
+        self._prune()
+
+    def merge(self, other: HeavyHitters) -> HeavyHitters:
+        """Return the summary of both summaries' values combined."""
+        merged = HeavyHitters(max(self.capacity, other.capacity))
+        merged.seen = self.seen + other.seen
+        merged.error = self.error + other.error
+        merged.counts = dict(self.counts)
+        for value, count in other.counts.items():
+            merged.counts[value] = merged.counts.get(value, 0) + count
+        merged._prune()
+        return merged
+
+    def most_common(self, n: int) -> list[tuple[Any, int]]:
+        """Return the n values with the highest counts, highest first."""
+        return Counter(self.counts).most_common(n)
+
+    def _prune(self) -> None:
+        # Subtracting the (capacity + 1)-th largest count from every
+        # counter drops at least one and lowers each true count by the same
+        # amount, which error records
+        if len(self.counts) <= self.capacity:
+            return
+        cut = heapq.nlargest(self.capacity + 1, self.counts.values())[-1]
+        self.counts = {value: count - cut for value, count in self.counts.items() if count > cut}
+        self.error += cut
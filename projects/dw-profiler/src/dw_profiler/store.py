@@ -0,0 +1,132 @@
+"""Read and write column profiles as Parquet.
+
+Profiles are stored one file per table, at
+``<profiles_dir>/<database>/<schema>.<table>.parquet``, with one row per
+column. Each name is percent-encoded: everything but ASCII letters,
+digits, ``_`` and ``-`` becomes ``%XX`` per UTF-8 byte, dots included,
+so the dot between schema and table is unambiguous and two different
+tables never share a file (``a.b``+``c`` and ``a``+``b.c``, or
+``Order Details`` and ``Order_Details``). Per-table files let a re-run replace just the tables it
+profiled, and let the matcher read a whole database with one
+``read_profiles`` call. Each database directory also holds the
+``manifest.json`` that incremental runs use to decide which of its
+profiles are still current.
+"""
+
+from __future__ import annotations
+
+import re
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+if TYPE_CHECKING:
+    from dw_profiler.profiler import ColumnProfile
+
+PROFILE_SCHEMA = pa.schema(
+    [
+        pa.field("database", pa.string()),
+        pa.field("schema", pa.string()),
+        pa.field("table", pa.string()),
+        pa.field("column", pa.string()),
+        pa.field("ordinal", pa.int32()),
+        pa.field("data_type", pa.string()),
+        pa.field("row_count", pa.int64()),
+        pa.field("null_count", pa.int64()),
+        pa.field("null_rate", pa.float64()),
+        pa.field("distinct_count", pa.int64()),
+        pa.field("min_value", pa.string()),
+        pa.field("max_value", pa.string()),
+        pa.field(
+            "top_values",
+            pa.list_(pa.struct([pa.field("value", pa.string()), pa.field("count", pa.int64())])),
+        ),
+        pa.field("profiled_at", pa.timestamp("us", tz="UTC")),
+        pa.field("approximate", pa.bool_()),
+        pa.field("sample_rows", pa.int64()),
+        pa.field("distinct_error", pa.float64()),
+        pa.field("frequency_error", pa.float64()),
+        pa.field("sample_values", pa.list_(pa.string())),
+        pa.field("distinct_sketch", pa.binary()),
+    ]
+)
+
+_UNSAFE = re.compile(r"[^A-Za-z0-9_\-]")
+
+
+def _safe_name(name: str) -> str:
+    """Percent-encode an identifier into a file name that can't contain a dot or separator."""
+    return _UNSAFE.sub(lambda m: "".join(f"%{b:02X}" for b in m.group().encode()), name)
+
+
+def profile_path(profiles_dir: Path | str, database: str, schema: str, table: str) -> Path:
+    """Return the Parquet file holding one table's profile."""
+    filename = f"{_safe_name(schema)}.{_safe_name(table)}.parquet"
+    return Path(profiles_dir) / _safe_name(database) / filename
+
+
+def manifest_path(profiles_dir: Path | str, database: str) -> Path:
+    """Return the JSON manifest of the catalog fingerprints a database's profiles match."""
+    return Path(profiles_dir) / _safe_name(database) / "manifest.json"
+
+
+def write_profiles(profiles: list[ColumnProfile], profiles_dir: Path | str) -> Path:
+    """Write one table's column profiles to its Parquet file, replacing any previous one.
+
+    The file is written next to its destination and renamed into place,
+    so readers never see a half-written profile.
+
+    Raises:
+        ValueError: If profiles is empty or spans more than one table.
+    """
+    tables = {(p.database, p.schema, p.table) for p in profiles}
+    if len(tables) != 1:
+        raise ValueError(f"Expected the profiles of exactly one table, got {len(tables)}")
+    path = profile_path(profiles_dir, *tables.pop())
+    path.parent.mkdir(parents=True, exist_ok=True)
+
+    data = pa.Table.from_pylist(
+        [
+            {
+                "database": p.database,
+                "schema": p.schema,
+                "table": p.table,
+                "column": p.column,
+                "ordinal": p.ordinal,
+                "data_type": p.data_type,
+                "row_count": p.row_count,
+                "null_count": p.null_count,
+                "null_rate": p.null_rate,
+                "distinct_count": p.distinct_count,
+                "min_value": p.min_value,
+                "max_value": p.max_value,
+                "top_values": p.top_values,
+                "profiled_at": p.profiled_at,
+                "approximate": p.approximate,
+                "sample_rows": p.sample_rows,
+                "distinct_error": p.distinct_error,
+                "frequency_error": p.frequency_error,
+                "sample_values": p.sample_values,
+                "distinct_sketch": p.distinct_sketch,
+            }
+            for p in profiles
+        ],
+        schema=PROFILE_SCHEMA,
+    )
+    partial = path.with_suffix(".parquet.tmp")
+    pq.write_table(data, partial)
+    partial.replace(path)
+    return path
+
+
+def read_profiles(profiles_dir: Path | str, database: str | None = None) -> pa.Table:
+    """Read every stored profile, or only one database's, as a single Arrow table."""
+    root = Path(profiles_dir)
+    if database is not None:
+        root = root / _safe_name(database)
+    files = sorted(root.rglob("*.parquet"))
+    if not files:
+        return PROFILE_SCHEMA.empty_table()
+    return pa.concat_tables(pq.read_table(f, schema=PROFILE_SCHEMA) for f in files)
@@ -0,0 +1,40 @@
+"""Shared test fixtures for the DW profiler."""
+
+from __future__ import annotations
+
+from pathlib import Path
+
+import pytest
+from mssql_mcp.config import Config
+from mssql_mcp.database import close_pools
+
+from dw_profiler.config import ProfilerConfig
+
+
+@pytest.fixture(autouse=True)
+def reset_pools():
+    """Drop pooled connections so mocks never leak between tests."""
+    yield
+    close_pools()
+
+
+@pytest.fixture()
+def config() -> Config:
+    """Return a test SQL Server config with SQL auth."""
+    return Config(
+        host="test-server",
+        port=1433,
+        database="test_db",
+        user="test_user",
+        password="test_pass",
+        windows_auth=False,
+        read_only=True,
+    )
+
+
+@pytest.fixture()
+def settings(tmp_path: Path) -> ProfilerConfig:
+    """Return profiler settings writing under a temporary data directory."""
+    return ProfilerConfig(
+        workers=4, top_n=3, query_timeout=60, mode="exact", data_dir=str(tmp_path)
+    )
@@ -0,0 +1,194 @@
+"""Tests for incremental re-profiling."""
+
+from __future__ import annotations
+
+import datetime
+import json
+from dataclasses import replace
+from unittest.mock import MagicMock, patch
+
+import pyodbc
+from mssql_mcp.config import Config
+
+from dw_profiler.config import ProfilerConfig
+from dw_profiler.incremental import (
+    TableFingerprint,
+    profile_incremental,
+    read_fingerprints,
+    read_manifest,
+    stale_tables,
+    write_manifest,
+)
+from dw_profiler.profiler import TableResult
+from dw_profiler.store import manifest_path, profile_path
+
+MODIFIED = datetime.datetime(2024, 5, 1, 12, 30)
+
+
+def _row(table: str, rows: int = 10, tracked: bool = False, schema: str = "dbo") -> dict:
+    return {
+        "schema": schema, "table": table, "modify_date": MODIFIED,
+        "row_count": rows, "tracked": tracked,
+    }
+
+
+def _profiled(settings: ProfilerConfig, *tables: str) -> None:
+    """Create placeholder profile files, as if the tables were profiled before."""
+    for table in tables:
+        path = profile_path(settings.profiles_dir, "dw", "dbo", table)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_bytes(b"")
+
+
+class TestFingerprints:
+    @patch("dw_profiler.incremental.fetch_rows")
+    def test_reads_catalog_fingerprints(self, mock_fetch: MagicMock, config: Config) -> None:
+        """Untracked tables are fingerprinted from the catalog query alone."""
+        mock_fetch.return_value = [_row("wells", rows=42)]
+
+        prints = read_fingerprints(config, "dw")
+
+        assert prints == {("dbo", "wells"): TableFingerprint(MODIFIED.isoformat(), 42)}
+        assert mock_fetch.call_count == 1
+
+    @patch("dw_profiler.incremental.fetch_rows")
+    def test_change_version_starts_from_previous(
+        self, mock_fetch: MagicMock, config: Config
+    ) -> None:
+        """Tracked tables read changes since their last version, keeping it if none."""
+        previous = {("dbo", "wells"): TableFingerprint(MODIFIED.isoformat(), 10, 7)}
+        mock_fetch.side_effect = [[_row("wells", tracked=True)], [{"version": None}]]
+
+        prints = read_fingerprints(config, "dw", previous=previous)
+
+        assert prints[("dbo", "wells")].change_version == 7
+        sql, params = mock_fetch.call_args.args[2:]
+        assert "CHANGETABLE(CHANGES [dbo].[wells], ?)" in sql
+        assert params == (7,)
+
+    @patch("dw_profiler.incremental.fetch_rows")
+    def test_unreadable_change_version_is_none(
+        self, mock_fetch: MagicMock, config: Config
+    ) -> None:
+        """A failed CHANGETABLE read should make the version unknown, not fail the run."""
+        previous = {("dbo", "wells"): TableFingerprint(MODIFIED.isoformat(), 10, 7)}
+        mock_fetch.side_effect = [[_row("wells", tracked=True)], pyodbc.Error("denied")]
+
+        prints = read_fingerprints(config, "dw", previous=previous)
+
+        assert prints[("dbo", "wells")].change_version is None
+        assert prints != previous
+
+
+class TestManifest:
+    def test_round_trip(self, settings: ProfilerConfig) -> None:
+        """A written manifest should read back under the same settings only."""
+        prints = {("dbo", "wells"): TableFingerprint("2024-05-01T12:30:00", 10, 3)}
+        path = write_manifest(prints, settings.profiles_dir, "dw", settings)
+
+        assert path == manifest_path(settings.profiles_dir, "dw")
+        assert json.loads(path.read_text())["settings"]["mode"] == "exact"
+        assert read_manifest(settings.profiles_dir, "dw", settings) == prints
+        assert read_manifest(settings.profiles_dir, "dw", replace(settings, top_n=20)) == {}
+        assert read_manifest(settings.profiles_dir, "other") == {}
+
+    def test_stale_tables(self, settings: ProfilerConfig) -> None:
+        """New, moved and unprofiled tables are stale; the rest are reused."""
+        same = TableFingerprint("a", 10)
+        previous = {("dbo", "kept"): same, ("dbo", "moved"): same, ("dbo", "lost"): same}
+        current = {
+            ("dbo", "kept"): same,
+            ("dbo", "moved"): replace(same, row_count=11),
+            ("dbo", "lost"): same,
+            ("dbo", "new"): same,
+        }
+        _profiled(settings, "kept", "moved")
+
+        stale = stale_tables(current, previous, settings.profiles_dir, "dw")
+
+        assert stale == [("dbo", "lost"), ("dbo", "moved"), ("dbo", "new")]
+
+
+class TestProfileIncremental:
+    @patch("dw_profiler.incremental.profile_database")
+    @patch("dw_profiler.incremental.read_fingerprints")
+    def test_profiles_only_changed_tables(
+        self,
+        mock_prints: MagicMock,
+        mock_profile: MagicMock,
+        config: Config,
+        settings: ProfilerConfig,
+    ) -> None:
+        """Unchanged tables keep their profile; failures and drops leave the manifest."""
+        old = TableFingerprint("a", 10)
+        write_manifest(
+            {("dbo", "kept"): old, ("dbo", "moved"): old, ("dbo", "dropped"): old},
+            settings.profiles_dir, "dw", settings,
+        )
+        _profiled(settings, "kept", "moved", "dropped")
+        mock_prints.return_value = {
+            ("dbo", "kept"): old,
+            ("dbo", "moved"): replace(old, row_count=20),
+            ("dbo", "broken"): old,
+        }
+        mock_profile.return_value = [
+            TableResult("dbo", "broken", error="timeout"),
+            TableResult("dbo", "moved"),
+        ]
+
+        run = profile_incremental(config, "dw", settings)
+
+        kwargs = mock_profile.call_args.kwargs
+        assert kwargs["tables"] == ["dbo.broken", "dbo.moved"]
+        assert kwargs["row_counts"] == {("dbo", "broken"): 10, ("dbo", "moved"): 20}
+        assert run.reused == [("dbo", "kept")]
+        assert run.removed == [("dbo", "dropped")]
+        assert not profile_path(settings.profiles_dir, "dw", "dbo", "dropped").exists()
+        assert read_manifest(settings.profiles_dir, "dw", settings) == {
+            ("dbo", "kept"): old,
+            ("dbo", "moved"): replace(old, row_count=20),
+        }
+
+    @patch("dw_profiler.incremental.profile_database")
+    @patch("dw_profiler.incremental.read_fingerprints")
+    def test_nothing_changed_runs_no_profiles(
+        self,
+        mock_prints: MagicMock,
+        mock_profile: MagicMock,
+        config: Config,
+        settings: ProfilerConfig,
+    ) -> None:
+        """With every fingerprint unchanged, no table is profiled at all."""
+        old = TableFingerprint("a", 10)
+        write_manifest({("dbo", "kept"): old}, settings.profiles_dir, "dw", settings)
+        _profiled(settings, "kept")
+        mock_prints.return_value = {("dbo", "kept"): old}
+
+        run = profile_incremental(config, "dw", settings)
+
+        mock_profile.assert_not_called()
+        assert run.results == []
+        assert run.reused == [("dbo", "kept")]
+
+    @patch("dw_profiler.incremental.profile_database", return_value=[])
+    @patch("dw_profiler.incremental.read_fingerprints")
+    def test_scope_and_full(
+        self,
+        mock_prints: MagicMock,
+        mock_profile: MagicMock,
+        config: Config,
+        settings: ProfilerConfig,
+    ) -> None:
+        """full re-profiles everything in scope; entries outside the schema are kept."""
+        old = TableFingerprint("a", 10)
+        elsewhere = ("stage", "loads")
+        write_manifest(
+            {("dbo", "kept"): old, elsewhere: old}, settings.profiles_dir, "dw", settings
+        )
+        _profiled(settings, "kept")
+        mock_prints.return_value = {("dbo", "kept"): old}
+
+        profile_incremental(config, "dw", settings, schema="dbo", full=True)
+
+        assert mock_profile.call_args.kwargs["tables"] == ["dbo.kept"]
+        assert elsewhere in read_manifest(settings.profiles_dir, "dw", settings)
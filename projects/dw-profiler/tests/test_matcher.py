@@ -0,0 +1,122 @@
+"""Tests for value-overlap matching with MinHash and LSH."""
+
+from __future__ import annotations
+
+from pathlib import Path
+
+import numpy as np
+import pyarrow as pa
+import pytest
+
+from dw_profiler.matcher import (
+    ColumnRef,
+    MinHasher,
+    find_value_matches,
+    lsh_candidates,
+    read_matches,
+    write_matches,
+)
+from dw_profiler.sketches import value_hash
+
+
+def _profiles(columns: dict[str, list[str]], distinct: dict[str, int] | None = None) -> pa.Table:
+    """Build a profiles table from {"db.schema.table.column": sample_values}."""
+    rows = []
+    for name, values in columns.items():
+        database, schema, table, column = name.split(".")
+        row = {
+            "database": database, "schema": schema, "table": table,
+            "column": column, "sample_values": values,
+        }
+        if distinct is not None:
+            row["distinct_count"] = distinct.get(name, len(values))
+        rows.append(row)
+    return pa.Table.from_pylist(rows)
+
+
+def _bottom_k(values: list[str], k: int = 1000) -> list[str]:
+    """Sample values the way the profiler does: the k smallest by value_hash."""
+    return sorted(set(values), key=value_hash)[:k]
+
+
+class TestMinHash:
+    def test_signature_agreement_estimates_jaccard(self) -> None:
+        """The share of equal signature slots should approximate Jaccard similarity."""
+        hasher = MinHasher(num_perm=256)
+        a = {f"v{i}" for i in range(0, 1000)}
+        b = {f"v{i}" for i in range(500, 1500)}  # Jaccard 1/3
+        agreement = np.mean(hasher.signature(a) == hasher.signature(b))
+        assert abs(agreement - 1 / 3) < 0.1
+
+    def test_signature_is_deterministic(self) -> None:
+        """Signatures must be stable across hasher instances and runs."""
+        values = {"35-001", "35-002", "35-003"}
+        assert np.array_equal(MinHasher().signature(values), MinHasher().signature(values))
+
+    def test_lsh_skips_same_table_pairs(self) -> None:
+        """Identical signatures in the same table should not become candidates."""
+        signature = MinHasher().signature({"a", "b", "c"})
+        same_a, same_b = ColumnRef("db", "dbo", "t", "x"), ColumnRef("db", "dbo", "t", "y")
+        other = ColumnRef("db", "dbo", "u", "x")
+        candidates = lsh_candidates(
+            {same_a: signature, same_b: signature, other: signature}, bands=32, rows=4
+        )
+        assert candidates == {(same_a, other), (same_b, other)}
+
+
+class TestFindValueMatches:
+    def test_finds_overlapping_columns_only(self) -> None:
+        """Overlapping columns should match; unrelated and low-cardinality ones should not."""
+        wells = [f"35-{i:05d}" for i in range(800)]
+        profiles = _profiles({
+            "dw.dbo.wells.api_number": wells,
+            "dw.dbo.transfers.api_no": wells[:400] + [f"X-{i}" for i in range(20)],
+            "crm.dbo.customers.cust_no": [f"C{i}" for i in range(800)],
+            "dw.dbo.transfers.is_active": ["0", "1"],
+            "dw.dbo.wells.is_active": ["0", "1"],
+        })
+
+        matches = find_value_matches(profiles)
+
+        assert len(matches) == 1
+        (match,) = matches
+        assert str(match.source) == "dw.dbo.transfers.api_no"
+        assert str(match.target) == "dw.dbo.wells.api_number"
+        assert match.containment == pytest.approx(400 / 420)
+        assert match.jaccard == pytest.approx(400 / 820)
+        assert match.to_dict()["confidence"] == round(0.95 * 400 / 420, 4)
+
+    def test_foreign_key_subset_of_primary_key(self) -> None:
+        """A foreign key inside its primary key should score full containment from samples."""
+        keys = [f"W{i:06d}" for i in range(20_000)]
+        referenced = [key for i, key in enumerate(keys) if i % 5]  # 80% of the keys
+        profiles = _profiles(
+            {
+                "dw.dbo.wells.well_id": _bottom_k(keys),
+                "dw.dbo.transfers.well_id": _bottom_k(referenced),
+            },
+            distinct={
+                "dw.dbo.wells.well_id": len(keys),
+                "dw.dbo.transfers.well_id": len(referenced),
+            },
+        )
+
+        (match,) = find_value_matches(profiles)
+
+        assert str(match.source) == "dw.dbo.transfers.well_id"
+        assert str(match.target) == "dw.dbo.wells.well_id"
+        assert match.containment == 1.0
+        assert match.jaccard == pytest.approx(0.8, abs=0.05)
+
+    def test_rejects_uneven_bands(self) -> None:
+        """Bands must split the signature evenly."""
+        with pytest.raises(ValueError, match="multiple of bands"):
+            find_value_matches(_profiles({}), num_perm=100, bands=32)
+
+    def test_write_and_read_matches(self, tmp_path: Path) -> None:
+        """Match records should round-trip through data/matches/."""
+        records = [{"source_col": "a", "target_col": "b", "confidence": 0.9}]
+        path = write_matches(records, tmp_path, "value_overlap")
+        assert path == tmp_path / "value_overlap.json"
+        assert read_matches(tmp_path, "value_overlap") == records
+        assert read_matches(tmp_path, "missing") == []
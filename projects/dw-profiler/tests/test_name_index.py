@@ -0,0 +1,102 @@
+"""Tests for the column-name n-gram similarity index."""
+
+from __future__ import annotations
+
+from dw_profiler.matcher import ColumnRef
+from dw_profiler.name_index import (
+    KEY_SUFFIX_WEIGHT,
+    NameIndex,
+    find_name_matches,
+    ngrams,
+    normalize_name,
+)
+
+
+def _ref(name: str) -> ColumnRef:
+    """Build a ColumnRef from "table.column" in dw.dbo."""
+    table, column = name.split(".")
+    return ColumnRef("dw", "dbo", table, column)
+
+
+class TestNormalization:
+    def test_case_and_separators(self) -> None:
+        """customer_id, CustomerID and Customer-ID should normalize alike."""
+        assert normalize_name("customer_id") == "customer#key"
+        assert normalize_name("CustomerID") == "customer#key"
+        assert normalize_name("Customer-ID") == "customer#key"
+
+    def test_abbreviations_expand(self) -> None:
+        """Common abbreviations should expand to their full words."""
+        assert normalize_name("cust_id") == "customer#key"
+        assert normalize_name("OrderQty") == "orderquantity"
+
+    def test_key_suffixes_become_a_token(self) -> None:
+        """Key suffixes should become one "#key" token, but only after another word."""
+        for name in ("cust_no", "CustomerKey", "customer_number"):
+            assert normalize_name(name) == "customer#key"
+        assert normalize_name("StateCode") == "statecode"
+        assert normalize_name("number") == "number"
+
+    def test_short_names_still_have_grams(self) -> None:
+        """A one-letter name should still produce an n-gram."""
+        assert ngrams("x") == frozenset({"$x$"})
+
+
+class TestNameIndex:
+    def test_similar_names_ranked(self) -> None:
+        """Closer names should rank higher, and unrelated ones not appear."""
+        index = NameIndex(
+            [_ref(n) for n in ("a.customer_id", "b.cust_no", "c.customer_name", "d.spud_date")]
+        )
+        names = [name for name, _ in index.similar_names("CustomerID", k=3, min_score=0.2)]
+        assert names[0] == "customer#key"
+        assert "customername" in names
+        assert "spuddate" not in names
+
+    def test_common_grams_are_skipped(self) -> None:
+        """A trigram in most names should not make every name a candidate."""
+        refs = [_ref(f"t{i}.field{i}_id") for i in range(300)] + [_ref("x.well_api")]
+        index = NameIndex(refs, max_df=0.05)
+        assert index.similar_names("well_api", k=10, min_score=0.1) == [("wellapi", 1.0)]
+
+    def test_similar_columns_skip_same_table(self) -> None:
+        """Columns in the queried column's own table should not be returned."""
+        index = NameIndex([_ref("orders.customer_id"), _ref("orders.cust_id"), _ref("c.CustId")])
+        similar = index.similar_columns(_ref("orders.customer_id"), k=5)
+        assert similar == [(_ref("c.CustId"), 1.0)]
+
+    def test_different_key_suffix_scores_below_exact(self) -> None:
+        """customer_id should rank CustomerID above cust_no, and StateCode not match StateID."""
+        refs = [_ref("a.CustomerID"), _ref("b.cust_no"), _ref("c.StateCode"), _ref("d.StateID")]
+        index = NameIndex(refs)
+
+        similar = index.similar_columns(_ref("x.customer_id"), k=5)
+
+        assert similar == [(_ref("a.CustomerID"), 1.0), (_ref("b.cust_no"), KEY_SUFFIX_WEIGHT)]
+        assert index.similar_columns(_ref("x.StateID"), k=5) == [(_ref("d.StateID"), 1.0)]
+
+
+class TestFindNameMatches:
+    def test_pairs_are_deduplicated_and_scored(self) -> None:
+        """Each related pair should appear once, with the weighted confidence."""
+        refs = [_ref("orders.cust_no"), _ref("invoices.customer_number"), _ref("wells.api")]
+        matches = find_name_matches(refs, k=5, min_score=0.6)
+
+        assert len(matches) == 1
+        record = matches[0].to_dict()
+        assert {record["source_table"], record["target_table"]} == {"orders", "invoices"}
+        assert record["method"] == "name"
+        assert record["name_similarity"] == 1.0
+        assert record["confidence"] == 0.9
+
+    def test_key_spellings_match_at_default_threshold(self) -> None:
+        """customer_id, CustomerID and cust_no should all pair up at the default min_score."""
+        refs = [_ref("orders.customer_id"), _ref("invoices.CustomerID"), _ref("crm.cust_no")]
+        matches = find_name_matches(refs)
+
+        scores = {frozenset({m.source.column, m.target.column}): m.similarity for m in matches}
+        assert scores == {
+            frozenset({"CustomerID", "customer_id"}): 1.0,
+            frozenset({"CustomerID", "cust_no"}): KEY_SUFFIX_WEIGHT,
+            frozenset({"cust_no", "customer_id"}): KEY_SUFFIX_WEIGHT,
+        }
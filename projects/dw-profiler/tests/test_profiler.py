@@ -0,0 +1,285 @@
+"""Tests for column profiling."""
+
+from __future__ import annotations
+
+import math
+import time
+from dataclasses import replace
+from unittest.mock import MagicMock, patch
+
+import pyodbc
+import pytest
+from mssql_mcp.config import Config
+
+from dw_profiler.config import ProfilerConfig, connection_config
+from dw_profiler.profiler import (
+    ColumnInfo,
+    ColumnProfile,
+    build_aggregate_sql,
+    build_sample_sql,
+    build_top_values_sql,
+    choose_sample_percent,
+    profile_database,
+    profile_table,
+)
+from dw_profiler.sketches import HyperLogLog, value_hash
+from dw_profiler.store import read_profiles
+
+COLUMNS = [
+    ColumnInfo("dbo", "wells", "api_number", 1, "varchar"),
+    ColumnInfo("dbo", "wells", "is_active", 2, "bit"),
+    ColumnInfo("dbo", "wells", "spud_date", 3, "datetime"),
+    ColumnInfo("dbo", "wells", "notes", 4, "ntext"),
+]
+
+
+class TestQueryBuilding:
+    def test_aggregate_sql_covers_every_column_in_one_query(self) -> None:
+        """All columns should be aggregated in a single SELECT over the table."""
+        sql = build_aggregate_sql("dbo", "wells", COLUMNS)
+
+        assert sql.count("FROM") == 1
+        assert "FROM [dbo].[wells]" in sql
+        assert "COUNT_BIG(DISTINCT [api_number]) AS distinct_0" in sql
+        assert "MIN(CAST([is_active] AS TINYINT))" in sql
+        assert "CONVERT(NVARCHAR(256), MAX([spud_date]), 126) AS max_2" in sql
+
+    def test_unordered_types_only_count_nulls(self) -> None:
+        """ntext can't be grouped or compared, so only its nulls are counted."""
+        sql = build_aggregate_sql("dbo", "wells", COLUMNS)
+        assert "COUNT_BIG(CASE WHEN [notes] IS NOT NULL THEN 1 END) AS non_null_3" in sql
+        assert "distinct_3" not in sql
+        assert "[notes]" not in build_top_values_sql("dbo", "wells", COLUMNS)
+
+    def test_identifiers_are_escaped(self) -> None:
+        """Closing brackets in names should be doubled."""
+        columns = [ColumnInfo("odd]schema", "t", "col]x", 1, "int")]
+        sql = build_aggregate_sql("odd]schema", "t", columns)
+        assert "FROM [odd]]schema].[t]" in sql
+        assert "COUNT_BIG([col]]x])" in sql
+
+    def test_sample_ranks_by_hash(self) -> None:
+        """The sample the matcher compares should be ranked by HASHBYTES, not by frequency."""
+        sql = build_top_values_sql("dbo", "wells", COLUMNS)
+        assert "ORDER BY HASHBYTES('MD5', v.value)" in sql
+        assert "WHERE rank <= ? OR hash_rank <= ?" in sql
+
+    def test_no_top_values_query_without_groupable_columns(self) -> None:
+        """A table of only xml/text columns has no top-values query."""
+        columns = [ColumnInfo("dbo", "docs", "body", 1, "xml")]
+        assert build_top_values_sql("dbo", "docs", columns) is None
+
+
+class TestProfileTable:
+    @patch("dw_profiler.profiler.fetch_rows")
+    def test_builds_column_profiles(self, mock_fetch: MagicMock, config: Config) -> None:
+        """Aggregates and top values should be mapped back onto their columns."""
+        mock_fetch.side_effect = [
+            [{
+                "row_count": 4,
+                "non_null_0": 3, "distinct_0": 2, "min_0": "35-001", "max_0": "35-009",
+                "non_null_1": 4, "distinct_1": 2, "min_1": "0", "max_1": "1",
+                "non_null_2": 0, "distinct_2": 0, "min_2": None, "max_2": None,
+                "non_null_3": 1,
+            }],
+            [
+                {"column_index": 0, "value": "35-001", "frequency": 2, "rank": 1, "hash_rank": 2},
+                {"column_index": 0, "value": "35-009", "frequency": 1, "rank": 2, "hash_rank": 1},
+                {"column_index": 1, "value": "1", "frequency": 3, "rank": 1, "hash_rank": 1},
+            ],
+        ]
+
+        profiles = profile_table(
+            config, "dw", "dbo", "wells", COLUMNS, top_n=1, value_sample_size=5
+        )
+
+        api, active, spud, notes = profiles
+        assert api.null_count == 1
+        assert api.null_rate == 0.25
+        assert api.distinct_count == 2
+        assert api.top_values == [{"value": "35-001", "count": 2}]
+        assert api.sample_values == ["35-009", "35-001"]  # in hash order
+        assert active.max_value == "1"
+        assert spud.null_rate == 1.0
+        assert notes.distinct_count is None
+        assert notes.top_values == []
+        assert mock_fetch.call_args.args[3] == (1, 5)  # top values, then sample size
+
+    @patch("dw_profiler.profiler.fetch_rows")
+    def test_empty_table_skips_top_values(self, mock_fetch: MagicMock, config: Config) -> None:
+        """An empty table needs only the aggregate query."""
+        mock_fetch.return_value = [{"row_count": 0, "non_null_0": 0, "distinct_0": 0}]
+        columns = [ColumnInfo("dbo", "t", "id", 1, "int")]
+
+        (profile,) = profile_table(config, "dw", "dbo", "t", columns)
+
+        assert profile.null_rate is None
+        assert mock_fetch.call_count == 1
+
+
+class TestProfileDatabase:
+    @patch("dw_profiler.profiler.profile_table")
+    @patch("dw_profiler.profiler.list_columns")
+    def test_profiles_tables_concurrently(
+        self,
+        mock_list: MagicMock,
+        mock_profile: MagicMock,
+        config: Config,
+        settings: ProfilerConfig,
+    ) -> None:
+        """Tables should run in parallel, be written as they finish, and fail independently."""
+        mock_list.return_value = {
+            ("dbo", "a"): [ColumnInfo("dbo", "a", "id", 1, "int")],
+            ("dbo", "broken"): [ColumnInfo("dbo", "broken", "id", 1, "int")],
+            ("dbo", "c"): [ColumnInfo("dbo", "c", "id", 1, "int")],
+        }
+
+        def slow(cfg, database, schema, table, columns, top_n, **kwargs):
+            time.sleep(0.2)
+            if table == "broken":
+                raise pyodbc.Error("permission denied")
+            return [ColumnProfile(database, schema, table, "id", 1, "int", 10, 0, 10, "1", "10")]
+
+        mock_profile.side_effect = slow
+        started = time.perf_counter()
+        results = profile_database(config, "dw", settings)
+
+        assert time.perf_counter() - started < 0.5
+        assert [r.table for r in results] == ["a", "broken", "c"]
+        assert results[1].error == "permission denied"
+        assert results[1].path is None
+        stored = read_profiles(settings.profiles_dir, "dw")
+        assert sorted(stored.column("table").to_pylist()) == ["a", "c"]
+
+    @patch("dw_profiler.profiler.profile_table", return_value=[])
+    @patch("dw_profiler.profiler.list_columns")
+    def test_table_filter(
+        self,
+        mock_list: MagicMock,
+        mock_profile: MagicMock,
+        config: Config,
+        settings: ProfilerConfig,
+    ) -> None:
+        """tables should accept bare and schema-qualified names."""
+        mock_list.return_value = {
+            ("dbo", "a"): [], ("sales", "b"): [], ("sales", "c"): [],
+        }
+        with patch("dw_profiler.profiler.write_profiles", return_value="x"):
+            results = profile_database(config, "dw", settings, tables=["a", "sales.c"])
+        assert [(r.schema, r.table) for r in results] == [("dbo", "a"), ("sales", "c")]
+
+    def test_connection_config_fits_workers(self, config: Config) -> None:
+        """The pool should hold a connection per worker, with the profiling timeout."""
+        cfg = connection_config(config, ProfilerConfig(workers=12, query_timeout=900))
+        assert cfg.pool_size == 12
+        assert cfg.query_timeout == 900
+
+
+class TestApproximateMode:
+    def test_approximate_aggregate_uses_approx_count_distinct(self) -> None:
+        """Approximate mode should swap COUNT(DISTINCT) for APPROX_COUNT_DISTINCT."""
+        columns = COLUMNS + [ColumnInfo("dbo", "wells", "attrs", 5, "sql_variant")]
+        sql = build_aggregate_sql("dbo", "wells", columns, approximate=True)
+        assert "APPROX_COUNT_DISTINCT([api_number]) AS distinct_0" in sql
+        assert "COUNT_BIG(DISTINCT [attrs]) AS distinct_4" in sql
+
+    def test_sample_sql_uses_tablesample(self) -> None:
+        """The sample query should read a repeatable TABLESAMPLE of groupable columns."""
+        sql = build_sample_sql("dbo", "wells", COLUMNS, 0.125)
+        assert "TABLESAMPLE (0.125 PERCENT) REPEATABLE (1)" in sql
+        assert "AS c0" in sql
+        assert "[notes]" not in sql
+
+    def test_choose_sample_percent(self) -> None:
+        """Only tables at or above the threshold should be sampled in auto mode."""
+        auto = ProfilerConfig(mode="auto", sample_threshold=1_000_000, sample_rows=100_000)
+        assert choose_sample_percent(auto, 999_999) is None
+        assert choose_sample_percent(auto, 10_000_000) == 1.0
+        assert choose_sample_percent(ProfilerConfig(mode="exact"), 10**12) is None
+        assert choose_sample_percent(ProfilerConfig(mode="approx"), 10) == 100.0
+        with pytest.raises(ValueError, match="Unknown profiling mode"):
+            choose_sample_percent(ProfilerConfig(mode="fast"), 10)
+
+    @patch("dw_profiler.profiler._fetch_batches")
+    @patch("dw_profiler.profiler.fetch_rows")
+    def test_profiles_from_sample_with_error_bounds(
+        self, mock_fetch: MagicMock, mock_batches: MagicMock, config: Config
+    ) -> None:
+        """Approximate profiles should scale sampled top values and carry error bounds."""
+        columns = COLUMNS[:2]
+        mock_fetch.side_effect = [
+            [{
+                "row_count": 1_000_000,
+                "non_null_0": 800_000, "distinct_0": 5000, "min_0": "35-001", "max_0": "35-999",
+                "non_null_1": 1_000_000, "distinct_1": 2, "min_1": "0", "max_1": "1",
+            }],
+        ]
+        # Two fetch batches of sampled rows, one value per groupable column
+        mock_batches.return_value = iter([
+            [("35-001", "1")] * 300,
+            [("35-002", "0")] * 100,
+        ])
+
+        api, active = profile_table(
+            config, "dw", "dbo", "wells", columns, top_n=2, sample_percent=0.04
+        )
+
+        assert api.approximate and api.sample_rows == 400
+        assert api.distinct_count == 5000
+        assert api.distinct_error == 0.02
+        assert api.top_values == [
+            {"value": "35-001", "count": 600_000}, {"value": "35-002", "count": 200_000},
+        ]
+        assert api.frequency_error == pytest.approx(1.96 * 0.5 / 20 * 800_000)
+        assert api.sample_values == sorted(["35-001", "35-002"], key=value_hash)
+        assert active.sample_values == sorted(["0", "1"], key=value_hash)
+        assert mock_fetch.call_count == 1  # the aggregate; nothing else reads the table
+        assert HyperLogLog.from_bytes(api.distinct_sketch).estimate() == 2
+        assert active.top_values[0] == {"value": "1", "count": 750_000}
+
+    @patch("dw_profiler.profiler._fetch_batches")
+    @patch("dw_profiler.profiler.fetch_rows")
+    def test_top_values_count_every_sampled_row(
+        self, mock_fetch: MagicMock, mock_batches: MagicMock, config: Config
+    ) -> None:
+        """Frequencies should come from all sampled rows, not a value_sample_size subsample."""
+        mock_fetch.side_effect = [
+            [{"row_count": 1_000_000, "non_null_0": 1_000_000, "distinct_0": 3000}],
+        ]
+        rows = [("35-001",)] * 2500 + [(f"35-{i:04d}",) for i in range(500)] * 5
+        mock_batches.return_value = iter([rows[:2000], rows[2000:]])
+
+        (api,) = profile_table(
+            config, "dw", "dbo", "wells", COLUMNS[:1], top_n=1,
+            sample_percent=0.5, value_sample_size=10,
+        )
+
+        assert api.sample_rows == 5000
+        assert api.top_values == [{"value": "35-001", "count": 500_000}]
+        # The bottom-k of every sampled value, kept across both batches
+        distinct = {value for (value,) in rows}
+        assert api.sample_values == sorted(distinct, key=value_hash)[:10]
+        assert api.frequency_error == pytest.approx(1.96 * math.sqrt(0.25 / 5000) * 1_000_000)
+
+    @patch("dw_profiler.profiler.profile_table", return_value=[])
+    @patch("dw_profiler.profiler.estimate_row_counts")
+    @patch("dw_profiler.profiler.list_columns")
+    def test_auto_mode_samples_only_large_tables(
+        self,
+        mock_list: MagicMock,
+        mock_counts: MagicMock,
+        mock_profile: MagicMock,
+        config: Config,
+        settings: ProfilerConfig,
+    ) -> None:
+        """The sys.partitions row count should pick each table's mode."""
+        mock_list.return_value = {("dbo", "dim"): [], ("dbo", "fact"): []}
+        mock_counts.return_value = {("dbo", "dim"): 5_000, ("dbo", "fact"): 2_000_000_000}
+        settings = replace(settings, mode="auto", sample_threshold=10_000_000)
+
+        with patch("dw_profiler.profiler.write_profiles", return_value="x"):
+            results = profile_database(config, "dw", settings)
+
+        assert [r.approximate for r in results] == [False, True]
+        percents = [c.kwargs["sample_percent"] for c in mock_profile.call_args_list]
+        assert sorted(percents, key=lambda p: p is not None) == [None, 0.005]
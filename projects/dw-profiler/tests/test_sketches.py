@@ -0,0 +1,100 @@
+"""Tests for the mergeable HyperLogLog, bottom-k and heavy-hitter sketches."""
+
+from __future__ import annotations
+
+from collections import Counter
+
+import pytest
+
+from dw_profiler.sketches import BottomK, HeavyHitters, HyperLogLog, value_hash
+
+
+class TestHyperLogLog:
+    def test_estimate_within_error_bound(self) -> None:
+        """The estimate should land within a few standard errors of the true count."""
+        hll = HyperLogLog()
+        hll.update(f"API-{i}" for i in range(50_000))
+        assert abs(hll.estimate() - 50_000) / 50_000 < 4 * hll.relative_error
+
+    def test_small_counts_are_near_exact(self) -> None:
+        """Linear counting should make small cardinalities almost exact."""
+        hll = HyperLogLog()
+        hll.update(["a", "b", "c", "a", None])
+        assert hll.estimate() == 3
+
+    def test_merge_equals_sketch_of_union(self) -> None:
+        """Merging chunk sketches should give the same registers as one pass."""
+        whole, first, second = HyperLogLog(), HyperLogLog(), HyperLogLog()
+        values = [str(i) for i in range(20_000)]
+        whole.update(values)
+        first.update(values[:12_000])
+        second.update(values[8_000:])
+        assert first.merge(second).to_bytes() == whole.to_bytes()
+
+    def test_round_trips_through_bytes(self) -> None:
+        """A serialized sketch should rebuild with its precision and estimate."""
+        hll = HyperLogLog(precision=10)
+        hll.update(range(1000))
+        restored = HyperLogLog.from_bytes(hll.to_bytes())
+        assert restored.precision == 10
+        assert restored.estimate() == hll.estimate()
+
+    def test_rejects_mismatched_precision(self) -> None:
+        """Sketches of different precision can't be merged."""
+        with pytest.raises(ValueError, match="different precision"):
+            HyperLogLog(10).merge(HyperLogLog(12))
+
+
+class TestBottomK:
+    def test_keeps_smallest_hashes_in_order(self) -> None:
+        """The sample should be the distinct values with the smallest hashes, in hash order."""
+        values = [f"v{i}" for i in range(100)]
+        sample = BottomK(size=10)
+        sample.update(values + values + [None])
+        sample.add("v0")
+        assert sample.values == sorted(values, key=value_hash)[:10]
+
+    def test_merge_matches_one_pass(self) -> None:
+        """Merging per-batch samples should give the sample of all the values."""
+        values = [f"v{i % 700}" for i in range(5000)]
+        merged = BottomK(size=25)
+        for start in range(0, len(values), 600):
+            batch = BottomK(size=25)
+            batch.update(values[start : start + 600])
+            merged = merged.merge(batch)
+
+        whole = BottomK(size=25)
+        whole.update(values)
+        assert merged.values == whole.values
+
+    def test_rejects_negative_size(self) -> None:
+        """A sample can't hold fewer than zero values."""
+        with pytest.raises(ValueError, match="must not be negative"):
+            BottomK(size=-1)
+
+
+class TestHeavyHitters:
+    def test_exact_under_capacity(self) -> None:
+        """With room for every value, counts should be exact."""
+        counts = HeavyHitters(capacity=10)
+        counts.update(["a", "b", None, "a"])
+        counts.add("a")
+        assert counts.most_common(2) == [("a", 3), ("b", 1)]
+        assert (counts.seen, counts.error) == (4, 0)
+
+    def test_undercount_is_bounded(self) -> None:
+        """Past capacity, every count should be within error below the truth."""
+        values = ["hot"] * 3000 + ["warm"] * 1000 + [f"cold{i}" for i in range(6000)]
+        truth = Counter(values)
+        counts = HeavyHitters(capacity=50)
+        for start in range(0, len(values), 700):
+            batch = HeavyHitters(capacity=50)
+            batch.update(values[start : start + 700])
+            counts = counts.merge(batch)
+
+        assert counts.seen == 10_000
+        assert len(counts.counts) <= 50
+        assert counts.error <= 10_000 / 51
+        assert [value for value, _ in counts.most_common(2)] == ["hot", "warm"]
+        for value, count in counts.counts.items():
+            assert truth[value] - counts.error <= count <= truth[value]
@@ -0,0 +1,87 @@
+"""Tests for storing column profiles as Parquet."""
+
+from __future__ import annotations
+
+import datetime
+from pathlib import Path
+
+import pytest
+
+from dw_profiler.profiler import ColumnProfile
+from dw_profiler.store import profile_path, read_profiles, write_profiles
+
+
+def _profile(table: str = "wells", column: str = "api_number", **kwargs) -> ColumnProfile:
+    return ColumnProfile(
+        database="dw", schema="dbo", table=table, column=column, ordinal=1,
+        data_type="varchar", row_count=4, null_count=1, **kwargs,
+    )
+
+
+class TestStore:
+    def test_round_trip(self, tmp_path: Path) -> None:
+        """Written profiles should read back with their nested top values."""
+        profile = _profile(
+            distinct_count=2,
+            min_value="35-001",
+            top_values=[{"value": "35-001", "count": 2}],
+            profiled_at=datetime.datetime(2024, 5, 1, tzinfo=datetime.UTC),
+        )
+        path = write_profiles([profile], tmp_path)
+
+        assert path == tmp_path / "dw" / "dbo.wells.parquet"
+        (row,) = read_profiles(tmp_path).to_pylist()
+        assert row["null_rate"] == 0.25
+        assert row["top_values"] == [{"value": "35-001", "count": 2}]
+        assert row["profiled_at"].year == 2024
+
+    def test_round_trip_approximate_fields(self, tmp_path: Path) -> None:
+        """Error bounds, sample values and the sketch bytes should survive storage."""
+        profile = _profile(
+            approximate=True,
+            sample_rows=400,
+            distinct_error=0.02,
+            sample_values=["35-001", "35-002"],
+            distinct_sketch=b"\x00\x03" * 8,
+        )
+        write_profiles([profile], tmp_path)
+        (row,) = read_profiles(tmp_path).to_pylist()
+        assert row["approximate"] is True
+        assert row["distinct_error"] == 0.02
+        assert row["sample_values"] == ["35-001", "35-002"]
+        assert row["distinct_sketch"] == b"\x00\x03" * 8
+
+    def test_rewrite_replaces_previous_profile(self, tmp_path: Path) -> None:
+        """Re-profiling a table should replace its file, not append to it."""
+        write_profiles([_profile(column="old")], tmp_path)
+        write_profiles([_profile(column="new")], tmp_path)
+        assert read_profiles(tmp_path).column("column").to_pylist() == ["new"]
+
+    def test_rejects_mixed_tables(self, tmp_path: Path) -> None:
+        """One file holds exactly one table."""
+        with pytest.raises(ValueError, match="exactly one table"):
+            write_profiles([_profile("a"), _profile("b")], tmp_path)
+
+    def test_unsafe_names_are_sanitized(self, tmp_path: Path) -> None:
+        """Names with path separators should stay inside the profiles directory."""
+        path = profile_path(tmp_path, "dw", "dbo", "../etc/passwd")
+        assert path.parent == tmp_path / "dw"
+        assert path.name == "dbo.%2E%2E%2Fetc%2Fpasswd.parquet"
+
+    @pytest.mark.parametrize(
+        ("first", "second"),
+        [
+            (("a.b", "c"), ("a", "b.c")),
+            (("dbo", "Order Details"), ("dbo", "Order_Details")),
+            (("dbo", "Straße"), ("dbo", "Stra%C3%9Fe")),
+        ],
+    )
+    def test_distinct_tables_get_distinct_files(
+        self, tmp_path: Path, first: tuple[str, str], second: tuple[str, str]
+    ) -> None:
+        """Names that used to sanitize to the same file name must not share a file."""
+        assert profile_path(tmp_path, "dw", *first) != profile_path(tmp_path, "dw", *second)
+
+    def test_read_missing_directory(self, tmp_path: Path) -> None:
+        """Reading before anything is profiled should give an empty table."""
+        assert read_profiles(tmp_path / "nothing").num_rows == 0
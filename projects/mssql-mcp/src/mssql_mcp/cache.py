@@ -0,0 +1,222 @@
+"""In-process caches for catalog metadata and query results.
+
+Schema-exploration tools get called repeatedly for the same objects, and
+their answers rarely change. MetadataCache entries live for a TTL; once it
+expires, a cheap version query (e.g. ``sys.objects.modify_date``) decides
+whether the cached rows are still valid before the full catalog query is
+re-run.
+
+ResultCache holds the rows of repeated read-only queries for a TTL,
+bounded by an estimate of their memory footprint.
+"""
+
+from __future__ import annotations
+
+import sys
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Callable
+from dataclasses import dataclass
+from typing import Any
+
+
+@dataclass
+class _Entry:
+    """A cached value with the version it was loaded at."""
+
+    value: Any
+    version: Any
+    expires_at: float
+
+
+class MetadataCache:
+    """Thread-safe TTL cache with least-recently-used eviction.
+
+    Keys are tuples starting with (server, database, schema, table); any
+    trailing elements distinguish different lookups on the same object.
+    A ttl of 0 disables caching.
+    """
+
+    def __init__(self, ttl: float, max_entries: int) -> None:
+        self._ttl = ttl
+        self._max_entries = max_entries
+        self._entries: OrderedDict[tuple, _Entry] = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.revalidations = 0
+        self.misses = 0
+
+    def get_or_load(
+        self,
+        key: tuple,
+        load: Callable[[], Any],
+        version: Callable[[], Any] | None = None,
+    ) -> Any:
+        """Return the cached value for key, calling load() on a miss.
+
+        Args:
+            key: Cache key, (server, database, schema, table, ...).
+            load: Runs the full lookup.
+            version: Runs a cheap query whose result changes whenever the
+                looked-up objects change. Checked only after the TTL expires;
+                if it still matches, the entry is kept for another TTL.
+        """
+        if self._ttl <= 0 or self._max_entries <= 0:
+            return load()
+
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                if now < entry.expires_at:
+                    self.hits += 1
+                    return entry.value
+
+        current = version() if version is not None else None
+        if entry is not None and version is not None and current == entry.version:
+            with self._lock:
+                entry.expires_at = now + self._ttl
+                self.revalidations += 1
+            return entry.value
+
+        value = load()
+        with self._lock:
+            self.misses += 1
+            self._entries[key] = _Entry(value, current, now + self._ttl)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self._max_entries:
+                self._entries.popitem(last=False)
+        return value
+
+    def invalidate(
+        self,
+        server: str,
+        database: str,
+        schema: str | None = None,
+        table: str | None = None,
+    ) -> int:
+        """Drop cached entries for a database, schema or table.
+
+        Entries that summarize a wider scope (a schema's table list, the
+        database's schema list) are dropped too, since they include the
+        invalidated objects. Returns the number of entries removed.
+        """
+
+        def matches(key: tuple) -> bool:
+            if key[:2] != (server, database):
+                return False
+            if schema is not None and key[2] not in (schema, None):
+                return False
+            if table is not None and key[3] not in (table, None):
+                return False
+            return True
+
+        with self._lock:
+            stale = [key for key in self._entries if matches(key)]
+            for key in stale:
+                del self._entries[key]
+        return len(stale)
+
+    def clear(self) -> None:
+        """Drop every cached entry."""
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._entries)
+
+
+def estimate_size(value: Any) -> int:
+    """Roughly estimate the memory held by a query result, in bytes.
+
+    Walks lists, tuples and dicts one level deep per container and adds
+    sys.getsizeof of every element — close enough to budget a cache.
+    """
+    size = sys.getsizeof(value)
+    if isinstance(value, dict):
+        return size + sum(estimate_size(v) for v in value.values())
+    if isinstance(value, (list, tuple)):
+        return size + sum(estimate_size(v) for v in value)
+    return size
+
+
+@dataclass
+class _SizedEntry:
+    """A cached result with its estimated size and expiry time."""
+
+    value: Any
+    size: int
+    expires_at: float
+
+
+class ResultCache:
+    """Thread-safe TTL cache bounded by the estimated memory of its values.
+
+    The least recently used results are evicted once the total estimated
+    size passes max_bytes. Results bigger than max_bytes are never cached.
+    """
+
+    def __init__(self, ttl: float, max_bytes: int) -> None:
+        self._ttl = ttl
+        self._max_bytes = max_bytes
+        self._entries: OrderedDict[tuple, _SizedEntry] = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key: tuple) -> Any | None:
+        """Return the cached value for key, or None on a miss or after the TTL."""
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and now >= entry.expires_at:
+                self._bytes -= self._entries.pop(key).size
+                entry = None
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry.value
+
+    def put(self, key: tuple, value: Any) -> None:
+        """Cache value under key, evicting least recently used results to fit."""
+        size = estimate_size(value)
+        if size > self._max_bytes:
+            return
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self._bytes -= old.size
+            self._entries[key] = _SizedEntry(value, size, time.monotonic() + self._ttl)
+            self._bytes += size
+            while self._bytes > self._max_bytes:
+                _, evicted = self._entries.popitem(last=False)
+                self._bytes -= evicted.size
+                self.evictions += 1
+
+    def clear(self) -> None:
+        """Drop every cached result."""
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def stats(self) -> dict[str, Any]:
+        """Return hit/miss counters and current occupancy."""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                "max_bytes": self._max_bytes,
+                "ttl_s": self._ttl,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+                "evictions": self.evictions,
+            }
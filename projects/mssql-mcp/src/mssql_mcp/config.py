@@ -8,8 +8,10 @@ your values, or set them in your shell / Claude Code settings.
 from __future__ import annotations
 
 import os
-from dataclasses import dataclass, field
+import tomllib
+from dataclasses import dataclass, field, fields
 from pathlib import Path
+from typing import ClassVar
 
 from dotenv import load_dotenv
 
@@ -34,6 +36,8 @@ def _make_config(prefix: str = "MSSQL") -> type:
     class Config:
         """Immutable server configuration."""
 
+        env_prefix: ClassVar[str] = prefix
+
         # Connection
         host: str = field(default_factory=lambda: os.getenv(f"{prefix}_HOST", "localhost"))
         port: int = field(default_factory=lambda: int(os.getenv(f"{prefix}_PORT", "1433")))
@@ -64,6 +68,71 @@ def _make_config(prefix: str = "MSSQL") -> type:
             default_factory=lambda: int(os.getenv(f"{prefix}_MAX_ROWS", "10000"))
         )
 
+        # Text returned to the client: characters kept per cell, and the
+        # approximate size limit of one tool result
+        max_cell_width: int = field(
+            default_factory=lambda: int(os.getenv(f"{prefix}_MAX_CELL_WIDTH", "200"))
+        )
+        max_output_chars: int = field(
+            default_factory=lambda: int(os.getenv(f"{prefix}_MAX_OUTPUT_CHARS", "50000"))
+        )
+
+        # Tool calls run on a bounded worker pool; a call still running after
+        # tool_timeout seconds has its statements cancelled
+        worker_threads: int = field(
+            default_factory=lambda: int(os.getenv(f"{prefix}_WORKER_THREADS", "8"))
+        )
+        tool_timeout: int = field(
+            default_factory=lambda: int(os.getenv(f"{prefix}_TOOL_TIMEOUT", "120"))
+        )
+
+        # Databases queried at once by query_all_databases
+        fanout_workers: int = field(
+            default_factory=lambda: int(os.getenv(f"{prefix}_FANOUT_WORKERS", "8"))
+        )
+
+        # Connection pool (per server + database)
+        pool_size: int = field(
+            default_factory=lambda: int(os.getenv(f"{prefix}_POOL_SIZE", "5"))
+        )
+        pool_idle_timeout: int = field(
+            default_factory=lambda: int(os.getenv(f"{prefix}_POOL_IDLE_TIMEOUT", "300"))
+        )
+        pool_max_lifetime: int = field(
+            default_factory=lambda: int(os.getenv(f"{prefix}_POOL_MAX_LIFETIME", "1800"))
+        )
+
+        # Metadata cache for list_tables / list_schemas / describe_table (0 TTL disables)
+        metadata_cache_ttl: int = field(
+            default_factory=lambda: int(os.getenv(f"{prefix}_METADATA_CACHE_TTL", "300"))
+        )
+        metadata_cache_size: int = field(
+            default_factory=lambda: int(os.getenv(f"{prefix}_METADATA_CACHE_SIZE", "256"))
+        )
+
+        # Result cache for repeated read-only queries (opt-in: 0 TTL disables)
+        result_cache_ttl: int = field(
+            default_factory=lambda: int(os.getenv(f"{prefix}_RESULT_CACHE_TTL", "0"))
+        )
+        result_cache_mb: int = field(
+            default_factory=lambda: int(os.getenv(f"{prefix}_RESULT_CACHE_MB", "64"))
+        )
+
+        # Directory export_query writes into (exports can't escape it)
+        export_dir: str = field(
+            default_factory=lambda: os.getenv(
+                f"{prefix}_EXPORT_DIR", str(Path(__file__).resolve().parents[2] / "exports")
+            )
+        )
+
+        # Local SQLite file holding schema snapshots for search_columns
+        schema_index_path: str = field(
+            default_factory=lambda: os.getenv(
+                f"{prefix}_SCHEMA_INDEX_PATH",
+                str(Path.home() / ".cache" / "mssql-mcp" / f"{prefix.lower()}_schema_index.db"),
+            )
+        )
+
         def validate(self) -> None:
             """Raise ValueError if required settings are missing."""
             if not self.database:
@@ -80,3 +149,48 @@ def _make_config(prefix: str = "MSSQL") -> type:
 # Default Config class using MSSQL_ prefix (backwards compatible)
 Config = _make_config("MSSQL")
 
+
+def load_instance_configs(
+    prefixes: str | None = None, config_file: str | None = None
+) -> dict[str, Config]:
+    """Load the named SQL Server instances one server process serves.
+
+    Args:
+        prefixes: Comma-separated env-var prefixes, each optionally named —
+            ``MSSQL,warehouse=DW`` serves ``mssql`` from MSSQL_* and
+            ``warehouse`` from DW_*. Defaults to ``MSSQL_INSTANCES``.
+        config_file: TOML file with one table per instance whose keys are
+            Config fields; fields it leaves out fall back to ``<NAME>_*``
+            env vars. Defaults to ``MSSQL_INSTANCES_FILE``.
+
+    Returns instances in declaration order (the first is the default),
+    or just ``mssql`` from MSSQL_* when neither source names any.
+
+    Raises:
+        ValueError: If the file sets a key that isn't a Config field.
+    """
+    if prefixes is None:
+        prefixes = os.getenv("MSSQL_INSTANCES", "")
+    if config_file is None:
+        config_file = os.getenv("MSSQL_INSTANCES_FILE", "")
+
+    configs: dict[str, Config] = {}
+    for entry in filter(None, (part.strip() for part in prefixes.split(","))):
+        name, _, prefix = entry.rpartition("=")
+        prefix = prefix.strip().upper()
+        configs[(name.strip() or prefix).lower()] = _make_config(prefix)()
+
+    if config_file:
+        with open(config_file, "rb") as f:
+            tables = tomllib.load(f)
+        for name, values in tables.items():
+            instance_config = _make_config(name.upper())
+            unknown = set(values) - {f.name for f in fields(instance_config)}
+            if unknown:
+                raise ValueError(
+                    f"Unknown settings for instance {name!r} in {config_file}: {sorted(unknown)}"
+                )
+            configs[name.lower()] = instance_config(**values)
+
+    return configs or {"mssql": Config()}
+
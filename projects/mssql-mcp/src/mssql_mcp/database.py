@@ -3,15 +3,31 @@
 Uses pyodbc to connect via ODBC Driver 17. Supports both SQL
 authentication (user/password) and Windows authentication
 (Trusted_Connection).
+
+Connections are pooled per server and database, so repeated tool calls
+skip the ODBC login handshake. A pooled connection whose session has
+drifted (a USE, a SET option) is discarded rather than reused, and one
+that ran an ad-hoc statement other than a plain SELECT is never pooled.
+Cursors opened with open_cursor() join the calling thread's CancelScope,
+so a tool call that times out can stop its running statements from
+another thread. In read-only mode, results of repeated queries can also
+be cached for a short TTL (opt-in via result_cache_ttl).
 """
 
 from __future__ import annotations
 
+import atexit
 import re
+import threading
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager
+from dataclasses import dataclass
 from typing import Any
 
 import pyodbc
 
+from mssql_mcp.cache import ResultCache
 from mssql_mcp.config import Config
 
 # Keywords that are blocked in read-only mode
@@ -20,6 +36,22 @@ _WRITE_KEYWORDS = re.compile(
     re.IGNORECASE,
 )
 
+# A plain read starts with SELECT / WITH and never writes rows (SELECT ...
+# INTO, a CTE feeding an UPDATE or an EXEC all do)
+_PLAIN_READ = re.compile(r"^\s*(SELECT|WITH)\b", re.IGNORECASE)
+_WRITES_ROWS = re.compile(
+    r"\b(INTO|INSERT|UPDATE|DELETE|MERGE|EXEC|EXECUTE)\b", re.IGNORECASE
+)
+
+# Session settings a batch can change and leave behind on a pooled
+# connection. sys.dm_exec_sessions always shows a login its own session
+_SESSION_STATE_SQL = """
+    SELECT DB_NAME(), @@OPTIONS, @@LANGUAGE, @@DATEFIRST, @@LOCK_TIMEOUT, @@TEXTSIZE,
+        s.transaction_isolation_level, s.date_format
+    FROM sys.dm_exec_sessions s
+    WHERE s.session_id = @@SPID
+"""
+
 
 def build_connection_string(cfg: Config, database: str | None = None) -> str:
     """Build a pyodbc connection string from config.
@@ -61,6 +93,285 @@ def get_connection(cfg: Config, database: str | None = None) -> pyodbc.Connectio
     return conn
 
 
+def is_plain_select(sql: str) -> bool:
+    """Return True if sql is a plain SELECT / WITH query that writes nothing."""
+    return bool(_PLAIN_READ.match(sql)) and not _WRITES_ROWS.search(sql)
+
+
+def _session_state(conn: pyodbc.Connection) -> tuple[Any, ...]:
+    """Return the current database and SET options of conn's session."""
+    return tuple(conn.cursor().execute(_SESSION_STATE_SQL).fetchone())
+
+
+@dataclass
+class _PooledConnection:
+    """A pooled connection with the timestamps used for recycling.
+
+    state is the session's database and SET options as first opened.
+    """
+
+    conn: pyodbc.Connection
+    created_at: float
+    last_used: float
+    state: tuple[Any, ...] = ()
+
+
+def _close_quietly(conn: pyodbc.Connection) -> None:
+    """Close a connection, ignoring errors from an already-broken link."""
+    try:
+        conn.close()
+    except pyodbc.Error:
+        pass
+
+
+class ConnectionPool:
+    """Bounded, thread-safe pool of connections to one server and database.
+
+    At most cfg.pool_size connections are checked out at once; further
+    callers wait up to cfg.query_timeout seconds for one to be returned.
+    On checkout, connections idle longer than cfg.pool_idle_timeout or
+    older than cfg.pool_max_lifetime are replaced. The rest are pinged
+    by reading their session state, and replaced if it no longer matches
+    the state they were opened with: a USE or SET left behind by the last
+    caller would otherwise send this pool's queries to another database.
+    Each connection is rolled back on return so the next caller starts
+    with a clean transaction.
+    """
+
+    def __init__(self, cfg: Config, database: str | None = None) -> None:
+        self._cfg = cfg
+        self._database = database
+        self._slots = threading.BoundedSemaphore(cfg.pool_size)
+        self._idle: list[_PooledConnection] = []
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def connection(self, reuse: bool = True) -> Iterator[pyodbc.Connection]:
+        """Check out a healthy connection for the duration of the with block.
+
+        With reuse=False the connection is closed afterwards instead of
+        returned, for batches that may leave temp tables or other session
+        state the pool can't detect.
+        """
+        if not self._slots.acquire(timeout=self._cfg.query_timeout):
+            raise TimeoutError(
+                f"No pooled connection became available within {self._cfg.query_timeout}s "
+                f"(pool_size={self._cfg.pool_size})"
+            )
+        try:
+            entry = self._checkout()
+            try:
+                yield entry.conn
+            finally:
+                if reuse:
+                    self._checkin(entry)
+                else:
+                    _close_quietly(entry.conn)
+        finally:
+            self._slots.release()
+
+    def close(self) -> None:
+        """Close every idle connection."""
+        with self._lock:
+            idle, self._idle = self._idle, []
+        for entry in idle:
+            _close_quietly(entry.conn)
+
+    def _is_usable(self, entry: _PooledConnection, now: float) -> bool:
+        """Return True if entry is within its limits and its session is as it was opened."""
+        if now - entry.last_used > self._cfg.pool_idle_timeout:
+            return False
+        if now - entry.created_at > self._cfg.pool_max_lifetime:
+            return False
+        try:
+            return _session_state(entry.conn) == entry.state
+        except pyodbc.Error:
+            return False
+
+    def _checkout(self) -> _PooledConnection:
+        """Reuse the most recently returned healthy connection, or open a new one."""
+        while True:
+            with self._lock:
+                entry = self._idle.pop() if self._idle else None
+            if entry is None:
+                now = time.monotonic()
+                conn = get_connection(self._cfg, database=self._database)
+                try:
+                    state = _session_state(conn)
+                except pyodbc.Error:
+                    _close_quietly(conn)
+                    raise
+                return _PooledConnection(conn, created_at=now, last_used=now, state=state)
+            if self._is_usable(entry, time.monotonic()):
+                return entry
+            _close_quietly(entry.conn)
+
+    def _checkin(self, entry: _PooledConnection) -> None:
+        """Return a connection to the pool, discarding it if it can't be reset."""
+        try:
+            entry.conn.rollback()
+        except pyodbc.Error:
+            _close_quietly(entry.conn)
+            return
+
+        now = time.monotonic()
+        entry.last_used = now
+        expired = []
+        with self._lock:
+            # Reap connections that have sat idle too long while we're here
+            kept = []
+            for idle in self._idle:
+                too_old = now - idle.last_used > self._cfg.pool_idle_timeout
+                (expired if too_old else kept).append(idle)
+            kept.append(entry)
+            self._idle = kept
+        for stale in expired:
+            _close_quietly(stale.conn)
+
+
+# Process-wide pools keyed by connection string — one per (server, database),
+# and the string also pins the credentials, so two configs never share a pool
+_pools: dict[str, ConnectionPool] = {}
+_pools_lock = threading.Lock()
+
+
+def get_pool(cfg: Config, database: str | None = None) -> ConnectionPool:
+    """Return the shared pool for cfg's server and the given database."""
+    key = build_connection_string(cfg, database=database)
+    with _pools_lock:
+        pool = _pools.get(key)
+        if pool is None:
+            pool = ConnectionPool(cfg, database=database)
+            _pools[key] = pool
+    return pool
+
+
+def pooled_connection(cfg: Config, database: str | None = None, reuse: bool = True):
+    """Context manager yielding a pooled connection to database.
+
+    Args:
+        cfg: Server configuration.
+        database: Override the database name. If None, uses cfg.database.
+        reuse: Return the connection to the pool afterwards; close it if False.
+    """
+    return get_pool(cfg, database=database).connection(reuse=reuse)
+
+
+def close_pools() -> None:
+    """Close all idle pooled connections and forget the pools."""
+    with _pools_lock:
+        pools = list(_pools.values())
+        _pools.clear()
+    for pool in pools:
+        pool.close()
+
+
+atexit.register(close_pools)
+
+
+# Process-wide result caches, one per server login (see get_result_cache)
+_result_caches: dict[tuple[str, int, str], ResultCache] = {}
+_result_caches_lock = threading.Lock()
+
+# String literals and quoted identifiers, whose whitespace is significant
+_QUOTED = re.compile(r"('(?:[^']|'')*'|\[(?:[^\]]|\]\])*\]|\"(?:[^\"]|\"\")*\")")
+
+
+def normalize_sql(sql: str) -> str:
+    """Collapse runs of whitespace outside quotes and drop a trailing semicolon.
+
+    Used for result-cache keys, so reformatting a query still hits the
+    cache but two different string literals never collide.
+    """
+    parts = _QUOTED.split(sql.strip().rstrip(";").strip())
+    # re.split with one capture group alternates unquoted / quoted segments
+    return "".join(part if i % 2 else re.sub(r"\s+", " ", part) for i, part in enumerate(parts))
+
+
+def get_result_cache(cfg: Config) -> ResultCache | None:
+    """Return the shared result cache for cfg's server, or None if caching is off.
+
+    Results are only cached in read-only mode with a positive
+    result_cache_ttl — otherwise a cached SELECT could hide this server's
+    own writes.
+    """
+    if not cfg.read_only or cfg.result_cache_ttl <= 0 or cfg.result_cache_mb <= 0:
+        return None
+    key = (cfg.host, cfg.port, cfg.user)
+    with _result_caches_lock:
+        cache = _result_caches.get(key)
+        if cache is None:
+            cache = ResultCache(cfg.result_cache_ttl, cfg.result_cache_mb * 1024 * 1024)
+            _result_caches[key] = cache
+    return cache
+
+
+def clear_result_caches() -> None:
+    """Forget every cached result and its hit/miss counters."""
+    with _result_caches_lock:
+        _result_caches.clear()
+
+
+class CancelScope:
+    """The cursors opened by one tool call, so the call can be cancelled.
+
+    cancel() is called from outside the worker thread running the call;
+    pyodbc's Cursor.cancel() is thread-safe and makes the running
+    statement fail with an "operation canceled" error.
+    """
+
+    def __init__(self) -> None:
+        self._cursors: list[pyodbc.Cursor] = []
+        self._lock = threading.Lock()
+        self.cancelled = False
+
+    def add(self, cursor: pyodbc.Cursor) -> None:
+        """Track cursor, refusing new work once the scope is cancelled."""
+        with self._lock:
+            if self.cancelled:
+                raise TimeoutError("The tool call was cancelled")
+            self._cursors.append(cursor)
+
+    def cancel(self) -> None:
+        """Cancel every statement running on a tracked cursor."""
+        with self._lock:
+            self.cancelled = True
+            cursors = list(self._cursors)
+        for cursor in cursors:
+            try:
+                cursor.cancel()
+            except pyodbc.Error:
+                pass
+
+
+_scope = threading.local()
+
+
+@contextmanager
+def bind_cancel_scope(scope: CancelScope | None) -> Iterator[CancelScope | None]:
+    """Make scope collect the cursors opened by this thread inside the with block."""
+    previous = getattr(_scope, "current", None)
+    _scope.current = scope
+    try:
+        yield scope
+    finally:
+        _scope.current = previous
+
+
+def current_cancel_scope() -> CancelScope | None:
+    """Return the cancel scope bound to this thread, for handing on to helper threads."""
+    return getattr(_scope, "current", None)
+
+
+def open_cursor(conn: pyodbc.Connection) -> pyodbc.Cursor:
+    """Open a cursor on conn, registering it with the thread's cancel scope if any."""
+    cursor = conn.cursor()
+    scope = current_cancel_scope()
+    if scope is not None:
+        scope.add(cursor)
+    return cursor
+
+
 def check_write_safety(sql: str, read_only: bool) -> None:
     """Raise ValueError if the query contains write operations in read-only mode."""
     if read_only and _WRITE_KEYWORDS.search(sql):
@@ -76,6 +387,7 @@ def execute_query(
     sql: str,
     params: tuple[Any, ...] | None = None,
     database: str | None = None,
+    use_cache: bool = True,
 ) -> list[dict[str, Any]]:
     """Execute a SQL query and return results as a list of dicts.
 
@@ -84,19 +396,27 @@ def execute_query(
         sql: The SQL query to execute.
         params: Optional query parameters for parameterized queries.
         database: Override the database to query. If None, uses the active database.
+        use_cache: Consult the result cache when it is enabled. Pass False
+            for queries that must always see the live server state.
 
     Returns:
         List of dicts where keys are column names.
 
     Raises:
         ValueError: If the query is blocked by read-only mode.
+        TimeoutError: If no pooled connection frees up within the query timeout.
         pyodbc.Error: If the query fails at the database level.
     """
     check_write_safety(sql, cfg.read_only)
 
-    conn = get_connection(cfg, database=database)
-    try:
-        cursor = conn.cursor()
+    cache = get_result_cache(cfg) if use_cache else None
+    key = ("query", database or cfg.database, normalize_sql(sql), params or None)
+    if cache is not None and (cached := cache.get(key)) is not None:
+        return cached
+
+    # Anything but a plain SELECT may leave temp tables or settings behind
+    with pooled_connection(cfg, database=database, reuse=is_plain_select(sql)) as conn:
+        cursor = open_cursor(conn)
         if params:
             cursor.execute(sql, params)
         else:
@@ -110,6 +430,7 @@ def execute_query(
 
         columns = [col[0] for col in cursor.description]
         rows = cursor.fetchmany(cfg.max_rows)
-        return [dict(zip(columns, row)) for row in rows]
-    finally:
-        conn.close()
+    result = [dict(zip(columns, row)) for row in rows]
+    if cache is not None:
+        cache.put(key, result)
+    return result
@@ -0,0 +1,90 @@
+"""Run blocking pyodbc work off the event loop.
+
+pyodbc calls block their thread for the whole round trip, so a tool that
+ran them directly on the event loop would stall every other tool call
+behind one slow query. run_blocking() hands the work to a bounded thread
+pool and awaits it. If the call outlives its timeout, or the client
+cancels it, the statements it is running are cancelled with
+Cursor.cancel() so the worker thread and pooled connection come back.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import atexit
+import threading
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, TypeVar
+
+from mssql_mcp.config import Config
+from mssql_mcp.database import CancelScope, bind_cancel_scope
+
+T = TypeVar("T")
+
+# One worker pool per server, sized by cfg.worker_threads
+_executors: dict[tuple[str, int], ThreadPoolExecutor] = {}
+_executors_lock = threading.Lock()
+
+
+def get_executor(cfg: Config) -> ThreadPoolExecutor:
+    """Return the shared worker pool for cfg's server."""
+    key = (cfg.host, cfg.port)
+    with _executors_lock:
+        executor = _executors.get(key)
+        if executor is None:
+            executor = ThreadPoolExecutor(
+                max_workers=cfg.worker_threads, thread_name_prefix=f"mssql-{cfg.host}"
+            )
+            _executors[key] = executor
+    return executor
+
+
+def shutdown_executors() -> None:
+    """Stop every worker pool, dropping calls that haven't started."""
+    with _executors_lock:
+        executors = list(_executors.values())
+        _executors.clear()
+    for executor in executors:
+        executor.shutdown(wait=False, cancel_futures=True)
+
+
+atexit.register(shutdown_executors)
+
+
+async def run_blocking(
+    cfg: Config,
+    func: Callable[..., T],
+    *args: Any,
+    timeout: float | None = None,
+    **kwargs: Any,
+) -> T:
+    """Run func(*args, **kwargs) on cfg's worker pool and await the result.
+
+    Args:
+        cfg: Server configuration (selects the worker pool).
+        func: Blocking callable; cursors it opens with open_cursor() can be cancelled.
+        timeout: Seconds to wait before cancelling the call, or None to wait indefinitely.
+
+    Raises:
+        TimeoutError: If the call didn't finish within timeout.
+    """
+    scope = CancelScope()
+
+    def call() -> T:
+        with bind_cancel_scope(scope):
+            return func(*args, **kwargs)
+
+    future = get_executor(cfg).submit(call)
+    try:
+        return await asyncio.wait_for(asyncio.wrap_future(future), timeout)
+    except TimeoutError:
+        if future.done() and not future.cancelled():
+            raise  # func itself timed out, e.g. waiting for a pooled connection
+        scope.cancel()
+        raise TimeoutError(
+            f"Tool call exceeded {timeout}s and its query was cancelled"
+        ) from None
+    except asyncio.CancelledError:
+        scope.cancel()
+        raise
@@ -0,0 +1,170 @@
+"""Export query results to files on local disk.
+
+Large extracts don't fit through the query tool's text table, so
+export_to_file() streams a result set with fetchmany straight into a
+Parquet or gzip-compressed CSV file. Only one batch of rows is in memory
+at a time, and the data never passes through the MCP channel — the tool
+returns just the path and a summary.
+
+Parquet output needs the optional ``parquet`` extra (pyarrow).
+"""
+
+from __future__ import annotations
+
+import csv
+import datetime
+import decimal
+import gzip
+import time
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+from mssql_mcp.config import Config
+from mssql_mcp.database import check_write_safety, open_cursor, pooled_connection
+
+if TYPE_CHECKING:
+    import pyarrow as pa
+
+EXPORT_FORMATS = {"parquet": ".parquet", "csv": ".csv.gz"}
+
+
+def _export_path(export_dir: str, filename: str, fmt: str) -> Path:
+    """Resolve filename inside export_dir, refusing paths that escape it."""
+    base = Path(export_dir).resolve()
+    if not filename:
+        filename = datetime.datetime.now().strftime("query_%Y%m%d_%H%M%S")
+    if not filename.endswith(EXPORT_FORMATS[fmt]):
+        filename += EXPORT_FORMATS[fmt]
+    path = (base / filename).resolve()
+    if not path.is_relative_to(base):
+        raise ValueError(f"Export path must stay inside {base}")
+    path.parent.mkdir(parents=True, exist_ok=True)
+    return path
+
+
+def _arrow_type(type_code: type, precision: int | None, scale: int | None) -> pa.DataType:
+    """Map a pyodbc cursor.description type to an Arrow type."""
+    import pyarrow as pa
+
+    if type_code is bool:
+        return pa.bool_()
+    if type_code is int:
+        return pa.int64()
+    if type_code is float:
+        return pa.float64()
+    if type_code is decimal.Decimal and precision and precision <= 38:
+        return pa.decimal128(precision, scale or 0)
+    if type_code is datetime.datetime:
+        return pa.timestamp("us")
+    if type_code is datetime.date:
+        return pa.date32()
+    if type_code is datetime.time:
+        return pa.time64("us")
+    if type_code in (bytes, bytearray):
+        return pa.binary()
+    return pa.string()
+
+
+def _write_parquet(cursor: Any, path: Path, batch_size: int) -> int:
+    """Stream cursor into a Parquet file, one row group per batch."""
+    try:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+    except ImportError as e:
+        raise ImportError(
+            "Parquet export needs pyarrow — install the 'parquet' extra, or use format='csv'"
+        ) from e
+
+    schema = pa.schema(
+        [
+            pa.field(name, _arrow_type(type_code, precision, scale))
+            for name, type_code, _, _, precision, scale, _ in cursor.description
+        ]
+    )
+    # Values Arrow can't take natively (GUIDs, sql_variant, ...) are written as text
+    as_text = [field.type == pa.string() for field in schema]
+
+    row_count = 0
+    with pq.ParquetWriter(path, schema, compression="zstd") as writer:
+        while rows := cursor.fetchmany(batch_size):
+            columns = list(zip(*rows))
+            arrays = [
+                pa.array(
+                    [None if v is None else str(v) for v in values] if text else values,
+                    type=field.type,
+                )
+                for values, field, text in zip(columns, schema, as_text)
+            ]
+            writer.write_table(pa.Table.from_arrays(arrays, schema=schema))
+            row_count += len(rows)
+    return row_count
+
+
+def _write_csv(cursor: Any, path: Path, batch_size: int) -> int:
+    """Stream cursor into a gzip-compressed CSV file with a header row."""
+    row_count = 0
+    with gzip.open(path, "wt", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f)
+        writer.writerow([col[0] for col in cursor.description])
+        while rows := cursor.fetchmany(batch_size):
+            writer.writerows(rows)
+            row_count += len(rows)
+    return row_count
+
+
+def export_to_file(
+    cfg: Config,
+    sql: str,
+    export_dir: str,
+    fmt: str = "parquet",
+    filename: str = "",
+    database: str | None = None,
+    batch_size: int = 50_000,
+) -> dict[str, Any]:
+    """Run sql and write every row to a file in export_dir.
+
+    Unlike execute_query, the result is not capped at max_rows.
+
+    Args:
+        cfg: Server configuration.
+        sql: The SQL query to execute.
+        export_dir: Directory that exports are confined to.
+        fmt: "parquet" or "csv" (gzip-compressed).
+        filename: File name inside export_dir; generated from the time if blank.
+        database: Override the database to query. If None, uses cfg.database.
+        batch_size: Rows fetched and written per batch.
+
+    Returns:
+        Dict with path, rows, bytes and elapsed_s.
+
+    Raises:
+        ValueError: If the query is blocked by read-only mode, returns no
+            result set, or the format or path is invalid.
+        ImportError: If Parquet is requested without pyarrow installed.
+        pyodbc.Error: If the query fails at the database level.
+    """
+    if fmt not in EXPORT_FORMATS:
+        raise ValueError(f"Unknown export format {fmt!r}; use one of {sorted(EXPORT_FORMATS)}")
+    check_write_safety(sql, cfg.read_only)
+    path = _export_path(export_dir, filename, fmt)
+
+    started = time.perf_counter()
+    with pooled_connection(cfg, database=database) as conn:
+        cursor = open_cursor(conn)
+        cursor.execute(sql)
+        if cursor.description is None:
+            raise ValueError("The query did not return a result set to export")
+
+        writer = _write_parquet if fmt == "parquet" else _write_csv
+        try:
+            row_count = writer(cursor, path, batch_size)
+        except BaseException:
+            path.unlink(missing_ok=True)
+            raise
+
+    return {
+        "path": str(path),
+        "rows": row_count,
+        "bytes": path.stat().st_size,
+        "elapsed_s": time.perf_counter() - started,
+    }
@@ -0,0 +1,108 @@
+"""Run one read-only query across many databases on the same instance.
+
+query_databases() sends the query to every selected database at once on
+a bounded set of threads, each borrowing a pooled connection for its
+database, so the wall time is roughly that of the slowest database
+rather than the sum. Failures are recorded per database instead of
+aborting the whole fan-out.
+"""
+
+from __future__ import annotations
+
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any
+
+import pyodbc
+
+from mssql_mcp.config import Config
+from mssql_mcp.database import (
+    bind_cancel_scope,
+    check_write_safety,
+    current_cancel_scope,
+    execute_query,
+    is_plain_select,
+)
+
+_DATABASES_SQL = """
+    SELECT name
+    FROM sys.databases
+    WHERE state_desc = 'ONLINE'
+      AND HAS_DBACCESS(name) = 1
+      AND name LIKE ?
+      AND (? = 1 OR database_id > 4)
+    ORDER BY name
+"""
+
+
+@dataclass
+class DatabaseResult:
+    """The outcome of the fanned-out query in one database."""
+
+    database: str
+    rows: list[dict[str, Any]] = field(default_factory=list)
+    elapsed_s: float = 0.0
+    error: str | None = None
+
+
+def list_accessible_databases(
+    cfg: Config, pattern: str = "%", include_system: bool = False
+) -> list[str]:
+    """Return the online databases matching a LIKE pattern that the login can open.
+
+    master, tempdb, model and msdb are left out unless include_system is set.
+    """
+    rows = execute_query(
+        cfg, _DATABASES_SQL, params=(pattern, int(include_system)), database="master"
+    )
+    return [row["name"] for row in rows]
+
+
+def render_template(sql: str, database: str) -> str:
+    """Substitute {database} in sql, escaped for use inside [brackets]."""
+    return sql.replace("{database}", database.replace("]", "]]"))
+
+
+def query_databases(
+    cfg: Config, sql: str, databases: list[str], max_workers: int
+) -> list[DatabaseResult]:
+    """Run sql in each database concurrently and return the results in database order.
+
+    The query must be read-only whatever cfg.read_only says: a plain
+    SELECT / WITH with no INTO, EXEC or DML, so SELECT ... INTO can't
+    create a table in every database. Each database returns at most
+    cfg.max_rows rows.
+
+    Raises:
+        ValueError: If sql contains write operations.
+    """
+    check_write_safety(sql, read_only=True)
+    if not is_plain_select(sql):
+        raise ValueError(
+            "query_all_databases is read-only: only a plain SELECT or WITH query "
+            f"without INTO can be fanned out. Blocked query: {sql[:100]}..."
+        )
+    # Statements on helper threads must still be cancellable with the tool call
+    scope = current_cancel_scope()
+
+    def run(database: str) -> DatabaseResult:
+        started = time.perf_counter()
+        result = DatabaseResult(database)
+        try:
+            with bind_cancel_scope(scope):
+                result.rows = execute_query(cfg, render_template(sql, database), database=database)
+        except (pyodbc.Error, TimeoutError) as e:
+            result.error = str(e)
+        result.elapsed_s = time.perf_counter() - started
+        return result
+
+    if not databases:
+        return []
+    with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(databases)))) as pool:
+        return list(pool.map(run, databases))
+
+
+def merge_rows(results: list[DatabaseResult]) -> list[dict[str, Any]]:
+    """Concatenate every database's rows, each prefixed with a database column."""
+    return [{"database": result.database, **row} for result in results for row in result.rows]
@@ -0,0 +1,143 @@
+"""Render query results as text for the MCP client.
+
+Every cell is converted to a string exactly once, truncated to a maximum
+width as it goes, and those strings are reused for both column widths
+and output. The rendered text stops at a character budget, so one
+NVARCHAR(MAX) column can't turn a tool result into hundreds of KB.
+
+Output formats:
+    table    aligned columns with a header separator (default)
+    compact  pipe-separated, unpadded — same information, fewer characters
+    csv      RFC 4180 CSV with a header row
+    json     one JSON object per line; numbers, booleans and nulls keep their type
+"""
+
+from __future__ import annotations
+
+import csv
+import io
+import json
+from typing import Any
+
+OUTPUT_FORMATS = ("table", "compact", "csv", "json")
+
+_ELLIPSIS = "…"
+
+
+def _clip(text: str, max_width: int) -> str:
+    """Cut text to max_width characters, marking the cut with an ellipsis."""
+    if len(text) <= max_width:
+        return text
+    return text[: max(max_width - 1, 0)] + _ELLIPSIS
+
+
+def _cell_text(value: Any, max_width: int) -> str:
+    """Stringify one cell for table, compact or CSV output, on a single line."""
+    text = value if isinstance(value, str) else str(value)
+    if "\n" in text or "\r" in text:
+        text = " ".join(text.split())
+    return _clip(text, max_width)
+
+
+def _json_value(value: Any, max_width: int) -> Any:
+    """Keep JSON-native scalars as they are and stringify (and clip) the rest."""
+    if value is None or isinstance(value, (bool, int, float)):
+        return value
+    return _clip(value if isinstance(value, str) else str(value), max_width)
+
+
+def _render_lines(
+    rows: list[dict[str, Any]], columns: list[str], output_format: str, max_width: int
+) -> tuple[str, list[str]]:
+    """Return the header line and one line per row for the given format."""
+    if output_format == "json":
+        dumps = json.JSONEncoder(ensure_ascii=False, default=str).encode
+        lines = [
+            dumps({col: _json_value(row.get(col), max_width) for col in columns}) for row in rows
+        ]
+        return "", lines
+
+    header = [_clip(str(col), max_width) for col in columns]
+    cells = [[_cell_text(row.get(col, ""), max_width) for col in columns] for row in rows]
+
+    if output_format == "csv":
+        buffer = io.StringIO()
+        writer = csv.writer(buffer, lineterminator="\n")
+        writer.writerow(header)
+        writer.writerows(cells)
+        header_line, *lines = buffer.getvalue().splitlines()
+        return header_line, lines
+
+    if output_format == "compact":
+        return "|".join(header), ["|".join(line) for line in cells]
+
+    widths = [len(name) for name in header]
+    for line in cells:
+        for i, text in enumerate(line):
+            if len(text) > widths[i]:
+                widths[i] = len(text)
+    header_line = " | ".join(name.ljust(widths[i]) for i, name in enumerate(header))
+    separator = "-+-".join("-" * width for width in widths)
+    lines = [" | ".join(text.ljust(widths[i]) for i, text in enumerate(line)) for line in cells]
+    return f"{header_line}\n{separator}", lines
+
+
+def format_rows(
+    rows: list[dict[str, Any]],
+    max_display: int = 50,
+    max_rows: int | None = None,
+    output_format: str = "table",
+    max_width: int = 200,
+    max_chars: int = 50_000,
+) -> tuple[str, int]:
+    """Format query results as text within a cell-width and output-size budget.
+
+    Args:
+        rows: Result rows; column names come from the first row.
+        max_display: Rows to render at most.
+        max_rows: The query's row cap, to flag results that hit it.
+        output_format: One of OUTPUT_FORMATS.
+        max_width: Characters kept per cell (and per column name).
+        max_chars: Approximate size limit of the rendered text; rows past
+            it are dropped with a note.
+
+    Returns:
+        The text, and how many of the leading rows it shows, so a pager
+        can continue from the first row left out.
+
+    Raises:
+        ValueError: If output_format is unknown.
+    """
+    if output_format not in OUTPUT_FORMATS:
+        raise ValueError(
+            f"Unknown output format {output_format!r}; use one of {', '.join(OUTPUT_FORMATS)}"
+        )
+    if not rows:
+        return "No results returned.", 0
+
+    columns = list(rows[0].keys())
+    header, lines = _render_lines(rows[:max_display], columns, output_format, max_width)
+
+    parts = [header] if header else []
+    used = len(header)
+    shown = 0
+    for line in lines:
+        # Always show at least one row, even if it alone is over budget
+        if shown and used + len(line) + 1 > max_chars:
+            break
+        parts.append(line)
+        used += len(line) + 1
+        shown += 1
+
+    result = "\n".join(parts)
+    if shown < len(lines):
+        result += (
+            f"\n\n... output limited to ~{max_chars:,} characters: "
+            f"showing {shown} of {len(rows)} rows"
+        )
+    elif len(rows) > max_display:
+        result += f"\n\n... showing {max_display} of {len(rows)} rows"
+    elif len(rows) == max_rows:
+        result += f"\n\n... result capped at max_rows={max_rows}"
+
+    return result, shown
@@ -0,0 +1,197 @@
+"""Paginated query execution.
+
+Instead of fetching max_rows and displaying 50, a page fetches only
+page_size rows (plus one to learn whether more exist). Queries ending in
+a top-level ORDER BY are rewritten to OFFSET / FETCH so the server skips
+earlier rows itself. Only those queries can be continued: without an
+ORDER BY, a later page would have to stream every earlier row to the
+client just to skip it, and with no ordering the pages could overlap or
+miss rows between calls. Other queries return their first page only,
+and the caller is told to add an ORDER BY. The total is estimated from
+the query plan, so the query is never run just to count it.
+
+Only plain SELECT / WITH queries are paged. Anything that may write —
+INSERT ... SELECT, SELECT ... INTO, a CTE feeding an UPDATE — runs once,
+unchanged, as execute_query runs it: appending OFFSET / FETCH would
+silently write only one page of rows, and a next_page token would run
+the write again.
+
+Pages are stateless: a continuation token carries the instance, SQL,
+database and position, so no cursor or connection is held open between tool calls.
+"""
+
+from __future__ import annotations
+
+import base64
+import binascii
+import json
+import re
+import zlib
+from dataclasses import asdict, dataclass
+from typing import Any
+
+import pyodbc
+
+from mssql_mcp.config import Config
+from mssql_mcp.database import (
+    check_write_safety,
+    execute_query,
+    get_result_cache,
+    is_plain_select,
+    normalize_sql,
+    open_cursor,
+    pooled_connection,
+)
+
+# A trailing ORDER BY clause with no parentheses after it, i.e. not inside a
+# subquery or OVER (...) and without function calls we can't safely reason about
+_ORDER_BY_TAIL = re.compile(r"\bORDER\s+BY\b[^()]*$", re.IGNORECASE)
+_NO_OFFSET_REWRITE = re.compile(r"\b(TOP|OFFSET|FETCH|FOR\s+(XML|JSON|BROWSE))\b", re.IGNORECASE)
+
+_ESTIMATED_ROWS = re.compile(r'StatementEstRows="([0-9.eE+-]+)"')
+
+
+@dataclass(frozen=True)
+class PageToken:
+    """Where the next page of a query starts."""
+
+    sql: str
+    database: str | None
+    offset: int
+    page_size: int
+    estimated_rows: int | None = None
+    instance: str = ""
+
+
+def encode_page_token(token: PageToken) -> str:
+    """Serialize a PageToken into a compact URL-safe string."""
+    payload = zlib.compress(json.dumps(asdict(token)).encode())
+    return base64.urlsafe_b64encode(payload).decode()
+
+
+def decode_page_token(value: str) -> PageToken:
+    """Parse a token produced by encode_page_token.
+
+    Raises:
+        ValueError: If the token is malformed.
+    """
+    try:
+        fields = json.loads(zlib.decompress(base64.urlsafe_b64decode(value.encode())))
+        return PageToken(**fields)
+    except (binascii.Error, zlib.error, ValueError, TypeError) as e:
+        raise ValueError(f"malformed page token ({e})") from e
+
+
+def is_pageable(sql: str) -> bool:
+    """Return True if sql is a plain SELECT / WITH query that writes nothing."""
+    return is_plain_select(sql)
+
+
+def offset_fetch_sql(sql: str, offset: int, limit: int) -> str | None:
+    """Rewrite sql to return only rows offset..offset+limit, or None if it can't be.
+
+    Only pageable queries that end in a simple top-level ORDER BY are
+    rewritten — OFFSET / FETCH needs one, and without it page boundaries
+    wouldn't be stable between calls.
+    """
+    sql = sql.strip().rstrip(";").rstrip()
+    if not is_pageable(sql):
+        return None
+    if not _ORDER_BY_TAIL.search(sql) or _NO_OFFSET_REWRITE.search(sql):
+        return None
+    return f"{sql}\nOFFSET {int(offset)} ROWS FETCH NEXT {int(limit)} ROWS ONLY"
+
+
+def is_resumable(sql: str) -> bool:
+    """Return True if sql can be rewritten to OFFSET / FETCH, so a later page can follow."""
+    return offset_fetch_sql(sql, 0, 1) is not None
+
+
+def execute_page(
+    cfg: Config,
+    sql: str,
+    offset: int,
+    page_size: int,
+    database: str | None = None,
+) -> tuple[list[dict[str, Any]], bool]:
+    """Execute sql and return one page of rows plus whether more rows follow.
+
+    Pages are served from the result cache when it is enabled. Queries
+    that aren't pageable (see is_pageable) run unpaged through
+    execute_query and never report more rows, so no token repeats them.
+    Queries that aren't resumable (see is_resumable) return only their
+    first page.
+
+    Args:
+        cfg: Server configuration.
+        sql: The SQL query to execute.
+        offset: Number of leading rows to skip.
+        page_size: Maximum rows to return.
+        database: Override the database to query. If None, uses cfg.database.
+
+    Raises:
+        ValueError: If the query is blocked by read-only mode, or offset is
+            past the first page of a query that isn't resumable.
+        pyodbc.Error: If the query fails at the database level.
+    """
+    check_write_safety(sql, cfg.read_only)
+    if not is_pageable(sql):
+        return execute_query(cfg, sql, database=database, use_cache=False), False
+    paged_sql = offset_fetch_sql(sql, offset, page_size + 1)
+    if paged_sql is None and offset:
+        raise ValueError(
+            "Only queries ending in a top-level ORDER BY (without TOP) can be continued; "
+            "add one and run the query again"
+        )
+
+    cache = get_result_cache(cfg)
+    key = ("page", database or cfg.database, normalize_sql(sql), offset, page_size)
+    if cache is not None and (cached := cache.get(key)) is not None:
+        return cached
+
+    with pooled_connection(cfg, database=database) as conn:
+        cursor = open_cursor(conn)
+        cursor.execute(paged_sql or sql)
+
+        # If the query doesn't return rows (e.g. INSERT), return affected count
+        if cursor.description is None:
+            row_count = cursor.rowcount
+            conn.commit()
+            return [{"affected_rows": row_count}], False
+
+        columns = [col[0] for col in cursor.description]
+        rows = cursor.fetchmany(page_size + 1)
+
+    page = [dict(zip(columns, row)) for row in rows[:page_size]], len(rows) > page_size
+    if cache is not None:
+        cache.put(key, page)
+    return page
+
+
+def estimate_row_count(cfg: Config, sql: str, database: str | None = None) -> int | None:
+    """Estimate how many rows sql returns from its query plan, without running it.
+
+    Returns None if the plan can't be read (e.g. missing SHOWPLAN permission).
+    """
+    check_write_safety(sql, cfg.read_only)
+
+    try:
+        with pooled_connection(cfg, database=database) as conn:
+            cursor = open_cursor(conn)
+            cursor.execute("SET SHOWPLAN_XML ON")
+            try:
+                cursor.execute(sql)
+                plan = cursor.fetchone()[0]
+            finally:
+                try:
+                    cursor.execute("SET SHOWPLAN_XML OFF")
+                except pyodbc.Error:
+                    # Never return a connection stuck in showplan mode to the
+                    # pool — a closed connection fails rollback and is dropped
+                    conn.close()
+                    raise
+    except pyodbc.Error:
+        return None
+
+    match = _ESTIMATED_ROWS.search(plan or "")
+    return round(float(match.group(1))) if match else None
@@ -0,0 +1,256 @@
+"""Local searchable snapshot of a database's schema.
+
+snapshot_database() pulls every column, type, primary key, foreign key
+and row count for a database in three set-based catalog queries and
+stores them in a SQLite FTS5 index. search_index() then answers
+"which columns look like X" from that file without touching the server.
+
+Identifiers are indexed in a normalized form — camelCase and
+snake_case split into lowercase words, plus the words run together —
+with the trigram tokenizer, so "api number" finds API_Number, ApiNum
+and api_no_10 alike.
+"""
+
+from __future__ import annotations
+
+import re
+import sqlite3
+import time
+from pathlib import Path
+from typing import Any
+
+from mssql_mcp.config import Config
+from mssql_mcp.database import open_cursor, pooled_connection
+
+_TABLES_SQL = """
+    SELECT
+        s.name          AS [schema],
+        t.name          AS [table],
+        SUM(p.rows)     AS [row_count]
+    FROM sys.tables t
+    JOIN sys.schemas s ON s.schema_id = t.schema_id
+    JOIN sys.partitions p ON p.object_id = t.object_id AND p.index_id IN (0, 1)
+    GROUP BY s.name, t.name
+"""
+
+_COLUMNS_SQL = """
+    SELECT
+        s.name          AS [schema],
+        t.name          AS [table],
+        c.name          AS [column],
+        ty.name         AS [type],
+        c.max_length    AS [max_length],
+        c.is_nullable   AS [nullable],
+        CASE WHEN pk.column_id IS NOT NULL THEN 1 ELSE 0 END AS [primary_key]
+    FROM sys.tables t
+    JOIN sys.schemas s ON s.schema_id = t.schema_id
+    JOIN sys.columns c ON c.object_id = t.object_id
+    JOIN sys.types ty ON ty.user_type_id = c.user_type_id
+    LEFT JOIN (
+        SELECT ic.object_id, ic.column_id
+        FROM sys.indexes i
+        JOIN sys.index_columns ic
+            ON ic.object_id = i.object_id AND ic.index_id = i.index_id
+        WHERE i.is_primary_key = 1
+    ) pk
+        ON pk.object_id = c.object_id AND pk.column_id = c.column_id
+    ORDER BY s.name, t.name, c.column_id
+"""
+
+_FOREIGN_KEYS_SQL = """
+    SELECT
+        SCHEMA_NAME(pt.schema_id)   AS [schema],
+        pt.name                     AS [table],
+        pc.name                     AS [column],
+        SCHEMA_NAME(rt.schema_id)   AS [ref_schema],
+        rt.name                     AS [ref_table],
+        rc.name                     AS [ref_column]
+    FROM sys.foreign_key_columns fkc
+    JOIN sys.tables pt ON pt.object_id = fkc.parent_object_id
+    JOIN sys.columns pc
+        ON pc.object_id = fkc.parent_object_id AND pc.column_id = fkc.parent_column_id
+    JOIN sys.tables rt ON rt.object_id = fkc.referenced_object_id
+    JOIN sys.columns rc
+        ON rc.object_id = fkc.referenced_object_id AND rc.column_id = fkc.referenced_column_id
+"""
+
+_INDEX_SCHEMA = """
+    CREATE VIRTUAL TABLE IF NOT EXISTS columns USING fts5(
+        column_text,
+        table_text,
+        server UNINDEXED,
+        database UNINDEXED,
+        schema_name UNINDEXED,
+        table_name UNINDEXED,
+        column_name UNINDEXED,
+        data_type UNINDEXED,
+        nullable UNINDEXED,
+        primary_key UNINDEXED,
+        references_to UNINDEXED,
+        row_count UNINDEXED,
+        tokenize = 'trigram'
+    );
+    CREATE TABLE IF NOT EXISTS snapshots (
+        server      TEXT NOT NULL,
+        database    TEXT NOT NULL,
+        taken_at    REAL NOT NULL,
+        tables      INTEGER NOT NULL,
+        columns     INTEGER NOT NULL,
+        PRIMARY KEY (server, database)
+    );
+"""
+
+
+def normalize_identifier(name: str) -> str:
+    """Split camelCase / snake_case / digits into lowercase space-separated words."""
+    name = re.sub(r"([a-z])([A-Z])", r"\1 \2", name)
+    name = re.sub(r"([A-Z]+)([A-Z][a-z])", r"\1 \2", name)
+    name = re.sub(r"([A-Za-z])([0-9])|([0-9])([A-Za-z])", r"\1\3 \2\4", name)
+    return " ".join(re.split(r"[^0-9A-Za-z]+", name)).strip().lower()
+
+
+def _search_text(name: str) -> str:
+    """Indexed text for an identifier: its words plus the words run together.
+
+    The compact form lets 'apinum' match ApiNum as well as 'api num'.
+    """
+    words = normalize_identifier(name)
+    return f"{words} {words.replace(' ', '')}"
+
+
+def _format_type(data_type: str, max_length: int) -> str:
+    """Render a column type with its length for the character types."""
+    if data_type in ("varchar", "char", "varbinary", "binary"):
+        return f"{data_type}({'max' if max_length == -1 else max_length})"
+    if data_type in ("nvarchar", "nchar"):
+        return f"{data_type}({'max' if max_length == -1 else max_length // 2})"
+    return data_type
+
+
+def _fetch_all(cfg: Config, database: str, sql: str) -> list[tuple]:
+    """Run a catalog query and return every row (not capped at max_rows)."""
+    with pooled_connection(cfg, database=database) as conn:
+        cursor = open_cursor(conn)
+        cursor.execute(sql)
+        return [tuple(row) for row in cursor.fetchall()]
+
+
+def _open_index(index_path: str) -> sqlite3.Connection:
+    """Open the index file, creating it and its tables if needed."""
+    Path(index_path).parent.mkdir(parents=True, exist_ok=True)
+    db = sqlite3.connect(index_path)
+    db.executescript(_INDEX_SCHEMA)
+    return db
+
+
+def snapshot_database(cfg: Config, database: str, index_path: str) -> dict[str, Any]:
+    """Snapshot one database's schema into the local index, replacing any older snapshot.
+
+    Returns counts of tables, columns and foreign keys plus the elapsed seconds.
+    """
+    started = time.perf_counter()
+    server = f"{cfg.host},{cfg.port}"
+
+    row_counts = {
+        (schema, table): row_count
+        for schema, table, row_count in _fetch_all(cfg, database, _TABLES_SQL)
+    }
+    references = {
+        (schema, table, column): f"{ref_schema}.{ref_table}.{ref_column}"
+        for schema, table, column, ref_schema, ref_table, ref_column in _fetch_all(
+            cfg, database, _FOREIGN_KEYS_SQL
+        )
+    }
+    columns = _fetch_all(cfg, database, _COLUMNS_SQL)
+
+    records = [
+        (
+            _search_text(column),
+            _search_text(table),
+            server,
+            database,
+            schema,
+            table,
+            column,
+            _format_type(data_type, max_length),
+            int(bool(nullable)),
+            int(bool(primary_key)),
+            references.get((schema, table, column)),
+            row_counts.get((schema, table)),
+        )
+        for schema, table, column, data_type, max_length, nullable, primary_key in columns
+    ]
+
+    db = _open_index(index_path)
+    try:
+        with db:
+            db.execute(
+                "DELETE FROM columns WHERE server = ? AND database = ?", (server, database)
+            )
+            db.executemany(f"INSERT INTO columns VALUES ({', '.join('?' * 12)})", records)
+            db.execute(
+                "INSERT OR REPLACE INTO snapshots VALUES (?, ?, ?, ?, ?)",
+                (server, database, time.time(), len(row_counts), len(records)),
+            )
+    finally:
+        db.close()
+
+    return {
+        "tables": len(row_counts),
+        "columns": len(records),
+        "foreign_keys": len(references),
+        "elapsed_s": time.perf_counter() - started,
+    }
+
+
+def search_index(
+    index_path: str, server: str, database: str, text: str, limit: int = 20
+) -> list[dict[str, Any]] | None:
+    """Find columns whose names resemble text, best matches first.
+
+    Column names weigh ten times more than table names. Terms shorter than
+    three characters can't use the trigram index and fall back to a
+    substring scan. Returns None if the database has never been snapshotted.
+    """
+    if not Path(index_path).exists():
+        return None
+
+    db = _open_index(index_path)
+    try:
+        if not db.execute(
+            "SELECT 1 FROM snapshots WHERE server = ? AND database = ?", (server, database)
+        ).fetchone():
+            return None
+
+        terms = normalize_identifier(text).split()
+        long_terms = [term for term in terms if len(term) >= 3]
+        select = """
+            SELECT schema_name, table_name, column_name, data_type,
+                   CASE nullable WHEN 1 THEN 'YES' ELSE 'NO' END,
+                   CASE primary_key WHEN 1 THEN 'YES' ELSE 'NO' END,
+                   COALESCE(references_to, ''), row_count
+            FROM columns
+        """
+        if long_terms:
+            match = " OR ".join(f'"{term}"' for term in long_terms)
+            rows = db.execute(
+                select + """
+                WHERE columns MATCH ? AND server = ? AND database = ?
+                ORDER BY bm25(columns, 10.0, 1.0)
+                LIMIT ?
+                """,
+                (match, server, database, limit),
+            ).fetchall()
+        else:
+            like = " AND ".join("column_text LIKE ?" for _ in terms) or "1 = 1"
+            rows = db.execute(
+                select + f"WHERE server = ? AND database = ? AND {like} LIMIT ?",
+                (server, database, *(f"%{term}%" for term in terms), limit),
+            ).fetchall()
+    finally:
+        db.close()
+
+    keys = (
+        "schema", "table", "column", "type", "nullable", "primary_key", "references", "row_count"
+    )
+    return [dict(zip(keys, row)) for row in rows]
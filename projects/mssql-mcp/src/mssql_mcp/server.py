@@ -1,5 +1,11 @@
 """FastMCP server exposing SQL Server tools to Claude Code.
 
+One process can serve several SQL Server instances. They are named in
+MSSQL_INSTANCES (env-var prefixes) or MSSQL_INSTANCES_FILE (TOML), and
+every tool takes an ``instance`` argument. Each instance keeps its own
+active database, connection pools and caches. With neither set, the
+single instance configured by MSSQL_* is served.
+
 Run directly:
     python -m mssql_mcp.server
 
@@ -17,13 +23,38 @@ Or register in Claude Code settings:
 
 from __future__ import annotations
 
+import functools
+import inspect
 import json
-from typing import Annotated
+import time
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass
+from typing import Annotated, ParamSpec
 
 from fastmcp import FastMCP
 
-from mssql_mcp.config import Config
-from mssql_mcp.database import execute_query, get_connection
+from mssql_mcp.cache import MetadataCache
+from mssql_mcp.config import Config, load_instance_configs
+from mssql_mcp.database import (
+    execute_query,
+    get_result_cache,
+    open_cursor,
+    pooled_connection,
+)
+from mssql_mcp.executor import run_blocking
+from mssql_mcp.export import export_to_file
+from mssql_mcp.fanout import list_accessible_databases, merge_rows, query_databases
+from mssql_mcp.formatting import OUTPUT_FORMATS, format_rows
+from mssql_mcp.pagination import (
+    PageToken,
+    decode_page_token,
+    encode_page_token,
+    estimate_row_count,
+    execute_page,
+    is_pageable,
+    is_resumable,
+)
+from mssql_mcp.schema_index import search_index, snapshot_database
 
 # ---------------------------------------------------------------------------
 # Server setup
@@ -34,57 +65,220 @@ mcp = FastMCP(
     instructions=(
         "MCP server for querying Microsoft SQL Server databases. "
         "Use the available tools to explore schemas, list tables, "
-        "describe columns, and run SQL queries."
+        "describe columns, and run SQL queries. If several SQL Server "
+        "instances are configured (see list_instances), pass instance= "
+        "to pick one; blank means the default instance."
     ),
 )
 
-# Load config once at startup
-_cfg = Config()
 
-# Active database — starts as the configured default, can be changed with use_database()
-_active_database: str | None = None
+@dataclass
+class Instance:
+    """A SQL Server instance served by this process, with its per-instance state.
+
+    Connection pools, result caches and worker pools are keyed by server
+    in their own modules, so each instance gets its own of those too.
+    """
+
+    name: str
+    cfg: Config
+    metadata_cache: MetadataCache
+    # Starts as the configured default, can be changed with use_database()
+    active_database: str | None = None
+
+    @property
+    def database(self) -> str:
+        """The currently active database name."""
+        return self.active_database or self.cfg.database
+
+    @property
+    def server(self) -> str:
+        """The host,port string identifying this instance in cache keys."""
+        return f"{self.cfg.host},{self.cfg.port}"
+
+
+# Served instances by name; the first one is the default
+_instances: dict[str, Instance] = {}
+
+
+def configure_instances(configs: dict[str, Config]) -> None:
+    """Replace the served instances, each starting on its configured database."""
+    _instances.clear()
+    for name, cfg in configs.items():
+        _instances[name] = Instance(
+            name, cfg, MetadataCache(cfg.metadata_cache_ttl, cfg.metadata_cache_size)
+        )
+
+
+# Load instance configs once at startup
+configure_instances(load_instance_configs())
+
+_INSTANCE_HELP = "Named SQL Server instance from list_instances() (blank = default)"
+_OUTPUT_FORMAT_HELP = (
+    "'table' (aligned), 'compact' (pipe-separated, fewest characters), 'csv' or 'json' (lines)"
+)
+
+
+def _get_instance(name: str = "") -> Instance:
+    """Return the named instance, or the default one for a blank name.
+
+    Raises:
+        ValueError: If no instance has that name.
+    """
+    if not name:
+        return next(iter(_instances.values()))
+    try:
+        return _instances[name.lower()]
+    except KeyError:
+        raise ValueError(
+            f"Unknown instance {name!r}; available: {', '.join(_instances)}"
+        ) from None
 
 
-def _get_active_db() -> str:
-    """Return the currently active database name."""
-    return _active_database or _cfg.database
+def _get_active_db(instance: str = "") -> str:
+    """Return the currently active database name of an instance."""
+    return _get_instance(instance).database
 
 
 # ---------------------------------------------------------------------------
 # Helper
 # ---------------------------------------------------------------------------
 
-def _format_results(rows: list[dict], max_display: int = 50) -> str:
-    """Format query results as a readable table string."""
-    if not rows:
-        return "No results returned."
+P = ParamSpec("P")
+
 
-    # Get column names from first row
-    columns = list(rows[0].keys())
-    display_rows = rows[:max_display]
+def _offloaded(
+    timed: bool = True,
+) -> Callable[[Callable[P, str]], Callable[P, Awaitable[str]]]:
+    """Turn a blocking tool body into an async handler run on the worker pool.
 
-    # Calculate column widths
-    widths = {col: len(str(col)) for col in columns}
-    for row in display_rows:
-        for col in columns:
-            widths[col] = max(widths[col], len(str(row.get(col, ""))))
+    Slow queries then no longer hold up other tool calls. The call runs on
+    the worker pool of the instance named by its ``instance`` argument, and
+    unless timed is False its running statements are cancelled after that
+    instance's tool_timeout.
+    """
 
-    # Build table
-    header = " | ".join(str(col).ljust(widths[col]) for col in columns)
-    separator = "-+-".join("-" * widths[col] for col in columns)
-    lines = [header, separator]
+    def decorate(func: Callable[P, str]) -> Callable[P, Awaitable[str]]:
+        signature = inspect.signature(func)
 
-    for row in display_rows:
-        line = " | ".join(str(row.get(col, "")).ljust(widths[col]) for col in columns)
-        lines.append(line)
+        @functools.wraps(func)
+        async def tool(*args: P.args, **kwargs: P.kwargs) -> str:
+            name = signature.bind(*args, **kwargs).arguments.get("instance", "")
+            cfg = _get_instance(name).cfg
+            timeout = cfg.tool_timeout if timed else None
+            return await run_blocking(cfg, func, *args, timeout=timeout, **kwargs)
 
-    result = "\n".join(lines)
-    if len(rows) > max_display:
-        result += f"\n\n... showing {max_display} of {len(rows)} rows"
-    elif len(rows) == _cfg.max_rows:
-        result += f"\n\n... result capped at max_rows={_cfg.max_rows}"
+        return tool
 
-    return result
+    return decorate
+
+
+def _format_results(
+    rows: list[dict],
+    max_display: int = 50,
+    max_rows: int | None = None,
+    output_format: str = "table",
+    cfg: Config | None = None,
+) -> str:
+    """Format query results within cfg's cell-width and output-size budget.
+
+    Pass the instance's max_rows to flag results that hit the cap. cfg
+    defaults to the default instance's config.
+    """
+    return _format_page(rows, max_display, max_rows, output_format, cfg)[0]
+
+
+def _format_page(
+    rows: list[dict],
+    max_display: int = 50,
+    max_rows: int | None = None,
+    output_format: str = "table",
+    cfg: Config | None = None,
+) -> tuple[str, int]:
+    """Format like _format_results, also returning how many leading rows were shown."""
+    cfg = cfg or _get_instance().cfg
+    return format_rows(
+        rows,
+        max_display=max_display,
+        max_rows=max_rows,
+        output_format=output_format,
+        max_width=cfg.max_cell_width,
+        max_chars=cfg.max_output_chars,
+    )
+
+
+def _metadata_key(inst: Instance, schema: str | None, table: str | None, lookup: str) -> tuple:
+    """Build a metadata cache key for an object in the instance's active database."""
+    return (inst.server, inst.database, schema, table, lookup)
+
+
+def _catalog_version(inst: Instance, sql: str, params: tuple | None = None):
+    """Return a callable running a one-row version query against the active database."""
+    database = inst.database
+
+    def version() -> tuple | None:
+        rows = execute_query(inst.cfg, sql, params=params, database=database, use_cache=False)
+        return tuple(rows[0].values()) if rows else None
+
+    return version
+
+
+# Version queries: cached metadata is reused while these results are unchanged
+_LIST_TABLES_VERSION_SQL = """
+    SELECT COUNT(*) AS [tables], MAX(t.modify_date) AS [modified], SUM(p.rows) AS [rows]
+    FROM sys.tables t
+    JOIN sys.partitions p ON p.object_id = t.object_id AND p.index_id IN (0, 1)
+    WHERE SCHEMA_NAME(t.schema_id) = ?
+"""
+
+_LIST_SCHEMAS_VERSION_SQL = """
+    SELECT COUNT(*) AS [tables], MAX(modify_date) AS [modified]
+    FROM sys.tables
+"""
+
+_DESCRIBE_TABLE_VERSION_SQL = """
+    SELECT o.modify_date AS [modified]
+    FROM sys.objects o
+    WHERE o.schema_id = SCHEMA_ID(?) AND o.name = ?
+"""
+
+
+def _query_page(page: PageToken, output_format: str = "table") -> str:
+    """Run one page of a query and format it, with a continuation token if more rows exist."""
+    if output_format not in OUTPUT_FORMATS:
+        return f"Unknown output_format {output_format!r}; use one of {', '.join(OUTPUT_FORMATS)}"
+    cfg = _get_instance(page.instance).cfg
+    page_size = max(1, min(page.page_size, cfg.max_rows))
+    rows, has_more = execute_page(
+        cfg, page.sql, page.offset, page_size, database=page.database
+    )
+    result, shown = _format_page(
+        rows, max_display=page_size, output_format=output_format, cfg=cfg
+    )
+    # Rows the output budget left out start the next page; statements that
+    # aren't pageable must not be run again for them
+    if not (has_more or (shown < len(rows) and is_pageable(page.sql))):
+        return result
+    if not is_resumable(page.sql):
+        return (
+            f"{result}\n\n... rows {page.offset + 1}-{page.offset + shown}; more rows exist. "
+            "Add a top-level ORDER BY (without TOP) to page through the rest."
+        )
+
+    estimated_rows = page.estimated_rows
+    if estimated_rows is None and page.offset == 0:
+        estimated_rows = estimate_row_count(cfg, page.sql, database=page.database)
+    next_token = encode_page_token(
+        PageToken(
+            page.sql, page.database, page.offset + shown, page_size, estimated_rows,
+            page.instance,
+        )
+    )
+    total = f" of ~{estimated_rows:,} (estimated)" if estimated_rows is not None else ""
+    return (
+        f"{result}\n\n... rows {page.offset + 1}-{page.offset + shown}{total}. "
+        f'More rows available: next_page(token="{next_token}")'
+    )
 
 
 # ---------------------------------------------------------------------------
@@ -92,25 +286,152 @@ def _format_results(rows: list[dict], max_display: int = 50) -> str:
 # ---------------------------------------------------------------------------
 
 @mcp.tool()
+def list_instances() -> str:
+    """List the SQL Server instances this server can query, with their active databases.
+
+    Pass a name as the instance argument of any other tool.
+    """
+    default = next(iter(_instances))
+    rows = [
+        {
+            "instance": name + (" (default)" if name == default else ""),
+            "server": inst.server,
+            "database": inst.database,
+            "read_only": "YES" if inst.cfg.read_only else "NO",
+        }
+        for name, inst in _instances.items()
+    ]
+    return _format_results(rows, max_display=len(rows))
+
+
+@mcp.tool()
+@_offloaded()
 def query(
     sql: Annotated[str, "The SQL query to execute"],
+    page_size: Annotated[int, "Rows to return in this page"] = 50,
+    output_format: Annotated[str, _OUTPUT_FORMAT_HELP] = "table",
+    instance: Annotated[str, _INSTANCE_HELP] = "",
 ) -> str:
     """Execute a SQL query against the active database.
 
-    Returns results as a formatted table. By default the server runs in
-    read-only mode — only SELECT queries are allowed. Set MSSQL_READ_ONLY=false
-    to enable write operations.
+    Returns the first page_size rows as a formatted table, with an estimated
+    total and a next_page token when more rows are available (queries must
+    end in a top-level ORDER BY to be continued). By default the server runs in
+    read-only mode — only SELECT queries are allowed. Set <PREFIX>_READ_ONLY=false
+    (e.g. MSSQL_READ_ONLY) to enable write operations.
+
+    Long cell values are truncated and the whole result is kept within a
+    size budget; use output_format='compact' or 'csv' to fit more rows.
 
     Tip: You can query across databases using three-part names like
     [other_db].[schema].[table] without switching databases.
     """
-    rows = execute_query(_cfg, sql, database=_get_active_db())
-    return _format_results(rows)
+    inst = _get_instance(instance)
+    return _query_page(
+        PageToken(sql, inst.database, 0, page_size, instance=inst.name), output_format
+    )
+
+
+@mcp.tool()
+@_offloaded()
+def next_page(
+    token: Annotated[str, "The next_page token printed under a previous query() result"],
+    output_format: Annotated[str, _OUTPUT_FORMAT_HELP] = "table",
+) -> str:
+    """Fetch the next page of a query() result.
+
+    The token records the instance, query, database and position, so this
+    works even after switching databases.
+    """
+    try:
+        page = decode_page_token(token)
+    except ValueError as e:
+        return f"Invalid page token: {e}"
+    return _query_page(page, output_format)
+
+
+@mcp.tool()
+@_offloaded(timed=False)
+def export_query(
+    sql: Annotated[str, "The SQL query whose full result should be exported"],
+    format: Annotated[str, "'parquet' or 'csv' (gzip-compressed)"] = "parquet",
+    filename: Annotated[str, "File name in the export directory (blank = timestamped)"] = "",
+    instance: Annotated[str, _INSTANCE_HELP] = "",
+) -> str:
+    """Export the complete result of a query to a local Parquet or gzip CSV file.
+
+    Use this instead of query() when the user needs the data itself, e.g. a
+    multi-million-row extract. Rows are streamed to disk in batches and are
+    not capped at max_rows; only the file path and a summary come back.
+    """
+    inst = _get_instance(instance)
+    try:
+        result = export_to_file(
+            inst.cfg, sql, inst.cfg.export_dir, fmt=format, filename=filename,
+            database=inst.database,
+        )
+    except (ImportError, ValueError) as e:
+        return f"Export failed: {e}"
+    return (
+        f"Exported {result['rows']:,} rows to {result['path']}\n"
+        f"Size: {result['bytes']:,} bytes\n"
+        f"Elapsed: {result['elapsed_s']:.1f}s"
+    )
+
+
+@mcp.tool()
+@_offloaded()
+def query_all_databases(
+    sql: Annotated[str, "Read-only query to run in every database; {database} becomes its name"],
+    database_pattern: Annotated[str, "LIKE pattern selecting databases, e.g. 'Sales%'"] = "%",
+    include_system: Annotated[bool, "Also query master, model, msdb and tempdb"] = False,
+    max_display: Annotated[int, "Maximum merged rows to display"] = 200,
+    output_format: Annotated[str, _OUTPUT_FORMAT_HELP] = "table",
+    instance: Annotated[str, _INSTANCE_HELP] = "",
+) -> str:
+    """Run the same read-only query in many databases on this server at once.
+
+    Use this instead of use_database() + query() per database, e.g. to find
+    which databases have a column. The query runs in each database's context
+    concurrently; results are merged with a leading database column and
+    followed by per-database timings and errors.
+    """
+    if output_format not in OUTPUT_FORMATS:
+        return f"Unknown output_format {output_format!r}; use one of {', '.join(OUTPUT_FORMATS)}"
+    cfg = _get_instance(instance).cfg
+    databases = list_accessible_databases(cfg, database_pattern, include_system)
+    if not databases:
+        return f"No accessible databases match {database_pattern!r}."
+
+    started = time.perf_counter()
+    try:
+        results = query_databases(cfg, sql, databases, cfg.fanout_workers)
+    except ValueError as e:
+        return str(e)
+    elapsed = time.perf_counter() - started
+
+    timings = [
+        {
+            "database": result.database,
+            "rows": len(result.rows),
+            "elapsed_s": f"{result.elapsed_s:.2f}",
+            "error": result.error or "",
+        }
+        for result in results
+    ]
+    failed = sum(1 for result in results if result.error)
+    return (
+        f"{_format_results(merge_rows(results), max_display, output_format=output_format, cfg=cfg)}"
+        f"\n\nQueried {len(results)} databases in {elapsed:.2f}s ({failed} failed):\n"
+        f"{_format_results(timings, max_display=len(timings), cfg=cfg)}"
+    )
 
 
 @mcp.tool()
+@_offloaded()
 def list_tables(
     schema: Annotated[str, "Schema name to list tables from"] = "dbo",
+    instance: Annotated[str, _INSTANCE_HELP] = "",
 ) -> str:
     """List all tables in the specified schema with their row counts."""
     sql = """
@@ -127,12 +448,22 @@ def list_tables(
           AND t.TABLE_TYPE = 'BASE TABLE'
         ORDER BY t.TABLE_NAME
     """
-    rows = execute_query(_cfg, sql, params=(schema,), database=_get_active_db())
-    return _format_results(rows)
+    inst = _get_instance(instance)
+    rows = inst.metadata_cache.get_or_load(
+        _metadata_key(inst, schema, None, "list_tables"),
+        lambda: execute_query(
+            inst.cfg, sql, params=(schema,), database=inst.database, use_cache=False
+        ),
+        version=_catalog_version(inst, _LIST_TABLES_VERSION_SQL, (schema,)),
+    )
+    return _format_results(rows, max_rows=inst.cfg.max_rows, cfg=inst.cfg)
 
 
 @mcp.tool()
-def list_schemas() -> str:
+@_offloaded()
+def list_schemas(
+    instance: Annotated[str, _INSTANCE_HELP] = "",
+) -> str:
     """List all schemas in the active database."""
     sql = """
         SELECT
@@ -144,14 +475,21 @@ def list_schemas() -> str:
         HAVING COUNT(t.name) > 0
         ORDER BY s.name
     """
-    rows = execute_query(_cfg, sql, database=_get_active_db())
-    return _format_results(rows)
+    inst = _get_instance(instance)
+    rows = inst.metadata_cache.get_or_load(
+        _metadata_key(inst, None, None, "list_schemas"),
+        lambda: execute_query(inst.cfg, sql, database=inst.database, use_cache=False),
+        version=_catalog_version(inst, _LIST_SCHEMAS_VERSION_SQL),
+    )
+    return _format_results(rows, max_rows=inst.cfg.max_rows, cfg=inst.cfg)
 
 
 @mcp.tool()
+@_offloaded()
 def describe_table(
     table: Annotated[str, "Table name to describe"],
     schema: Annotated[str, "Schema the table belongs to"] = "dbo",
+    instance: Annotated[str, _INSTANCE_HELP] = "",
 ) -> str:
     """Get column definitions for a table — names, types, nullability, and primary keys."""
     sql = """
@@ -177,14 +515,24 @@ def describe_table(
           AND c.TABLE_NAME   = ?
         ORDER BY c.ORDINAL_POSITION
     """
-    rows = execute_query(_cfg, sql, params=(schema, table), database=_get_active_db())
+    inst = _get_instance(instance)
+    rows = inst.metadata_cache.get_or_load(
+        _metadata_key(inst, schema, table, "describe_table"),
+        lambda: execute_query(
+            inst.cfg, sql, params=(schema, table), database=inst.database, use_cache=False
+        ),
+        version=_catalog_version(inst, _DESCRIBE_TABLE_VERSION_SQL, (schema, table)),
+    )
     if not rows:
         return f"Table [{schema}].[{table}] not found."
-    return _format_results(rows)
+    return _format_results(rows, max_rows=inst.cfg.max_rows, cfg=inst.cfg)
 
 
 @mcp.tool()
-def get_database_info() -> str:
+@_offloaded()
+def get_database_info(
+    instance: Annotated[str, _INSTANCE_HELP] = "",
+) -> str:
     """Get server and database metadata — version, name, collation, size.
 
     Shows info for the currently active database.
@@ -199,7 +547,8 @@ def get_database_info() -> str:
             (SELECT SUM(size) * 8 / 1024
              FROM sys.database_files)             AS [size_mb]
     """
-    rows = execute_query(_cfg, sql, database=_get_active_db())
+    inst = _get_instance(instance)
+    rows = execute_query(inst.cfg, sql, database=inst.database)
     if not rows:
         return "Could not retrieve database info."
 
@@ -209,21 +558,27 @@ def get_database_info() -> str:
 
 
 @mcp.tool()
-def check_connection() -> str:
+@_offloaded()
+def check_connection(
+    instance: Annotated[str, _INSTANCE_HELP] = "",
+) -> str:
     """Test database connectivity. Returns connection status, active database, and server version."""
+    inst = _get_instance(instance)
     try:
-        conn = get_connection(_cfg, database=_get_active_db())
-        cursor = conn.cursor()
-        cursor.execute("SELECT @@VERSION")
-        version = cursor.fetchone()[0]
-        conn.close()
-        return f"Connected successfully.\nActive database: {_get_active_db()}\n\n{version}"
+        with pooled_connection(inst.cfg, database=inst.database) as conn:
+            cursor = open_cursor(conn)
+            cursor.execute("SELECT @@VERSION")
+            version = cursor.fetchone()[0]
+        return f"Connected successfully.\nActive database: {inst.database}\n\n{version}"
     except Exception as e:
         return f"Connection failed: {e}"
 
 
 @mcp.tool()
-def list_databases() -> str:
+@_offloaded()
+def list_databases(
+    instance: Annotated[str, _INSTANCE_HELP] = "",
+) -> str:
     """List all databases on the server with their size and status.
 
     Useful for discovering available databases before switching with use_database().
@@ -239,46 +594,141 @@ def list_databases() -> str:
         GROUP BY d.name, d.state_desc, d.create_date
         ORDER BY d.name
     """
+    inst = _get_instance(instance)
     # Query sys.databases from master to see all databases on the server
-    rows = execute_query(_cfg, sql, database="master")
-    active = _get_active_db()
-    result = _format_results(rows)
-    return f"Active database: {active}\n\n{result}"
+    rows = execute_query(inst.cfg, sql, database="master")
+    result = _format_results(rows, max_rows=inst.cfg.max_rows, cfg=inst.cfg)
+    return f"Active database: {inst.database}\n\n{result}"
 
 
 @mcp.tool()
+@_offloaded()
 def use_database(
     database: Annotated[str, "Name of the database to switch to"],
+    instance: Annotated[str, _INSTANCE_HELP] = "",
 ) -> str:
-    """Switch the active database for all subsequent tool calls.
+    """Switch the active database for all subsequent tool calls on an instance.
 
     This changes which database is queried by query(), list_tables(),
     list_schemas(), describe_table(), and get_database_info().
     Use list_databases() first to see available databases.
     """
-    global _active_database
+    inst = _get_instance(instance)
 
     # Verify the database exists and is accessible
     try:
-        conn = get_connection(_cfg, database=database)
-        cursor = conn.cursor()
-        cursor.execute("SELECT DB_NAME()")
-        confirmed = cursor.fetchone()[0]
-        conn.close()
+        with pooled_connection(inst.cfg, database=database) as conn:
+            cursor = open_cursor(conn)
+            cursor.execute("SELECT DB_NAME()")
+            confirmed = cursor.fetchone()[0]
     except Exception as e:
         return f"Failed to switch to database [{database}]: {e}"
 
-    _active_database = database
+    inst.active_database = database
     return f"Switched to database [{confirmed}]. All tools will now query this database."
 
 
+@mcp.tool()
+def clear_metadata_cache(
+    schema: Annotated[str, "Only clear entries for this schema (blank for all)"] = "",
+    table: Annotated[str, "Only clear entries for this table (blank for all)"] = "",
+    instance: Annotated[str, _INSTANCE_HELP] = "",
+) -> str:
+    """Clear cached list_tables / list_schemas / describe_table results for the active database.
+
+    Cached metadata refreshes on its own when sys.objects.modify_date
+    changes, so this is only needed to force an immediate re-read.
+    """
+    inst = _get_instance(instance)
+    removed = inst.metadata_cache.invalidate(
+        inst.server, inst.database, schema or None, table or None
+    )
+    return f"Cleared {removed} cached metadata entries for [{inst.database}]."
+
+
+@mcp.tool()
+def cache_stats(
+    instance: Annotated[str, _INSTANCE_HELP] = "",
+) -> str:
+    """Report hit/miss statistics for the query result cache and the metadata cache.
+
+    The result cache is opt-in (<PREFIX>_RESULT_CACHE_TTL) and only used in read-only mode.
+    """
+    inst = _get_instance(instance)
+    metadata = inst.metadata_cache
+    lines = [
+        f"Metadata cache: {len(metadata)} entries, {metadata.hits} hits, "
+        f"{metadata.revalidations} revalidated, {metadata.misses} misses",
+    ]
+    cache = get_result_cache(inst.cfg)
+    if cache is None:
+        lines.append(
+            "Result cache: disabled (needs read-only mode and "
+            f"{inst.cfg.env_prefix}_RESULT_CACHE_TTL > 0)"
+        )
+    else:
+        stats = cache.stats()
+        lines.append(
+            f"Result cache: {stats['entries']} entries, "
+            f"{stats['bytes'] / 1024 / 1024:.1f} of {stats['max_bytes'] / 1024 / 1024:.0f} MB, "
+            f"TTL {stats['ttl_s']}s\n"
+            f"  {stats['hits']} hits, {stats['misses']} misses "
+            f"(hit rate {stats['hit_rate']:.0%}), {stats['evictions']} evictions"
+        )
+    return "\n".join(lines)
+
+
+@mcp.tool()
+@_offloaded()
+def snapshot_schema(
+    instance: Annotated[str, _INSTANCE_HELP] = "",
+) -> str:
+    """Index every column, type, primary key, foreign key and row count of the active database.
+
+    Runs a few set-based catalog queries and stores the result in a local
+    SQLite full-text index, replacing any earlier snapshot of this database.
+    Run it once per database (and again after schema changes) before using
+    search_columns().
+    """
+    inst = _get_instance(instance)
+    database = inst.database
+    counts = snapshot_database(inst.cfg, database, inst.cfg.schema_index_path)
+    return (
+        f"Indexed {counts['columns']} columns in {counts['tables']} tables "
+        f"({counts['foreign_keys']} foreign key columns) from [{database}] "
+        f"in {counts['elapsed_s']:.1f}s.\nIndex: {inst.cfg.schema_index_path}"
+    )
+
+
+@mcp.tool()
+@_offloaded()
+def search_columns(
+    text: Annotated[str, "What the column looks like, e.g. 'api number' or 'operator name'"],
+    limit: Annotated[int, "Maximum number of matches to return"] = 20,
+    instance: Annotated[str, _INSTANCE_HELP] = "",
+) -> str:
+    """Find columns in the active database whose names resemble the given text.
+
+    Answers from the local snapshot built by snapshot_schema() — no catalog
+    query runs on the server. Matching is fuzzy (trigram), so 'api number'
+    finds API_Number, ApiNum and api_no alike; best matches come first.
+    """
+    inst = _get_instance(instance)
+    database = inst.database
+    rows = search_index(inst.cfg.schema_index_path, inst.server, database, text, limit=limit)
+    if rows is None:
+        return f"No schema snapshot for [{database}]. Run snapshot_schema() first."
+    return _format_results(rows, cfg=inst.cfg)
+
+
 # ---------------------------------------------------------------------------
 # Entry point
 # ---------------------------------------------------------------------------
 
 def main() -> None:
     """Start the MCP server."""
-    _cfg.validate()
+    for inst in _instances.values():
+        inst.cfg.validate()
     mcp.run()
 
 
@@ -7,6 +7,15 @@ from unittest.mock import MagicMock, patch
 import pytest
 
 from mssql_mcp.config import Config
+from mssql_mcp.database import clear_result_caches, close_pools
+
+
+@pytest.fixture(autouse=True)
+def reset_pools():
+    """Drop pooled connections and cached results so mocks never leak between tests."""
+    yield
+    close_pools()
+    clear_result_caches()
 
 
 @pytest.fixture()
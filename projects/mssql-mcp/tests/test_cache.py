@@ -0,0 +1,131 @@
+"""Tests for the catalog metadata and query result caches."""
+
+from __future__ import annotations
+
+from unittest.mock import MagicMock, patch
+
+from mssql_mcp.cache import MetadataCache, ResultCache, estimate_size
+
+KEY = ("srv,1433", "db", "dbo", "orders", "describe_table")
+
+
+class TestMetadataCache:
+    def test_hit_within_ttl_skips_load(self) -> None:
+        """A second lookup within the TTL should not call load or version again."""
+        cache = MetadataCache(ttl=60, max_entries=10)
+        load = MagicMock(return_value=["rows"])
+        version = MagicMock(return_value=("v1",))
+
+        assert cache.get_or_load(KEY, load, version) == ["rows"]
+        assert cache.get_or_load(KEY, load, version) == ["rows"]
+        load.assert_called_once()
+        version.assert_called_once()
+
+    @patch("mssql_mcp.cache.time.monotonic")
+    def test_expired_entry_revalidated_by_version(self, mock_monotonic: MagicMock) -> None:
+        """After the TTL, an unchanged version should keep the cached rows."""
+        cache = MetadataCache(ttl=60, max_entries=10)
+        load = MagicMock(return_value=["rows"])
+        version = MagicMock(return_value=("v1",))
+
+        mock_monotonic.return_value = 0.0
+        cache.get_or_load(KEY, load, version)
+        mock_monotonic.return_value = 61.0
+        assert cache.get_or_load(KEY, load, version) == ["rows"]
+        mock_monotonic.return_value = 100.0  # re-armed, still fresh
+        cache.get_or_load(KEY, load, version)
+
+        load.assert_called_once()
+        assert version.call_count == 2
+
+    @patch("mssql_mcp.cache.time.monotonic")
+    def test_changed_version_reloads(self, mock_monotonic: MagicMock) -> None:
+        """After the TTL, a changed modify_date should re-run the full lookup."""
+        cache = MetadataCache(ttl=60, max_entries=10)
+        load = MagicMock(side_effect=[["old"], ["new"]])
+        version = MagicMock(side_effect=[("v1",), ("v2",)])
+
+        mock_monotonic.return_value = 0.0
+        cache.get_or_load(KEY, load, version)
+        mock_monotonic.return_value = 61.0
+        assert cache.get_or_load(KEY, load, version) == ["new"]
+
+    def test_evicts_least_recently_used(self) -> None:
+        """Exceeding max_entries should evict the least recently used key."""
+        cache = MetadataCache(ttl=60, max_entries=2)
+        a, b, c = (("s", "db", "dbo", name, "describe_table") for name in "abc")
+
+        cache.get_or_load(a, lambda: "a")
+        cache.get_or_load(b, lambda: "b")
+        cache.get_or_load(a, lambda: "unused")  # touch a
+        cache.get_or_load(c, lambda: "c")
+
+        assert len(cache) == 2
+        assert cache.get_or_load(a, lambda: "reloaded") == "a"
+        assert cache.get_or_load(b, lambda: "reloaded") == "reloaded"
+
+    def test_zero_ttl_disables_cache(self) -> None:
+        """A TTL of 0 should always call load."""
+        cache = MetadataCache(ttl=0, max_entries=10)
+        load = MagicMock(return_value="rows")
+        cache.get_or_load(KEY, load)
+        cache.get_or_load(KEY, load)
+        assert load.call_count == 2
+        assert len(cache) == 0
+
+    def test_invalidate_table_drops_wider_listings(self) -> None:
+        """Invalidating a table should drop its entries and the listings containing it."""
+        cache = MetadataCache(ttl=60, max_entries=10)
+        cache.get_or_load(("s", "db", "dbo", "orders", "describe_table"), lambda: 1)
+        cache.get_or_load(("s", "db", "dbo", "users", "describe_table"), lambda: 2)
+        cache.get_or_load(("s", "db", "dbo", None, "list_tables"), lambda: 3)
+        cache.get_or_load(("s", "db", None, None, "list_schemas"), lambda: 4)
+        cache.get_or_load(("s", "other", "dbo", "orders", "describe_table"), lambda: 5)
+
+        removed = cache.invalidate("s", "db", "dbo", "orders")
+
+        assert removed == 3
+        assert len(cache) == 2
+
+
+class TestResultCache:
+    def test_hit_and_miss_counted(self) -> None:
+        """get should count misses until a value is put, then hits."""
+        cache = ResultCache(ttl=60, max_bytes=1_000_000)
+        assert cache.get(("k",)) is None
+        cache.put(("k",), [{"id": 1}])
+
+        assert cache.get(("k",)) == [{"id": 1}]
+        stats = cache.stats()
+        assert (stats["hits"], stats["misses"], stats["entries"]) == (1, 1, 1)
+        assert stats["bytes"] == estimate_size([{"id": 1}])
+
+    @patch("mssql_mcp.cache.time.monotonic")
+    def test_expired_entry_dropped(self, mock_monotonic: MagicMock) -> None:
+        """An entry past its TTL should miss and free its bytes."""
+        cache = ResultCache(ttl=10, max_bytes=1_000_000)
+        mock_monotonic.return_value = 0.0
+        cache.put(("k",), [{"id": 1}])
+
+        mock_monotonic.return_value = 11.0
+        assert cache.get(("k",)) is None
+        assert cache.stats()["bytes"] == 0
+
+    def test_evicts_least_recently_used_to_fit_bytes(self) -> None:
+        """Putting past max_bytes should evict the least recently used results."""
+        rows = [{"name": "x" * 100}]
+        cache = ResultCache(ttl=60, max_bytes=estimate_size(rows) * 2)
+        cache.put(("a",), rows)
+        cache.put(("b",), rows)
+        cache.get(("a",))  # touch a
+        cache.put(("c",), rows)
+
+        assert cache.get(("b",)) is None
+        assert cache.get(("a",)) == rows
+        assert cache.stats()["evictions"] == 1
+
+    def test_oversized_result_not_cached(self) -> None:
+        """A result bigger than the whole budget should not be cached."""
+        cache = ResultCache(ttl=60, max_bytes=10)
+        cache.put(("k",), [{"name": "x" * 100}])
+        assert cache.stats()["entries"] == 0
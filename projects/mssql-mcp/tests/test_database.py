@@ -7,7 +7,15 @@ from unittest.mock import MagicMock, patch
 import pytest
 
 from mssql_mcp.config import Config
-from mssql_mcp.database import build_connection_string, check_write_safety, execute_query
+from mssql_mcp.database import (
+    ConnectionPool,
+    build_connection_string,
+    check_write_safety,
+    execute_query,
+    get_pool,
+    get_result_cache,
+    normalize_sql,
+)
 
 
 class TestBuildConnectionString:
@@ -107,7 +115,7 @@ class TestExecuteQuery:
         """execute_query should pass params to cursor.execute."""
         mock_get_conn.return_value = mock_connection
         execute_query(config, "SELECT * FROM t WHERE id = ?", params=(42,))
-        mock_connection.cursor().execute.assert_called_once_with(
+        mock_connection.cursor().execute.assert_called_with(
             "SELECT * FROM t WHERE id = ?", (42,)
         )
 
@@ -117,13 +125,16 @@ class TestExecuteQuery:
             execute_query(config, "DROP TABLE users")
 
     @patch("mssql_mcp.database.get_connection")
-    def test_closes_connection(
+    def test_reuses_pooled_connection(
         self, mock_get_conn: MagicMock, config: Config, mock_connection: MagicMock
     ) -> None:
-        """Connection should always be closed after query."""
+        """Connection should be returned to the pool and reused, not closed."""
         mock_get_conn.return_value = mock_connection
         execute_query(config, "SELECT 1")
-        mock_connection.close.assert_called_once()
+        execute_query(config, "SELECT 2")
+        mock_get_conn.assert_called_once()
+        mock_connection.close.assert_not_called()
+        assert mock_connection.rollback.call_count == 2
 
     @patch("mssql_mcp.database.get_connection")
     def test_handles_no_result_set(
@@ -140,3 +151,167 @@ class TestExecuteQuery:
 
         results = execute_query(cfg, "INSERT INTO t VALUES (1)")
         assert results == [{"affected_rows": 5}]
+
+
+class TestResultCaching:
+    @pytest.fixture()
+    def cached_config(self) -> Config:
+        return Config(database="db", user="u", password="p", read_only=True, result_cache_ttl=60)
+
+    def test_normalize_sql_keeps_literals(self) -> None:
+        """Whitespace outside quotes collapses; inside literals and brackets it is kept."""
+        sql = "SELECT  a,\n   b FROM [my  table] WHERE x = 'a  b' ;"
+        assert normalize_sql(sql) == "SELECT a, b FROM [my  table] WHERE x = 'a  b'"
+
+    @patch("mssql_mcp.database.get_connection")
+    def test_repeated_query_served_from_cache(
+        self, mock_get_conn: MagicMock, cached_config: Config, mock_connection: MagicMock
+    ) -> None:
+        """A reformatted repeat of a read-only query should not hit the server."""
+        mock_get_conn.return_value = mock_connection
+        first = execute_query(cached_config, "SELECT * FROM t")
+        second = execute_query(cached_config, "SELECT *\n  FROM t;")
+
+        assert first == second
+        executed = [
+            c for c in mock_connection.cursor().execute.call_args_list if "FROM t" in c.args[0]
+        ]
+        assert len(executed) == 1
+        assert get_result_cache(cached_config).stats()["hits"] == 1
+
+    @patch("mssql_mcp.database.get_connection")
+    def test_params_and_database_in_key(
+        self, mock_get_conn: MagicMock, cached_config: Config, mock_connection: MagicMock
+    ) -> None:
+        """Different params or databases should miss the cache."""
+        mock_get_conn.return_value = mock_connection
+        sql = "SELECT * FROM t WHERE id = ?"
+        execute_query(cached_config, sql, params=(1,))
+        execute_query(cached_config, sql, params=(2,))
+        execute_query(cached_config, sql, params=(1,), database="other")
+        execute_query(cached_config, sql, params=(1,), use_cache=False)
+
+        executed = [c for c in mock_connection.cursor().execute.call_args_list if c.args[0] == sql]
+        assert len(executed) == 4
+
+    def test_disabled_unless_read_only(self) -> None:
+        """Writable configs and a zero TTL should never get a result cache."""
+        writable = Config(database="db", read_only=False, result_cache_ttl=60)
+        assert get_result_cache(writable) is None
+        assert get_result_cache(Config(database="db", read_only=True)) is None
+
+
+class TestConnectionPool:
+    @patch("mssql_mcp.database.get_connection")
+    def test_get_pool_keyed_by_database(self, mock_get_conn: MagicMock, config: Config) -> None:
+        """Each (server, database) pair should get its own shared pool."""
+        assert get_pool(config) is get_pool(config, database="test_db")
+        assert get_pool(config) is not get_pool(config, database="other_db")
+
+    @patch("mssql_mcp.database.get_connection")
+    def test_replaces_connection_failing_health_check(
+        self, mock_get_conn: MagicMock, config: Config
+    ) -> None:
+        """A pooled connection that fails SELECT 1 should be closed and replaced."""
+        import pyodbc
+
+        dead, fresh = MagicMock(), MagicMock()
+        mock_get_conn.side_effect = [dead, fresh]
+        pool = ConnectionPool(config)
+
+        with pool.connection() as conn:
+            assert conn is dead
+        dead.cursor.return_value.execute.side_effect = pyodbc.Error("link failure")
+        with pool.connection() as conn:
+            assert conn is fresh
+        dead.close.assert_called_once()
+
+    @patch("mssql_mcp.database.time.monotonic")
+    @patch("mssql_mcp.database.get_connection")
+    def test_recycles_idle_and_old_connections(
+        self, mock_get_conn: MagicMock, mock_monotonic: MagicMock, config: Config
+    ) -> None:
+        """Connections past the idle timeout or max lifetime should not be reused."""
+        cfg = Config(
+            database="db", user="u", password="p", pool_idle_timeout=10, pool_max_lifetime=100
+        )
+        first, second, third = MagicMock(), MagicMock(), MagicMock()
+        mock_get_conn.side_effect = [first, second, third]
+        pool = ConnectionPool(cfg)
+
+        mock_monotonic.return_value = 0.0
+        with pool.connection():
+            pass
+        mock_monotonic.return_value = 5.0  # within idle timeout -> reused
+        with pool.connection() as conn:
+            assert conn is first
+        mock_monotonic.return_value = 20.0  # idle for 15s -> replaced
+        with pool.connection() as conn:
+            assert conn is second
+        mock_monotonic.return_value = 125.0  # past max lifetime -> replaced
+        with pool.connection() as conn:
+            assert conn is third
+        first.close.assert_called_once()
+        second.close.assert_called_once()
+
+    @patch("mssql_mcp.database.get_connection")
+    def test_bounded_checkout_times_out(self, mock_get_conn: MagicMock) -> None:
+        """Checking out more than pool_size connections should wait, then fail."""
+        cfg = Config(database="db", user="u", password="p", pool_size=1, query_timeout=0)
+        mock_get_conn.side_effect = lambda *a, **kw: MagicMock()
+        pool = ConnectionPool(cfg)
+
+        with pool.connection():
+            with pytest.raises(TimeoutError, match="pool_size=1"):
+                with pool.connection():
+                    pass
+
+    @patch("mssql_mcp.database.get_connection")
+    def test_discards_connection_that_cannot_roll_back(
+        self, mock_get_conn: MagicMock, config: Config
+    ) -> None:
+        """A connection broken during use should be closed instead of pooled."""
+        import pyodbc
+
+        broken, fresh = MagicMock(), MagicMock()
+        broken.rollback.side_effect = pyodbc.Error("connection reset")
+        mock_get_conn.side_effect = [broken, fresh]
+        pool = ConnectionPool(config)
+
+        with pool.connection():
+            pass
+        with pool.connection() as conn:
+            assert conn is fresh
+        broken.close.assert_called_once()
+
+    @patch("mssql_mcp.database.get_connection")
+    def test_discards_connection_left_in_another_database(
+        self, mock_get_conn: MagicMock, config: Config
+    ) -> None:
+        """A connection whose session moved with USE should not serve its pool again."""
+        moved, fresh = MagicMock(), MagicMock()
+        # Session state when opened, then after the caller's USE master
+        moved.cursor.return_value.execute.return_value.fetchone.side_effect = [
+            ("test_db", 5496), ("master", 5496),
+        ]
+        mock_get_conn.side_effect = [moved, fresh]
+        pool = ConnectionPool(config)
+
+        with pool.connection() as conn:
+            conn.cursor().execute("USE master")
+        with pool.connection() as conn:
+            assert conn is fresh
+        moved.close.assert_called_once()
+
+    @patch("mssql_mcp.database.get_connection")
+    def test_ad_hoc_batch_is_not_pooled(
+        self, mock_get_conn: MagicMock, config: Config, mock_connection: MagicMock
+    ) -> None:
+        """Connections that ran anything but a plain SELECT should be closed, not reused."""
+        mock_get_conn.return_value = mock_connection
+        execute_query(config, "USE master; SELECT name FROM sys.databases")
+        mock_connection.close.assert_called_once()
+
+        execute_query(config, "SELECT 1")
+        execute_query(config, "SELECT 2")
+        assert mock_get_conn.call_count == 2
@@ -0,0 +1,55 @@
+"""Tests for running blocking database work on the worker pool."""
+
+from __future__ import annotations
+
+import asyncio
+import threading
+import time
+from unittest.mock import MagicMock
+
+import pytest
+
+from mssql_mcp.config import Config
+from mssql_mcp.database import open_cursor
+from mssql_mcp.executor import run_blocking
+
+
+class TestRunBlocking:
+    def test_calls_run_in_parallel(self, config: Config) -> None:
+        """Two slow calls should overlap instead of queueing."""
+
+        async def both() -> list[str]:
+            return await asyncio.gather(
+                run_blocking(config, lambda: time.sleep(0.2) or "a"),
+                run_blocking(config, lambda: time.sleep(0.2) or "b"),
+            )
+
+        started = time.perf_counter()
+        assert asyncio.run(both()) == ["a", "b"]
+        assert time.perf_counter() - started < 0.35
+
+    def test_timeout_cancels_running_cursor(self, config: Config) -> None:
+        """A call past its timeout should have its cursor cancelled."""
+        cancelled = threading.Event()
+        cursor = MagicMock()
+        cursor.cancel.side_effect = cancelled.set
+        conn = MagicMock()
+        conn.cursor.return_value = cursor
+
+        def slow_query() -> None:
+            open_cursor(conn)
+            # Stands in for cursor.execute() blocking until the statement is cancelled
+            cancelled.wait(timeout=5)
+
+        with pytest.raises(TimeoutError, match="cancelled"):
+            asyncio.run(run_blocking(config, slow_query, timeout=0.1))
+        assert cancelled.wait(timeout=1)
+
+    def test_call_timeout_error_propagates(self, config: Config) -> None:
+        """A TimeoutError raised by the call itself should pass through unchanged."""
+
+        def pool_exhausted() -> None:
+            raise TimeoutError("No pooled connection became available")
+
+        with pytest.raises(TimeoutError, match="pooled connection"):
+            asyncio.run(run_blocking(config, pool_exhausted, timeout=5))
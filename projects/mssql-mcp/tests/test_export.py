@@ -0,0 +1,101 @@
+"""Tests for exporting query results to local files."""
+
+from __future__ import annotations
+
+import csv
+import datetime
+import decimal
+import gzip
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from mssql_mcp.config import Config
+from mssql_mcp.export import export_to_file
+
+DESCRIPTION = [
+    ("id", int, None, 10, 10, 0, False),
+    ("name", str, None, 50, 50, 0, True),
+    ("amount", decimal.Decimal, None, 12, 10, 2, True),
+    ("created", datetime.datetime, None, 23, 23, 3, True),
+]
+
+ROWS = [
+    (i, f"row{i}", decimal.Decimal(f"{i}.50"), datetime.datetime(2024, 1, 1, 0, i))
+    for i in range(5)
+]
+
+
+@pytest.fixture()
+def exporting_connection() -> MagicMock:
+    """A mock pooled connection whose cursor serves ROWS in fetchmany batches."""
+    cursor = MagicMock()
+    cursor.description = DESCRIPTION
+    remaining = list(ROWS)
+
+    def fetchmany(size: int) -> list[tuple]:
+        batch = remaining[:size]
+        del remaining[:size]
+        return batch
+
+    cursor.fetchmany.side_effect = fetchmany
+    conn = MagicMock()
+    conn.cursor.return_value = cursor
+    pooled = MagicMock()
+    pooled.return_value.__enter__.return_value = conn
+    return pooled
+
+
+class TestExportToFile:
+    def test_csv_export_streams_batches(
+        self, tmp_path, config: Config, exporting_connection: MagicMock
+    ) -> None:
+        """CSV export should write a header plus every row, batch by batch."""
+        with patch("mssql_mcp.export.pooled_connection", exporting_connection):
+            result = export_to_file(
+                config, "SELECT * FROM t", str(tmp_path), fmt="csv", filename="out",
+                batch_size=2,
+            )
+
+        assert result["rows"] == 5
+        assert result["path"].endswith("out.csv.gz")
+        assert result["bytes"] > 0
+        with gzip.open(result["path"], "rt", newline="") as f:
+            lines = list(csv.reader(f))
+        assert lines[0] == ["id", "name", "amount", "created"]
+        assert lines[1] == ["0", "row0", "0.50", "2024-01-01 00:00:00"]
+        assert len(lines) == 6
+        cursor = exporting_connection.return_value.__enter__.return_value.cursor()
+        assert cursor.fetchmany.call_count == 4  # 2 + 2 + 1 + empty
+
+    def test_parquet_export_keeps_types(
+        self, tmp_path, config: Config, exporting_connection: MagicMock
+    ) -> None:
+        """Parquet export should map cursor types to Arrow types."""
+        pq = pytest.importorskip("pyarrow.parquet")
+
+        with patch("mssql_mcp.export.pooled_connection", exporting_connection):
+            result = export_to_file(
+                config, "SELECT * FROM t", str(tmp_path), filename="out", batch_size=2
+            )
+
+        table = pq.read_table(result["path"])
+        assert result["rows"] == table.num_rows == 5
+        assert str(table.schema.field("amount").type) == "decimal128(10, 2)"
+        assert str(table.schema.field("created").type) == "timestamp[us]"
+        assert table.column("name").to_pylist()[4] == "row4"
+
+    def test_rejects_path_outside_export_dir(self, tmp_path, config: Config) -> None:
+        """Filenames must not escape the export directory."""
+        with pytest.raises(ValueError, match="inside"):
+            export_to_file(config, "SELECT 1", str(tmp_path), filename="../escape")
+
+    def test_blocks_write_in_read_only(self, tmp_path, config: Config) -> None:
+        """Exports should respect read-only mode."""
+        with pytest.raises(ValueError, match="read-only"):
+            export_to_file(config, "DELETE FROM t", str(tmp_path))
+
+    def test_rejects_unknown_format(self, tmp_path, config: Config) -> None:
+        """Only parquet and csv are supported."""
+        with pytest.raises(ValueError, match="Unknown export format"):
+            export_to_file(config, "SELECT 1", str(tmp_path), fmt="xlsx")
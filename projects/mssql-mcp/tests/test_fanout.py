@@ -0,0 +1,76 @@
+"""Tests for running one query across many databases."""
+
+from __future__ import annotations
+
+import time
+from unittest.mock import MagicMock, patch
+
+import pyodbc
+import pytest
+
+from mssql_mcp.config import Config
+from mssql_mcp.fanout import DatabaseResult, merge_rows, query_databases, render_template
+
+
+class TestQueryDatabases:
+    def test_render_template_escapes_brackets(self) -> None:
+        """{database} should be replaced with the name escaped for [brackets]."""
+        sql = "SELECT * FROM [{database}].sys.tables"
+        assert render_template(sql, "odd]name") == "SELECT * FROM [odd]]name].sys.tables"
+
+    @patch("mssql_mcp.fanout.execute_query")
+    def test_runs_concurrently_and_records_errors(
+        self, mock_execute: MagicMock, config: Config
+    ) -> None:
+        """Databases should be queried in parallel, with failures kept per database."""
+
+        def slow(cfg: Config, sql: str, database: str) -> list[dict]:
+            time.sleep(0.2)
+            if database == "broken":
+                raise pyodbc.Error("login failed")
+            return [{"db_name": database}]
+
+        mock_execute.side_effect = slow
+        started = time.perf_counter()
+        results = query_databases(config, "SELECT 1", ["a", "broken", "c"], max_workers=3)
+
+        assert time.perf_counter() - started < 0.5
+        assert [r.database for r in results] == ["a", "broken", "c"]
+        assert results[1].error == "login failed"
+        assert results[2].rows == [{"db_name": "c"}]
+        assert all(r.elapsed_s >= 0.2 for r in results)
+
+    def test_blocks_writes_even_when_writable(self) -> None:
+        """The fan-out is read-only regardless of the server's read_only setting."""
+        cfg = Config(database="db", user="u", password="p", read_only=False)
+        with pytest.raises(ValueError, match="read-only"):
+            query_databases(cfg, "DELETE FROM t", ["a"], max_workers=1)
+
+    @pytest.mark.parametrize(
+        "sql",
+        [
+            "SELECT * INTO dbo.copy FROM dbo.t",
+            "WITH x AS (SELECT 1 AS n) SELECT n INTO #x FROM x",
+            "USE master; SELECT 1",
+        ],
+    )
+    @patch("mssql_mcp.fanout.execute_query")
+    def test_blocks_select_into_even_when_writable(
+        self, mock_execute: MagicMock, sql: str
+    ) -> None:
+        """SELECT ... INTO passes the keyword check but must not reach any database."""
+        cfg = Config(database="db", user="u", password="p", read_only=False)
+        with pytest.raises(ValueError, match="read-only"):
+            query_databases(cfg, sql, ["a", "b"], max_workers=2)
+        mock_execute.assert_not_called()
+
+    def test_merge_rows_prefixes_database(self) -> None:
+        """Merged rows should start with the database they came from."""
+        results = [
+            DatabaseResult("a", rows=[{"id": 1}]),
+            DatabaseResult("b", error="timeout"),
+            DatabaseResult("c", rows=[{"id": 2}]),
+        ]
+        merged = merge_rows(results)
+        assert merged == [{"database": "a", "id": 1}, {"database": "c", "id": 2}]
+        assert list(merged[0]) == ["database", "id"]
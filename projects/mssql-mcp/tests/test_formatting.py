@@ -0,0 +1,66 @@
+"""Tests for result formatting."""
+
+from __future__ import annotations
+
+import json
+
+import pytest
+
+from mssql_mcp.formatting import format_rows
+
+
+class TestFormatRows:
+    def test_truncates_wide_cells(self) -> None:
+        """Cells longer than max_width should be clipped with an ellipsis."""
+        result, _ = format_rows([{"notes": "x" * 500}], max_width=20)
+        assert "x" * 19 + "…" in result
+        assert "x" * 20 not in result
+
+    def test_collapses_multiline_cells(self) -> None:
+        """Embedded newlines should not break the one-row-per-line layout."""
+        result, _ = format_rows([{"notes": "line one\r\nline two"}])
+        assert "line one line two" in result
+        assert len(result.split("\n")) == 3
+
+    def test_character_budget_drops_rows(self) -> None:
+        """Rows past max_chars should be dropped with a note saying how many are shown."""
+        rows = [{"id": i, "payload": "y" * 80} for i in range(100)]
+        result, shown = format_rows(rows, max_display=100, max_chars=1000)
+
+        assert len(result) < 1300
+        assert 0 < shown < 100
+        assert f"showing {shown} of 100 rows" in result
+        assert "output limited to ~1,000 characters" in result
+        assert "of 100 rows" in result
+
+    def test_budget_keeps_at_least_one_row(self) -> None:
+        """A single row over budget should still be shown."""
+        result, shown = format_rows([{"payload": "z" * 300}], max_chars=50)
+        assert "z" * 100 in result
+        assert shown == 1
+
+    def test_compact_format(self) -> None:
+        """Compact output should be pipe-separated without padding."""
+        rows = [{"name": "alpha", "value": 100}, {"name": "b", "value": 2}]
+        assert format_rows(rows, output_format="compact") == ("name|value\nalpha|100\nb|2", 2)
+
+    def test_csv_format_quotes_values(self) -> None:
+        """CSV output should quote values that contain commas."""
+        result, _ = format_rows([{"name": "Smith, J", "n": 1}], output_format="csv")
+        assert result == 'name,n\n"Smith, J",1'
+
+    def test_json_format_keeps_scalar_types(self) -> None:
+        """JSON lines should keep numbers and nulls and stringify everything else."""
+        result, _ = format_rows(
+            [{"id": 7, "ratio": 0.5, "missing": None, "name": "a" * 50}],
+            output_format="json",
+            max_width=10,
+        )
+        assert json.loads(result) == {
+            "id": 7, "ratio": 0.5, "missing": None, "name": "a" * 9 + "…",
+        }
+
+    def test_unknown_format(self) -> None:
+        """An unknown output format should be rejected."""
+        with pytest.raises(ValueError, match="Unknown output format"):
+            format_rows([{"id": 1}], output_format="xml")
@@ -0,0 +1,166 @@
+"""Tests for paginated query execution."""
+
+from __future__ import annotations
+
+from dataclasses import replace
+from unittest.mock import MagicMock, patch
+
+import pyodbc
+import pytest
+
+from mssql_mcp.config import Config
+from mssql_mcp.pagination import (
+    PageToken,
+    decode_page_token,
+    encode_page_token,
+    estimate_row_count,
+    execute_page,
+    is_pageable,
+    is_resumable,
+    offset_fetch_sql,
+)
+
+
+class TestOffsetFetchSql:
+    def test_rewrites_trailing_order_by(self) -> None:
+        """A top-level ORDER BY should get OFFSET / FETCH appended."""
+        sql = offset_fetch_sql("SELECT id FROM t ORDER BY id;", 100, 51)
+        assert sql == "SELECT id FROM t ORDER BY id\nOFFSET 100 ROWS FETCH NEXT 51 ROWS ONLY"
+
+    @pytest.mark.parametrize(
+        "sql",
+        [
+            "SELECT id FROM t",
+            "SELECT TOP 10 id FROM t ORDER BY id",
+            "SELECT id FROM t ORDER BY id OFFSET 5 ROWS",
+            "SELECT * FROM (SELECT TOP 5 id FROM t ORDER BY id) x",
+            "SELECT ROW_NUMBER() OVER (ORDER BY id) AS rn FROM t",
+            "SELECT id FROM t ORDER BY LEN(name)",
+            "INSERT INTO archive SELECT * FROM orders ORDER BY id",
+            "SELECT id INTO #t FROM orders ORDER BY id",
+            "WITH x AS (SELECT id FROM t) UPDATE t SET flag = 1 ORDER BY id",
+        ],
+    )
+    def test_leaves_other_queries_alone(self, sql: str) -> None:
+        """Queries without a simple top-level ORDER BY should not be rewritten."""
+        assert offset_fetch_sql(sql, 0, 51) is None
+
+
+class TestPageToken:
+    def test_round_trip(self) -> None:
+        """Encoding then decoding should return the same token."""
+        token = PageToken("SELECT 1", "db", 50, 50, 1234)
+        assert decode_page_token(encode_page_token(token)) == token
+
+    def test_rejects_garbage(self) -> None:
+        """Malformed tokens should raise ValueError."""
+        with pytest.raises(ValueError, match="malformed"):
+            decode_page_token("not-a-token")
+
+
+class TestExecutePage:
+    @patch("mssql_mcp.pagination.pooled_connection")
+    def test_uses_offset_fetch_when_ordered(
+        self, mock_pooled: MagicMock, config: Config, mock_connection: MagicMock
+    ) -> None:
+        """Ordered queries should let the server skip rows and fetch page_size + 1."""
+        mock_pooled.return_value.__enter__.return_value = mock_connection
+        cursor = mock_connection.cursor()
+
+        rows, has_more = execute_page(config, "SELECT * FROM t ORDER BY id", 10, 1)
+
+        assert rows == [{"id": 1, "name": "alpha", "value": 100}]
+        assert has_more is True
+        assert "OFFSET 10 ROWS FETCH NEXT 2 ROWS ONLY" in cursor.execute.call_args.args[0]
+        cursor.skip.assert_not_called()
+        cursor.fetchmany.assert_called_once_with(2)
+
+    @patch("mssql_mcp.pagination.pooled_connection")
+    def test_unordered_query_returns_first_page(
+        self, mock_pooled: MagicMock, config: Config, mock_connection: MagicMock
+    ) -> None:
+        """Unordered queries should run unchanged and fetch page_size + 1 from the start."""
+        mock_pooled.return_value.__enter__.return_value = mock_connection
+        cursor = mock_connection.cursor()
+
+        rows, has_more = execute_page(config, "SELECT * FROM t", 0, 1)
+
+        assert not is_resumable("SELECT * FROM t")
+        cursor.execute.assert_called_once_with("SELECT * FROM t")
+        cursor.skip.assert_not_called()
+        assert len(rows) == 1
+        assert has_more is True
+
+    @patch("mssql_mcp.pagination.pooled_connection")
+    def test_unordered_query_cannot_continue(
+        self, mock_pooled: MagicMock, config: Config
+    ) -> None:
+        """A later page of an unordered query should be refused, not skipped to on the client."""
+        with pytest.raises(ValueError, match="ORDER BY"):
+            execute_page(config, "SELECT * FROM t", 50, 5)
+        mock_pooled.assert_not_called()
+
+    @patch("mssql_mcp.database.pooled_connection")
+    def test_runs_writes_unpaged(
+        self, mock_pooled: MagicMock, config: Config, mock_connection: MagicMock
+    ) -> None:
+        """With writes allowed, INSERT ... SELECT ... ORDER BY should run once, unchanged."""
+        mock_pooled.return_value.__enter__.return_value = mock_connection
+        cursor = mock_connection.cursor()
+        cursor.description = None
+        cursor.rowcount = 500
+        sql = "INSERT INTO archive SELECT * FROM orders ORDER BY id"
+
+        rows, has_more = execute_page(replace(config, read_only=False), sql, 0, 50)
+
+        assert not is_pageable(sql)
+        cursor.execute.assert_called_once_with(sql)
+        mock_connection.commit.assert_called_once()
+        assert rows == [{"affected_rows": 500}]
+        assert has_more is False
+
+    def test_blocks_write_in_read_only(self, config: Config) -> None:
+        """Paged queries should respect read-only mode."""
+        with pytest.raises(ValueError, match="read-only"):
+            execute_page(config, "DELETE FROM t", 0, 50)
+
+
+class TestEstimateRowCount:
+    @patch("mssql_mcp.pagination.pooled_connection")
+    def test_reads_plan_estimate(self, mock_pooled: MagicMock, config: Config) -> None:
+        """The estimate should come from StatementEstRows in the showplan XML."""
+        conn = MagicMock()
+        conn.cursor.return_value.fetchone.return_value = (
+            '<ShowPlanXML><StmtSimple StatementEstRows="2048.5" /></ShowPlanXML>',
+        )
+        mock_pooled.return_value.__enter__.return_value = conn
+
+        assert estimate_row_count(config, "SELECT * FROM t") == 2048
+        executed = [c.args[0] for c in conn.cursor.return_value.execute.call_args_list]
+        assert executed == ["SET SHOWPLAN_XML ON", "SELECT * FROM t", "SET SHOWPLAN_XML OFF"]
+
+    @patch("mssql_mcp.pagination.pooled_connection")
+    def test_returns_none_without_permission(self, mock_pooled: MagicMock, config: Config) -> None:
+        """A showplan failure should yield no estimate rather than an error."""
+        conn = MagicMock()
+        conn.cursor.return_value.execute.side_effect = pyodbc.Error("SHOWPLAN permission denied")
+        mock_pooled.return_value.__enter__.return_value = conn
+
+        assert estimate_row_count(config, "SELECT * FROM t") is None
+        conn.close.assert_not_called()
+
+    @patch("mssql_mcp.pagination.pooled_connection")
+    def test_drops_connection_stuck_in_showplan(
+        self, mock_pooled: MagicMock, config: Config
+    ) -> None:
+        """If SHOWPLAN can't be switched off, the connection must not be reused."""
+        conn = MagicMock()
+        conn.cursor.return_value.execute.side_effect = [
+            None,
+            pyodbc.Error("query failed"),
+            pyodbc.Error("link failure"),
+        ]
+        mock_pooled.return_value.__enter__.return_value = conn
+
+        assert estimate_row_count(config, "SELECT * FROM t") is None
+        conn.close.assert_called_once()
@@ -0,0 +1,127 @@
+"""Tests for the local schema snapshot index."""
+
+from __future__ import annotations
+
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from mssql_mcp.config import Config
+from mssql_mcp.schema_index import (
+    _COLUMNS_SQL,
+    _FOREIGN_KEYS_SQL,
+    _TABLES_SQL,
+    normalize_identifier,
+    search_index,
+    snapshot_database,
+)
+
+CATALOG = {
+    _TABLES_SQL: [("dbo", "Wells", 455000), ("dbo", "WellTransfers", 900)],
+    _COLUMNS_SQL: [
+        ("dbo", "Wells", "API_Number", "varchar", 10, 0, 1),
+        ("dbo", "Wells", "OperatorName", "nvarchar", 200, 1, 0),
+        ("dbo", "Wells", "SpudDate", "date", 3, 1, 0),
+        ("dbo", "WellTransfers", "ApiNum", "varchar", 14, 0, 1),
+        ("dbo", "WellTransfers", "ToOperator", "nvarchar", -1, 1, 0),
+        ("dbo", "WellTransfers", "id", "int", 4, 0, 0),
+    ],
+    _FOREIGN_KEYS_SQL: [("dbo", "WellTransfers", "ApiNum", "dbo", "Wells", "API_Number")],
+}
+
+
+@pytest.fixture()
+def catalog_connection() -> MagicMock:
+    """A mock pooled connection answering the three catalog queries."""
+    conn = MagicMock()
+
+    def cursor() -> MagicMock:
+        cur = MagicMock()
+        cur.execute.side_effect = lambda sql: cur.fetchall.configure_mock(
+            return_value=CATALOG[sql]
+        )
+        return cur
+
+    conn.cursor.side_effect = cursor
+    pooled = MagicMock()
+    pooled.return_value.__enter__.return_value = conn
+    return pooled
+
+
+@pytest.fixture()
+def index_path(tmp_path, config: Config, catalog_connection: MagicMock) -> str:
+    """An index file holding a snapshot of the mock catalog."""
+    path = str(tmp_path / "index.db")
+    with patch("mssql_mcp.schema_index.pooled_connection", catalog_connection):
+        snapshot_database(config, "test_db", path)
+    return path
+
+
+class TestNormalizeIdentifier:
+    @pytest.mark.parametrize(
+        ("name", "expected"),
+        [
+            ("API_Number", "api number"),
+            ("ApiNum", "api num"),
+            ("WellAPI10", "well api 10"),
+            ("to_operator__name", "to operator name"),
+        ],
+    )
+    def test_splits_words(self, name: str, expected: str) -> None:
+        """camelCase, snake_case and digit boundaries should become spaces."""
+        assert normalize_identifier(name) == expected
+
+
+class TestSnapshot:
+    def test_counts(self, tmp_path, config: Config, catalog_connection: MagicMock) -> None:
+        """snapshot_database should report what it indexed using three queries."""
+        with patch("mssql_mcp.schema_index.pooled_connection", catalog_connection):
+            counts = snapshot_database(config, "test_db", str(tmp_path / "index.db"))
+
+        assert counts["tables"] == 2
+        assert counts["columns"] == 6
+        assert counts["foreign_keys"] == 1
+        assert catalog_connection.call_count == 3
+
+    def test_resnapshot_replaces_rows(
+        self, index_path: str, config: Config, catalog_connection: MagicMock
+    ) -> None:
+        """Snapshotting the same database twice should not duplicate columns."""
+        with patch("mssql_mcp.schema_index.pooled_connection", catalog_connection):
+            snapshot_database(config, "test_db", index_path)
+
+        rows = search_index(index_path, "test-server,1433", "test_db", "api", limit=50)
+        assert len(rows) == 2
+
+
+class TestSearchIndex:
+    def test_finds_similar_column_names(self, index_path: str) -> None:
+        """'api number' should rank API_Number first and also find ApiNum."""
+        rows = search_index(index_path, "test-server,1433", "test_db", "api number")
+
+        assert rows[0]["column"] == "API_Number"
+        assert rows[0]["primary_key"] == "YES"
+        assert rows[0]["row_count"] == 455000
+        assert {row["column"] for row in rows} >= {"API_Number", "ApiNum"}
+
+    def test_reports_types_and_foreign_keys(self, index_path: str) -> None:
+        """Results should carry formatted types and FK targets."""
+        rows = search_index(index_path, "test-server,1433", "test_db", "operator")
+
+        by_column = {row["column"]: row for row in rows}
+        assert by_column["OperatorName"]["type"] == "nvarchar(100)"
+        assert by_column["ToOperator"]["type"] == "nvarchar(max)"
+        rows = search_index(index_path, "test-server,1433", "test_db", "apinum")
+        by_column = {row["column"]: row for row in rows}
+        assert by_column["ApiNum"]["references"] == "dbo.Wells.API_Number"
+        assert by_column["API_Number"]["references"] == ""
+
+    def test_short_terms_use_substring_scan(self, index_path: str) -> None:
+        """Terms under three characters should still match."""
+        rows = search_index(index_path, "test-server,1433", "test_db", "id")
+        assert [row["column"] for row in rows] == ["id"]
+
+    def test_unknown_database_returns_none(self, index_path: str, tmp_path) -> None:
+        """Databases that were never snapshotted should return None."""
+        assert search_index(index_path, "test-server,1433", "other_db", "api") is None
+        assert search_index(str(tmp_path / "missing.db"), "s", "d", "api") is None
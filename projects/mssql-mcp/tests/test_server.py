@@ -2,9 +2,14 @@
 
 from __future__ import annotations
 
+import asyncio
+from dataclasses import replace
 from unittest.mock import MagicMock, patch
 
+import pytest
+
 import mssql_mcp.server as server_module
+from mssql_mcp.config import Config
 from mssql_mcp.server import _format_results, _get_active_db
 
 
@@ -38,39 +43,39 @@ class TestFormatResults:
 class TestActiveDatabase:
     def setup_method(self) -> None:
         """Reset active database before each test."""
-        server_module._active_database = None
+        server_module._get_instance().active_database = None
 
     def test_default_uses_config(self) -> None:
         """When no database has been switched, should use config default."""
         active = _get_active_db()
-        assert active == server_module._cfg.database
+        assert active == server_module._get_instance().cfg.database
 
     def test_switched_database(self) -> None:
         """After switching, _get_active_db should return the new database."""
-        server_module._active_database = "other_db"
+        server_module._get_instance().active_database = "other_db"
         assert _get_active_db() == "other_db"
 
-    @patch("mssql_mcp.server.get_connection")
-    def test_use_database_switches(self, mock_get_conn: MagicMock) -> None:
+    @patch("mssql_mcp.server.pooled_connection")
+    def test_use_database_switches(self, mock_pooled: MagicMock) -> None:
         """use_database() should update the active database."""
         mock_conn = MagicMock()
         mock_cursor = MagicMock()
         mock_cursor.fetchone.return_value = ("new_db",)
         mock_conn.cursor.return_value = mock_cursor
-        mock_get_conn.return_value = mock_conn
+        mock_pooled.return_value.__enter__.return_value = mock_conn
 
-        result = server_module.use_database("new_db")
+        result = asyncio.run(server_module.use_database("new_db"))
         assert "new_db" in result
-        assert server_module._active_database == "new_db"
+        assert server_module._get_instance().active_database == "new_db"
 
-    @patch("mssql_mcp.server.get_connection")
-    def test_use_database_failure(self, mock_get_conn: MagicMock) -> None:
+    @patch("mssql_mcp.server.pooled_connection")
+    def test_use_database_failure(self, mock_pooled: MagicMock) -> None:
         """use_database() should not switch if connection fails."""
-        mock_get_conn.side_effect = Exception("Access denied")
+        mock_pooled.side_effect = Exception("Access denied")
 
-        result = server_module.use_database("bad_db")
+        result = asyncio.run(server_module.use_database("bad_db"))
         assert "Failed" in result
-        assert server_module._active_database is None
+        assert server_module._get_instance().active_database is None
 
     @patch("mssql_mcp.server.execute_query")
     def test_list_databases(self, mock_execute: MagicMock) -> None:
@@ -80,7 +85,7 @@ class TestActiveDatabase:
             {"database": "my_app", "status": "ONLINE", "size_mb": 500.0, "created": "2023-06-15"},
         ]
 
-        result = server_module.list_databases()
+        result = asyncio.run(server_module.list_databases())
         assert "Active database:" in result
         assert "master" in result
         assert "my_app" in result
@@ -88,3 +93,249 @@ class TestActiveDatabase:
         mock_execute.assert_called_once()
         call_kwargs = mock_execute.call_args
         assert call_kwargs[1]["database"] == "master"
+
+
+class TestMetadataCaching:
+    def setup_method(self) -> None:
+        """Start each test with an empty cache and the default database."""
+        server_module._get_instance().active_database = None
+        server_module._get_instance().metadata_cache.clear()
+
+    @patch("mssql_mcp.server.execute_query")
+    def test_describe_table_served_from_cache(self, mock_execute: MagicMock) -> None:
+        """A repeat describe_table should not hit the server again."""
+        mock_execute.side_effect = [
+            [{"modified": "2024-01-01"}],
+            [{"column": "id", "type": "int"}],
+        ]
+
+        first = asyncio.run(server_module.describe_table("orders"))
+        second = asyncio.run(server_module.describe_table("orders"))
+
+        assert first == second
+        assert "id" in second
+        assert mock_execute.call_count == 2  # one version query + one catalog query
+
+    @patch("mssql_mcp.server.execute_query")
+    def test_cache_keyed_by_active_database(self, mock_execute: MagicMock) -> None:
+        """The same table in another database should not share a cache entry."""
+        mock_execute.return_value = [{"column": "id", "type": "int"}]
+
+        asyncio.run(server_module.describe_table("orders"))
+        server_module._get_instance().active_database = "other_db"
+        asyncio.run(server_module.describe_table("orders"))
+
+        assert mock_execute.call_count == 4
+
+    @patch("mssql_mcp.server.execute_query")
+    def test_clear_metadata_cache(self, mock_execute: MagicMock) -> None:
+        """clear_metadata_cache should force the next call to re-query."""
+        mock_execute.return_value = [{"schema": "dbo", "table_count": 3}]
+
+        asyncio.run(server_module.list_schemas())
+        result = server_module.clear_metadata_cache()
+        asyncio.run(server_module.list_schemas())
+
+        assert "Cleared 1" in result
+        assert mock_execute.call_count == 4
+
+    def test_cache_stats_reports_both_caches(self) -> None:
+        """cache_stats should report metadata counters and the result cache state."""
+        result = server_module.cache_stats()
+        assert "Metadata cache:" in result
+        assert "Result cache: disabled" in result
+
+
+class TestQueryAllDatabases:
+    @patch("mssql_mcp.fanout.execute_query")
+    @patch("mssql_mcp.server.list_accessible_databases")
+    def test_merges_rows_and_reports_timings(
+        self, mock_list: MagicMock, mock_execute: MagicMock
+    ) -> None:
+        """Rows from every database should be merged, followed by a timing summary."""
+        mock_list.return_value = ["sales", "hr"]
+        mock_execute.side_effect = lambda cfg, sql, database: [{"hit": f"{database}-row"}]
+
+        result = asyncio.run(server_module.query_all_databases("SELECT 1 AS hit"))
+
+        assert "sales-row" in result
+        assert "hr-row" in result
+        assert "Queried 2 databases" in result
+        assert "(0 failed)" in result
+
+    @patch("mssql_mcp.server.list_accessible_databases")
+    def test_no_matching_databases(self, mock_list: MagicMock) -> None:
+        """An empty database selection should be reported, not queried."""
+        mock_list.return_value = []
+        result = asyncio.run(server_module.query_all_databases("SELECT 1", "nope%"))
+        assert "No accessible databases" in result
+
+
+class TestInstances:
+    @pytest.fixture(autouse=True)
+    def two_instances(self):
+        """Serve a second instance alongside the default one for these tests."""
+        saved = dict(server_module._instances)
+        server_module.configure_instances(
+            {
+                "main": Config(host="main-host", database="main_db", user="u", password="p"),
+                "dw": Config(host="dw-host", database="edw", user="u", password="p"),
+            }
+        )
+        yield
+        server_module._instances.clear()
+        server_module._instances.update(saved)
+
+    def test_list_instances_marks_default(self) -> None:
+        """list_instances should show every instance and which one is the default."""
+        result = server_module.list_instances()
+        assert "main (default)" in result
+        assert "dw-host,1433" in result
+
+    @patch("mssql_mcp.server.execute_query")
+    def test_tools_route_to_named_instance(self, mock_execute: MagicMock) -> None:
+        """The instance argument should pick the config and active database."""
+        mock_execute.return_value = [{"server_name": "DW01"}]
+        asyncio.run(server_module.get_database_info(instance="dw"))
+
+        cfg = mock_execute.call_args.args[0]
+        assert cfg.host == "dw-host"
+        assert mock_execute.call_args.kwargs["database"] == "edw"
+
+    def test_active_database_is_per_instance(self) -> None:
+        """Switching one instance's database should leave the others alone."""
+        server_module._get_instance("dw").active_database = "staging"
+        assert _get_active_db("dw") == "staging"
+        assert _get_active_db() == "main_db"
+
+    def test_unknown_instance(self) -> None:
+        """An unknown instance name should list the available ones."""
+        with pytest.raises(ValueError, match="available: main, dw"):
+            asyncio.run(server_module.list_schemas(instance="nope"))
+
+
+class TestSchemaSnapshotTools:
+    def setup_method(self) -> None:
+        """Reset active database before each test."""
+        server_module._get_instance().active_database = None
+
+    @patch("mssql_mcp.server.search_index")
+    def test_search_columns_requires_snapshot(self, mock_search: MagicMock) -> None:
+        """search_columns should point to snapshot_schema when there is no index."""
+        mock_search.return_value = None
+        result = asyncio.run(server_module.search_columns("api number"))
+        assert "snapshot_schema()" in result
+
+    @patch("mssql_mcp.server.search_index")
+    def test_search_columns_formats_matches(self, mock_search: MagicMock) -> None:
+        """search_columns should format index matches for the active database."""
+        mock_search.return_value = [{"schema": "dbo", "table": "Wells", "column": "API_Number"}]
+        result = asyncio.run(server_module.search_columns("api number", limit=5))
+
+        assert "API_Number" in result
+        args, kwargs = mock_search.call_args
+        assert args[2] == server_module._get_instance().cfg.database
+        assert kwargs["limit"] == 5
+
+
+class TestPagedQuery:
+    def setup_method(self) -> None:
+        """Reset active database before each test."""
+        server_module._get_instance().active_database = None
+
+    @patch("mssql_mcp.server.estimate_row_count", return_value=120)
+    @patch("mssql_mcp.server.execute_page")
+    def test_query_returns_next_page_token(
+        self, mock_page: MagicMock, mock_estimate: MagicMock
+    ) -> None:
+        """A query with more rows should print an estimate and a working token."""
+        mock_page.return_value = ([{"id": 1}, {"id": 2}], True)
+
+        result = asyncio.run(server_module.query("SELECT id FROM t ORDER BY id", page_size=2))
+
+        assert "rows 1-2 of ~120 (estimated)" in result
+        token = result.split('next_page(token="')[1].rstrip('")')
+        mock_page.return_value = ([{"id": 3}], False)
+        second = asyncio.run(server_module.next_page(token))
+
+        assert "3" in second
+        assert "next_page" not in second
+        args, kwargs = mock_page.call_args
+        assert args[1:4] == ("SELECT id FROM t ORDER BY id", 2, 2)
+        assert kwargs["database"] == server_module._get_instance().cfg.database
+        mock_estimate.assert_called_once()
+
+    @patch("mssql_mcp.server.estimate_row_count", return_value=None)
+    @patch("mssql_mcp.server.execute_page")
+    def test_token_continues_after_rows_cut_by_budget(
+        self, mock_page: MagicMock, mock_estimate: MagicMock, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """Rows the output budget leaves out should start the next page, not be skipped."""
+        inst = server_module._get_instance()
+        monkeypatch.setattr(inst, "cfg", replace(inst.cfg, max_output_chars=1000))
+        mock_page.return_value = ([{"id": i, "payload": "y" * 80} for i in range(50)], False)
+
+        result = asyncio.run(
+            server_module.query("SELECT id, payload FROM t ORDER BY id", page_size=50)
+        )
+
+        shown = int(result.split("showing ")[1].split(" of")[0])
+        assert 0 < shown < 50
+        assert f"rows 1-{shown}." in result
+        token = result.split('next_page(token="')[1].rstrip('")')
+        assert server_module.decode_page_token(token).offset == shown
+
+    @patch("mssql_mcp.server.estimate_row_count")
+    @patch("mssql_mcp.server.execute_page")
+    def test_unordered_query_asks_for_order_by(
+        self, mock_page: MagicMock, mock_estimate: MagicMock
+    ) -> None:
+        """More rows of an unordered query should get advice, not a token."""
+        mock_page.return_value = ([{"id": 1}, {"id": 2}], True)
+
+        result = asyncio.run(server_module.query("SELECT id FROM t", page_size=2))
+
+        assert "rows 1-2; more rows exist" in result
+        assert "ORDER BY" in result
+        assert "next_page" not in result
+        mock_estimate.assert_not_called()
+
+    @patch("mssql_mcp.server.execute_page")
+    def test_query_last_page_has_no_token(self, mock_page: MagicMock) -> None:
+        """A result that fits in one page should not offer a token."""
+        mock_page.return_value = ([{"id": 1}], False)
+        assert "next_page" not in asyncio.run(server_module.query("SELECT 1 AS id"))
+
+    @patch("mssql_mcp.server.execute_page")
+    def test_query_output_format(self, mock_page: MagicMock) -> None:
+        """output_format should switch the rendering, and unknown values are reported."""
+        mock_page.return_value = ([{"id": 1, "name": "a"}], False)
+        assert asyncio.run(server_module.query("SELECT 1", output_format="csv")) == "id,name\n1,a"
+        assert "Unknown output_format" in asyncio.run(
+            server_module.query("SELECT 1", output_format="xml")
+        )
+
+    def test_next_page_rejects_bad_token(self) -> None:
+        """A malformed token should produce a readable error."""
+        assert "Invalid page token" in asyncio.run(server_module.next_page("garbage"))
+
+
+class TestExportQuery:
+    @patch("mssql_mcp.server.export_to_file")
+    def test_reports_summary(self, mock_export: MagicMock) -> None:
+        """export_query should return the path, rows, size and elapsed time."""
+        mock_export.return_value = {
+            "path": "/exports/out.parquet", "rows": 2000000, "bytes": 1048576, "elapsed_s": 12.3,
+        }
+        result = asyncio.run(server_module.export_query("SELECT * FROM big", filename="out"))
+
+        assert "2,000,000 rows" in result
+        assert "/exports/out.parquet" in result
+        assert "1,048,576 bytes" in result
+        assert "12.3s" in result
+
+    @patch("mssql_mcp.server.export_to_file")
+    def test_reports_failure(self, mock_export: MagicMock) -> None:
+        """Validation errors should be returned as text, not raised."""
+        mock_export.side_effect = ValueError("Write operations are blocked in read-only mode")
+        assert "Export failed" in asyncio.run(server_module.export_query("DELETE FROM t"))
@@ -12,9 +12,13 @@ CREATE TABLE IF NOT EXISTS earthquakes (
     detail_url      TEXT,
     felt            INTEGER,
     tsunami         INTEGER,
+    updated         TIMESTAMP WITH TIME ZONE,
     inserted_at     TIMESTAMP WITH TIME ZONE DEFAULT NOW()
 );
 
+ALTER TABLE earthquakes ADD COLUMN IF NOT EXISTS updated TIMESTAMP WITH TIME ZONE;
+CREATE INDEX IF NOT EXISTS earthquakes_updated_idx ON earthquakes (updated);
+
 CREATE TABLE IF NOT EXISTS weather_forecasts (
     id                  TEXT PRIMARY KEY,
     latitude            DOUBLE PRECISION,
@@ -50,9 +54,13 @@ CREATE TABLE IF NOT EXISTS oklahoma_wells (
     ew                  TEXT,
     footage_ns          REAL,
     ns                  TEXT,
+    row_hash            TEXT,
     inserted_at         TIMESTAMP WITH TIME ZONE DEFAULT NOW()
 );
 
+-- Content fingerprint used to skip rewriting unchanged wells (databases created before it existed)
+ALTER TABLE oklahoma_wells ADD COLUMN IF NOT EXISTS row_hash TEXT;
+
 CREATE TABLE IF NOT EXISTS well_transfers (
     event_date              DATE,
     api_number              TEXT,
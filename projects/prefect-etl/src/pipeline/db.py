@@ -1,13 +1,54 @@
 """Database connection utilities."""
 
+import atexit
+import threading
+
 from sqlalchemy import create_engine, text
+from sqlalchemy.engine import Engine
+
+from pipeline.config import (
+    DATABASE_URL,
+    DB_MAX_OVERFLOW,
+    DB_POOL_PRE_PING,
+    DB_POOL_RECYCLE,
+    DB_POOL_SIZE,
+)
+
+# Process-wide engines keyed by connection URL, so every task in a
+# process shares one connection pool per database
+_engines: dict[str, Engine] = {}
+_engines_lock = threading.Lock()
+
+
+def get_engine(url: str = DATABASE_URL) -> Engine:
+    """Return the shared pooled SQLAlchemy engine for url.
+
+    The engine is created on first use with the DB_POOL_* settings and
+    reused afterwards, so connections survive between tasks and flow runs.
+    """
+    with _engines_lock:
+        engine = _engines.get(url)
+        if engine is None:
+            engine = create_engine(
+                url,
+                pool_size=DB_POOL_SIZE,
+                max_overflow=DB_MAX_OVERFLOW,
+                pool_pre_ping=DB_POOL_PRE_PING,
+                pool_recycle=DB_POOL_RECYCLE,
+            )
+            _engines[url] = engine
+    return engine
 
-from pipeline.config import DATABASE_URL
 
+def dispose_engines() -> None:
+    """Close every pooled connection and forget the cached engines."""
+    with _engines_lock:
+        for engine in _engines.values():
+            engine.dispose()
+        _engines.clear()
 
-def get_engine(url: str = DATABASE_URL):
-    """Create a SQLAlchemy engine for PostgreSQL."""
-    return create_engine(url)
+
+atexit.register(dispose_engines)
 
 
 def check_connection(url: str = DATABASE_URL) -> bool:
@@ -16,3 +57,13 @@ def check_connection(url: str = DATABASE_URL) -> bool:
     with engine.connect() as conn:
         conn.execute(text("SELECT 1"))
     return True
+
+
+def get_watermark(table: str, column: str, url: str = DATABASE_URL):
+    """Return MAX(column) from table, or None when the table is empty.
+
+    table and column are trusted identifiers from the calling flow.
+    """
+    engine = get_engine(url)
+    with engine.connect() as conn:
+        return conn.execute(text(f"SELECT MAX({column}) FROM {table}")).scalar()
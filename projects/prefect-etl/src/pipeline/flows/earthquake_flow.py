@@ -1,29 +1,100 @@
 """Earthquake ETL flow — extracts from USGS, transforms, loads into PostgreSQL."""
 
-from prefect import flow, get_run_logger
+from datetime import datetime, timedelta, timezone
 
-from pipeline.config import DATABASE_URL, EARTHQUAKE_API_URL, MIN_MAGNITUDE
-from pipeline.db import check_connection
-from pipeline.tasks.extract import extract_earthquake_data
+from prefect import flow, get_run_logger, unmapped
+from prefect.task_runners import ThreadPoolTaskRunner
+
+from pipeline.config import (
+    DATABASE_URL,
+    EARTHQUAKE_API_URL,
+    EARTHQUAKE_LOOKBACK_DAYS,
+    EARTHQUAKE_MAX_CONCURRENCY,
+    EARTHQUAKE_QUERY_URL,
+    MIN_MAGNITUDE,
+)
+from pipeline.db import check_connection, get_watermark
+from pipeline.tasks.extract import extract_earthquake_data, extract_earthquake_window
 from pipeline.tasks.load import load_earthquake_data
 from pipeline.tasks.transform import transform_earthquake_data
 
 
-@flow(name="earthquake-etl", log_prints=True)
+def _as_utc(value: datetime) -> datetime:
+    """Treat naive datetimes as UTC."""
+    return value if value.tzinfo is not None else value.replace(tzinfo=timezone.utc)
+
+
+def _time_windows(
+    start: datetime, end: datetime, chunk: timedelta
+) -> list[tuple[datetime, datetime]]:
+    """Split [start, end) into consecutive windows of at most chunk."""
+    windows = []
+    while start < end:
+        windows.append((start, min(start + chunk, end)))
+        start += chunk
+    return windows
+
+
+@flow(
+    name="earthquake-etl",
+    log_prints=True,
+    task_runner=ThreadPoolTaskRunner(max_workers=EARTHQUAKE_MAX_CONCURRENCY),
+)
 def earthquake_etl_flow(
     api_url: str = EARTHQUAKE_API_URL,
     connection_url: str = DATABASE_URL,
     min_magnitude: float = MIN_MAGNITUDE,
+    incremental: bool = False,
+    query_url: str = EARTHQUAKE_QUERY_URL,
+    backfill_start: datetime | None = None,
+    backfill_end: datetime | None = None,
+    chunk_hours: int = 24,
 ) -> int:
-    """Extract earthquake data from USGS, transform, and load into PostgreSQL."""
+    """Extract earthquake data from USGS, transform, and load into PostgreSQL.
+
+    By default the summary feed at api_url is loaded. With incremental=True
+    the flow reads the newest stored updated stamp as a watermark and asks
+    the FDSN query API only for events revised since then. With
+    backfill_start the range up to backfill_end (default now, naive times
+    are UTC) is fetched in chunk_hours windows, several at a time. In every
+    mode, events whose updated stamp hasn't changed are not rewritten.
+    """
     logger = get_run_logger()
 
     logger.info("Checking database connection to %s", connection_url)
     check_connection(connection_url)
     logger.info("Database connection verified")
 
-    logger.info("Extracting earthquake data from %s", api_url)
-    raw_data = extract_earthquake_data(api_url)
+    now = datetime.now(timezone.utc)
+    updated_after = None
+    windows = []
+    if backfill_start is not None:
+        end = _as_utc(backfill_end) if backfill_end is not None else now
+        windows = _time_windows(_as_utc(backfill_start), end, timedelta(hours=chunk_hours))
+        logger.info("Backfilling %s to %s in %d windows", backfill_start, end, len(windows))
+    elif incremental:
+        # The FDSN API defaults starttime to 30 days ago, so events revised
+        # after the watermark are searched for within an explicit lookback
+        updated_after = get_watermark("earthquakes", "updated", connection_url)
+        since = (updated_after or now) - timedelta(days=EARTHQUAKE_LOOKBACK_DAYS)
+        windows = [(since, now)]
+        logger.info("Fetching events updated after %s", updated_after)
+
+    if windows:
+        payloads = extract_earthquake_window.map(
+            unmapped(query_url),
+            [start for start, _ in windows],
+            [end for _, end in windows],
+            updated_after=unmapped(updated_after),
+            min_magnitude=unmapped(min_magnitude),
+        ).result()
+        raw_data = {
+            "type": "FeatureCollection",
+            "features": [feature for payload in payloads for feature in payload["features"]],
+        }
+    else:
+        logger.info("Extracting earthquake data from %s", api_url)
+        raw_data = extract_earthquake_data(api_url)
 
     feature_count = len(raw_data.get("features", []))
     logger.info("Transforming %d features (min_magnitude=%.1f)", feature_count, min_magnitude)
@@ -2,35 +2,99 @@
 
 from prefect import flow, get_run_logger
 
-from pipeline.config import DATABASE_URL, OCC_WELLS_CSV_URL
+from pipeline.config import (
+    DATABASE_URL,
+    OCC_WELLS_CSV_URL,
+    SOURCE_STATE_PATH,
+    TRANSFORM_WORKERS,
+)
 from pipeline.db import check_connection
-from pipeline.tasks.extract import extract_occ_wells_data
-from pipeline.tasks.load import load_occ_wells_data
-from pipeline.tasks.transform import transform_occ_wells_data
+from pipeline.state import mark_source_loaded
+from pipeline.tasks.extract import extract_occ_wells_data, stream_occ_wells_lines
+from pipeline.tasks.load import load_occ_wells_columnar, load_occ_wells_data
+from pipeline.tasks.transform import (
+    iter_occ_wells_batches,
+    transform_occ_wells_columnar,
+    transform_occ_wells_data,
+)
 
 
 @flow(name="oklahoma-wells-etl", log_prints=True)
 def oklahoma_wells_etl_flow(
     csv_url: str = OCC_WELLS_CSV_URL,
     connection_url: str = DATABASE_URL,
+    bulk: bool = False,
+    stream: bool = False,
+    batch_size: int = 50_000,
+    state_path: str | None = SOURCE_STATE_PATH,
+    transform_workers: int = TRANSFORM_WORKERS,
+    columnar: bool = False,
 ) -> int:
-    """Extract Oklahoma wells data from OCC CSV, transform, and load into PostgreSQL."""
+    """Extract Oklahoma wells data from OCC CSV, transform, and load into PostgreSQL.
+
+    Set bulk=True to load through a COPY staging table instead of
+    per-row upserts. Set stream=True to download and parse the CSV
+    incrementally, loading batch_size rows at a time so memory stays
+    flat regardless of file size.
+
+    With a state_path, the download is conditional and the flow returns 0
+    without loading when the source is unchanged since the last run.
+    transform_workers > 1 parses the downloaded CSV in a process pool.
+
+    Set columnar=True to transform into typed pyarrow columns and COPY them
+    straight into the database (requires the ``columnar`` extra). It
+    replaces the bulk and transform_workers options and can't be combined
+    with stream.
+    """
+    if stream and columnar:
+        raise ValueError("stream and columnar modes can't be combined")
+
     logger = get_run_logger()
 
     logger.info("Checking database connection to %s", connection_url)
     check_connection(connection_url)
     logger.info("Database connection verified")
 
-    logger.info("Extracting Oklahoma wells data from %s", csv_url)
-    csv_text = extract_occ_wells_data(csv_url)
+    if stream:
+        logger.info("Streaming Oklahoma wells data from %s (batch_size=%d)", csv_url, batch_size)
+        counts = {"inserted": 0, "updated": 0, "unchanged": 0}
+        lines = stream_occ_wells_lines(csv_url, state_path=state_path)
+        for batch in iter_occ_wells_batches(lines, batch_size):
+            batch_counts = load_occ_wells_data(batch, connection_url, bulk=bulk)
+            for key, value in batch_counts.items():
+                counts[key] += value
+            logger.info("Loaded batch of %d rows (%d total)", len(batch), sum(counts.values()))
+    else:
+        logger.info("Extracting Oklahoma wells data from %s", csv_url)
+        csv_text = extract_occ_wells_data(csv_url, state_path=state_path)
+        if csv_text is None:
+            logger.info("Source unchanged since last load, skipping")
+            return 0
+
+        if columnar:
+            logger.info("Transforming CSV data (file size: %d bytes, columnar)", len(csv_text))
+            table = transform_occ_wells_columnar(csv_text)
+
+            logger.info("Loading %d rows into PostgreSQL (columnar)", table.num_rows)
+            counts = load_occ_wells_columnar(table, connection_url)
+        else:
+            logger.info(
+                "Transforming CSV data (file size: %d bytes, workers=%d)",
+                len(csv_text), transform_workers,
+            )
+            rows = transform_occ_wells_data(csv_text, workers=transform_workers)
 
-    logger.info("Transforming CSV data (file size: %d bytes)", len(csv_text))
-    rows = transform_occ_wells_data(csv_text)
+            logger.info("Loading %d rows into PostgreSQL (bulk=%s)", len(rows), bulk)
+            counts = load_occ_wells_data(rows, connection_url, bulk=bulk)
 
-    logger.info("Loading %d rows into PostgreSQL", len(rows))
-    loaded_count = load_occ_wells_data(rows, connection_url)
+    if state_path:
+        mark_source_loaded(state_path, csv_url)
 
-    logger.info("Pipeline complete: %d rows loaded", loaded_count)
+    loaded_count = sum(counts.values())
+    logger.info(
+        "Pipeline complete: %d rows loaded (%d inserted, %d updated, %d unchanged)",
+        loaded_count, counts["inserted"], counts["updated"], counts["unchanged"],
+    )
     return loaded_count
 
 
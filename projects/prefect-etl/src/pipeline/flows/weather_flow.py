@@ -2,9 +2,14 @@
 
 from prefect import flow, get_run_logger
 
-from pipeline.config import DATABASE_URL, WEATHER_API_URL
+from pipeline.config import (
+    DATABASE_URL,
+    WEATHER_API_URL,
+    WEATHER_LOCATIONS,
+    WEATHER_MAX_CONCURRENCY,
+)
 from pipeline.db import check_connection
-from pipeline.tasks.extract import extract_weather_data
+from pipeline.tasks.extract import extract_weather_data, extract_weather_locations
 from pipeline.tasks.load import load_weather_data
 from pipeline.tasks.transform import transform_weather_data
 
@@ -13,20 +18,39 @@ from pipeline.tasks.transform import transform_weather_data
 def weather_forecast_etl_flow(
     api_url: str = WEATHER_API_URL,
     connection_url: str = DATABASE_URL,
+    locations: list[tuple[float, float]] | None = None,
+    max_concurrency: int = WEATHER_MAX_CONCURRENCY,
 ) -> int:
-    """Extract weather forecast data from Open-Meteo, transform, and load into PostgreSQL."""
+    """Extract weather forecast data from Open-Meteo, transform, and load into PostgreSQL.
+
+    locations is a list of (latitude, longitude) pairs, defaulting to
+    WEATHER_LOCATIONS. When it is empty, only the location in api_url is
+    fetched. Otherwise every location is fetched concurrently (at most
+    max_concurrency at a time) and all rows are loaded in one upsert.
+    """
     logger = get_run_logger()
 
     logger.info("Checking database connection to %s", connection_url)
     check_connection(connection_url)
     logger.info("Database connection verified")
 
-    logger.info("Extracting weather forecast data from %s", api_url)
-    raw_data = extract_weather_data(api_url)
-
-    hourly_count = len(raw_data.get("hourly", {}).get("time", []))
-    logger.info("Transforming %d hourly forecast records", hourly_count)
-    rows = transform_weather_data(raw_data)
+    locations = locations if locations is not None else WEATHER_LOCATIONS
+    if locations:
+        logger.info(
+            "Extracting weather forecasts for %d locations (max_concurrency=%d)",
+            len(locations), max_concurrency,
+        )
+        payloads = extract_weather_locations(api_url, locations, max_concurrency)
+
+        logger.info("Transforming %d location forecasts", len(payloads))
+        rows = [row for rows in transform_weather_data.map(payloads).result() for row in rows]
+    else:
+        logger.info("Extracting weather forecast data from %s", api_url)
+        raw_data = extract_weather_data(api_url)
+
+        hourly_count = len(raw_data.get("hourly", {}).get("time", []))
+        logger.info("Transforming %d hourly forecast records", hourly_count)
+        rows = transform_weather_data(raw_data)
 
     logger.info("Loading %d rows into PostgreSQL", len(rows))
     loaded_count = load_weather_data(rows, connection_url)
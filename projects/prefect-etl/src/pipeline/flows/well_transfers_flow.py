@@ -1,10 +1,13 @@
 """Oklahoma Well Transfers ETL flow — extracts from OCC Excel, transforms, loads into PostgreSQL."""
 
+from itertools import batched
+
 from prefect import flow, get_run_logger
 
-from pipeline.config import DATABASE_URL, WELL_TRANSFERS_XLSX_URL
+from pipeline.config import DATABASE_URL, SOURCE_STATE_PATH, WELL_TRANSFERS_XLSX_URL
 from pipeline.db import check_connection
-from pipeline.tasks.extract import extract_well_transfers
+from pipeline.state import mark_source_loaded
+from pipeline.tasks.extract import extract_well_transfers, stream_well_transfers_rows
 from pipeline.tasks.load import load_well_transfers
 from pipeline.tasks.transform import transform_well_transfers
 
@@ -13,22 +16,48 @@ from pipeline.tasks.transform import transform_well_transfers
 def well_transfers_etl_flow(
     xlsx_url: str = WELL_TRANSFERS_XLSX_URL,
     connection_url: str = DATABASE_URL,
+    state_path: str | None = SOURCE_STATE_PATH,
+    stream: bool = False,
+    batch_size: int = 10_000,
 ) -> int:
-    """Extract Oklahoma well transfers data from OCC Excel, transform, and load into PostgreSQL."""
+    """Extract Oklahoma well transfers data from OCC Excel, transform, and load into PostgreSQL.
+
+    With a state_path, the download is conditional and the flow returns 0
+    without loading when the source is unchanged since the last run.
+
+    Set stream=True for large workbooks such as the multi-year archive: the
+    download is spooled to a temporary file, the sheet is read lazily, and
+    rows are transformed and loaded batch_size at a time.
+    """
     logger = get_run_logger()
 
     logger.info("Checking database connection to %s", connection_url)
     check_connection(connection_url)
     logger.info("Database connection verified")
 
-    logger.info("Extracting well transfers data from %s", xlsx_url)
-    raw_rows = extract_well_transfers(xlsx_url)
+    if stream:
+        logger.info("Streaming well transfers data from %s (batch_size=%d)", xlsx_url, batch_size)
+        loaded_count = 0
+        raw_rows = stream_well_transfers_rows(xlsx_url, state_path=state_path)
+        for raw_batch in batched(raw_rows, batch_size):
+            rows = transform_well_transfers(raw_batch)
+            loaded_count += load_well_transfers(rows, connection_url)
+            logger.info("Loaded batch of %d rows (%d total)", len(rows), loaded_count)
+    else:
+        logger.info("Extracting well transfers data from %s", xlsx_url)
+        raw_rows = extract_well_transfers(xlsx_url, state_path=state_path)
+        if raw_rows is None:
+            logger.info("Source unchanged since last load, skipping")
+            return 0
+
+        logger.info("Transforming %d Excel rows", len(raw_rows))
+        rows = transform_well_transfers(raw_rows)
 
-    logger.info("Transforming %d Excel rows", len(raw_rows))
-    rows = transform_well_transfers(raw_rows)
+        logger.info("Loading %d rows into PostgreSQL", len(rows))
+        loaded_count = load_well_transfers(rows, connection_url)
 
-    logger.info("Loading %d rows into PostgreSQL", len(rows))
-    loaded_count = load_well_transfers(rows, connection_url)
+    if state_path:
+        mark_source_loaded(state_path, xlsx_url)
 
     logger.info("Pipeline complete: %d rows loaded", loaded_count)
     return loaded_count
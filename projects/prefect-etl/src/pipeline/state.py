@@ -0,0 +1,85 @@
+"""Local state store for source change detection.
+
+Remembers the ETag, Last-Modified and SHA-256 of each downloaded source
+in a small JSON file so extract tasks can send conditional requests and
+skip files that haven't changed since the last successful load.
+
+A new version is first recorded as *pending*. The flow promotes it to
+*current* with mark_source_loaded() only after the load succeeds, so a
+failed run is retried in full next time.
+"""
+
+import hashlib
+import json
+import os
+from pathlib import Path
+
+
+def _read_state(state_path: str) -> dict:
+    """Read the whole state file, or an empty dict if it doesn't exist yet."""
+    path = Path(state_path)
+    if not path.exists():
+        return {}
+    return json.loads(path.read_text())
+
+
+def _write_state(state_path: str, state: dict) -> None:
+    """Atomically replace the state file."""
+    path = Path(state_path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_name(path.name + ".tmp")
+    tmp_path.write_text(json.dumps(state, indent=2, sort_keys=True))
+    os.replace(tmp_path, path)
+
+
+def conditional_headers(state_path: str, url: str) -> dict:
+    """Build If-None-Match / If-Modified-Since headers from the last loaded version."""
+    current = _read_state(state_path).get(url, {}).get("current", {})
+    headers = {}
+    if current.get("etag"):
+        headers["If-None-Match"] = current["etag"]
+    if current.get("last_modified"):
+        headers["If-Modified-Since"] = current["last_modified"]
+    return headers
+
+
+def record_source_version(state_path: str, url: str, headers, sha256: str) -> bool:
+    """Record a freshly downloaded version of url.
+
+    Returns False if the content hash matches the last loaded version
+    (the server ignored or lacked conditional headers). Otherwise stores
+    the version as pending and returns True.
+    """
+    state = _read_state(state_path)
+    entry = state.setdefault(url, {})
+    version = {
+        "etag": headers.get("etag"),
+        "last_modified": headers.get("last-modified"),
+        "sha256": sha256,
+    }
+
+    if entry.get("current", {}).get("sha256") == sha256:
+        # Same bytes — refresh validators so the next request can get a 304
+        entry["current"] = version
+        entry.pop("pending", None)
+        _write_state(state_path, state)
+        return False
+
+    entry["pending"] = version
+    _write_state(state_path, state)
+    return True
+
+
+def mark_source_loaded(state_path: str, url: str) -> None:
+    """Promote the pending version of url to current after a successful load."""
+    state = _read_state(state_path)
+    entry = state.get(url, {})
+    if "pending" not in entry:
+        return
+    entry["current"] = entry.pop("pending")
+    _write_state(state_path, state)
+
+
+def sha256_hex(content: bytes) -> str:
+    """Return the hex SHA-256 digest of content."""
+    return hashlib.sha256(content).hexdigest()
@@ -1,11 +1,41 @@
 """Extract tasks — fetch raw data from external sources."""
 
+import asyncio
+import codecs
+import hashlib
+import tempfile
+from collections.abc import Iterator
+from datetime import datetime, timedelta, timezone
 from io import BytesIO
 
 import httpx
 from openpyxl import load_workbook
 from prefect import task
 
+from pipeline.state import conditional_headers, record_source_version, sha256_hex
+
+
+def _conditional_get(url: str, timeout: float, state_path: str | None) -> httpx.Response | None:
+    """GET url, returning None when the source is unchanged since the last load.
+
+    Without a state_path this is a plain GET. With one, the request carries
+    If-None-Match / If-Modified-Since from the state store, and a 304 or a
+    body whose SHA-256 matches the last loaded version returns None.
+    """
+    if state_path is None:
+        response = httpx.get(url, timeout=timeout)
+        response.raise_for_status()
+        return response
+
+    response = httpx.get(url, timeout=timeout, headers=conditional_headers(state_path, url))
+    if response.status_code == 304:
+        return None
+    response.raise_for_status()
+
+    if not record_source_version(state_path, url, response.headers, sha256_hex(response.content)):
+        return None
+    return response
+
 
 @task(name="extract_earthquake_data", retries=2, retry_delay_seconds=10)
 def extract_earthquake_data(api_url: str) -> dict:
@@ -15,6 +45,87 @@ def extract_earthquake_data(api_url: str) -> dict:
     return response.json()
 
 
+# Resolution of FDSN start and end times; windows are never split finer
+_FDSN_TICK = timedelta(milliseconds=1)
+
+
+def _fdsn_time(value: datetime) -> str:
+    """Format a datetime as the UTC ISO-8601 string the FDSN API expects."""
+    if value.tzinfo is not None:
+        value = value.astimezone(timezone.utc).replace(tzinfo=None)
+    return value.isoformat(timespec="milliseconds")
+
+
+def _query_earthquakes(
+    query_url: str,
+    start: datetime,
+    end: datetime,
+    updated_after: datetime | None,
+    min_magnitude: float,
+    limit: int,
+) -> list[dict]:
+    """Fetch the events in [start, end], halving the window while it hits limit.
+
+    Both bounds are inclusive, as in the FDSN API, so a split window
+    becomes [start, middle - 1 ms] and [middle, end], which share no
+    event. A single-millisecond window that still hits limit can't be
+    split further and raises RuntimeError rather than drop events.
+    """
+    start -= timedelta(microseconds=start.microsecond % 1000)
+    end -= timedelta(microseconds=end.microsecond % 1000)
+    params = {
+        "format": "geojson",
+        "orderby": "time-asc",
+        "starttime": _fdsn_time(start),
+        "endtime": _fdsn_time(end),
+        "limit": limit,
+    }
+    if updated_after is not None:
+        params["updatedafter"] = _fdsn_time(updated_after)
+    if min_magnitude > 0:
+        params["minmagnitude"] = min_magnitude
+
+    response = httpx.get(query_url, params=params, timeout=60.0)
+    response.raise_for_status()
+    features = response.json().get("features", [])
+
+    # A full page means the window was truncated — split it and ask again
+    if len(features) >= limit:
+        if end - start < _FDSN_TICK:
+            raise RuntimeError(
+                f"{len(features)} events at {_fdsn_time(start)} reach the page limit of "
+                f"{limit} and can't be split further"
+            )
+        middle = start + (end - start + _FDSN_TICK) // 2
+        middle -= timedelta(microseconds=middle.microsecond % 1000)
+        return _query_earthquakes(
+            query_url, start, middle - _FDSN_TICK, updated_after, min_magnitude, limit
+        ) + _query_earthquakes(query_url, middle, end, updated_after, min_magnitude, limit)
+    return features
+
+
+@task(name="extract_earthquake_window", retries=2, retry_delay_seconds=10)
+def extract_earthquake_window(
+    query_url: str,
+    start: datetime,
+    end: datetime,
+    updated_after: datetime | None = None,
+    min_magnitude: float = 0.0,
+    limit: int = 20_000,
+) -> dict:
+    """Fetch the events in one time window from the USGS FDSN event API.
+
+    With updated_after, only events revised after that time are returned.
+    Windows with more than limit events are split until every page fits,
+    down to a single millisecond; a millisecond that alone fills a page
+    raises RuntimeError. Returns a GeoJSON FeatureCollection like
+    extract_earthquake_data, with each event reported once.
+    """
+    features = _query_earthquakes(query_url, start, end, updated_after, min_magnitude, limit)
+    unique = {feature.get("id"): feature for feature in features}
+    return {"type": "FeatureCollection", "features": list(unique.values())}
+
+
 @task(name="extract_weather_data", retries=2, retry_delay_seconds=10)
 def extract_weather_data(api_url: str) -> dict:
     """Fetch weather forecast JSON from the Open-Meteo API."""
@@ -23,38 +134,157 @@ def extract_weather_data(api_url: str) -> dict:
     return response.json()
 
 
+async def _fetch_weather_locations(
+    api_url: str, locations: list[tuple[float, float]], max_concurrency: int
+) -> list[dict]:
+    """Fetch the forecast for every location over one shared connection pool."""
+    semaphore = asyncio.Semaphore(max_concurrency)
+    limits = httpx.Limits(
+        max_connections=max_concurrency, max_keepalive_connections=max_concurrency
+    )
+    base_url = httpx.URL(api_url)
+
+    async with httpx.AsyncClient(timeout=30.0, limits=limits) as client:
+
+        async def fetch(latitude: float, longitude: float) -> dict:
+            url = base_url.copy_merge_params({"latitude": latitude, "longitude": longitude})
+            async with semaphore:
+                response = await client.get(url)
+            response.raise_for_status()
+            return response.json()
+
+        return await asyncio.gather(*(fetch(lat, lon) for lat, lon in locations))
+
+
+@task(name="extract_weather_locations", retries=2, retry_delay_seconds=10)
+def extract_weather_locations(
+    api_url: str, locations: list[tuple[float, float]], max_concurrency: int = 20
+) -> list[dict]:
+    """Fetch Open-Meteo forecasts for many locations concurrently.
+
+    api_url supplies the endpoint and forecast parameters; its latitude
+    and longitude are replaced for each location. At most max_concurrency
+    requests are in flight at once. Returns one JSON payload per location,
+    in the same order as locations.
+    """
+    return asyncio.run(_fetch_weather_locations(api_url, locations, max_concurrency))
+
+
 @task(name="extract_occ_wells_data", retries=2, retry_delay_seconds=10)
-def extract_occ_wells_data(csv_url: str) -> str:
+def extract_occ_wells_data(csv_url: str, state_path: str | None = None) -> str | None:
     """Fetch Oklahoma Corporation Commission Wells CSV data.
 
     Returns raw CSV text as a string. The file is large (~126 MB),
     so timeout is set to 120 seconds.
+
+    With a state_path, sends a conditional request and returns None
+    when the file is unchanged since the last successful load.
     """
-    response = httpx.get(csv_url, timeout=120.0)
-    response.raise_for_status()
+    response = _conditional_get(csv_url, 120.0, state_path)
+    if response is None:
+        return None
     return response.text
 
 
+def stream_occ_wells_lines(
+    csv_url: str, chunk_size: int = 1 << 20, state_path: str | None = None
+) -> Iterator[str]:
+    """Stream the OCC wells CSV as decoded text lines.
+
+    Uses httpx.stream so only one network chunk plus a partial line is
+    held in memory. Lines keep their trailing newline so csv.reader can
+    reassemble quoted fields that span lines.
+
+    With a state_path, sends a conditional request and yields nothing on
+    a 304. The content hash is only known once the stream is exhausted,
+    so it is recorded as pending for the flow to promote after the load.
+    """
+    kwargs = {"headers": conditional_headers(state_path, csv_url)} if state_path else {}
+    with httpx.stream("GET", csv_url, timeout=120.0, **kwargs) as response:
+        if state_path and response.status_code == 304:
+            return
+        response.raise_for_status()
+
+        digest = hashlib.sha256()
+        decoder = codecs.getincrementaldecoder(response.encoding or "utf-8")(errors="replace")
+        pending = ""
+        for chunk in response.iter_bytes(chunk_size):
+            digest.update(chunk)
+            pending += decoder.decode(chunk)
+            *lines, pending = pending.split("\n")
+            for line in lines:
+                yield line + "\n"
+        pending += decoder.decode(b"", final=True)
+        if pending:
+            yield pending
+
+        if state_path:
+            record_source_version(state_path, csv_url, response.headers, digest.hexdigest())
+
+
+def _iter_xlsx_rows(source) -> Iterator[tuple]:
+    """Yield the value tuples of the active sheet, skipping the header row.
+
+    The workbook is opened read-only, so rows are parsed lazily from the
+    sheet XML instead of building the full cell object graph.
+    """
+    workbook = load_workbook(source, read_only=True, data_only=True)
+    try:
+        sheet = workbook.active
+        # Don't trust the stored dimension tag; read until the last row
+        sheet.reset_dimensions()
+        yield from sheet.iter_rows(min_row=2, values_only=True)
+    finally:
+        workbook.close()
+
+
 @task(name="extract_well_transfers", retries=2, retry_delay_seconds=10)
-def extract_well_transfers(xlsx_url: str) -> list[tuple]:
+def extract_well_transfers(xlsx_url: str, state_path: str | None = None) -> list[tuple] | None:
     """Fetch Oklahoma Corporation Commission Well Transfers Excel data.
 
     Downloads the .xlsx file, parses it with openpyxl, and returns
     a list of row tuples (skipping the header row). The file is small
     (~943 rows), so timeout is set to 60 seconds.
+
+    With a state_path, sends a conditional request and returns None
+    when the file is unchanged since the last successful load.
     """
-    response = httpx.get(xlsx_url, timeout=60.0)
-    response.raise_for_status()
+    response = _conditional_get(xlsx_url, 60.0, state_path)
+    if response is None:
+        return None
+
+    return list(_iter_xlsx_rows(BytesIO(response.content)))
+
+
+def stream_well_transfers_rows(
+    xlsx_url: str, chunk_size: int = 1 << 20, state_path: str | None = None
+) -> Iterator[tuple]:
+    """Stream the well transfers workbook as row tuples, skipping the header.
+
+    The download is spooled to a temporary file chunk by chunk, then read
+    with a read-only workbook, so neither the raw bytes nor the parsed
+    sheet are held in memory — suitable for the multi-year archive.
+
+    With a state_path, sends a conditional request and yields nothing when
+    the file is unchanged since the last successful load. A new version is
+    recorded as pending for the flow to promote after the load.
+    """
+    kwargs = {"headers": conditional_headers(state_path, xlsx_url)} if state_path else {}
+    with tempfile.TemporaryFile() as spool:
+        with httpx.stream("GET", xlsx_url, timeout=120.0, **kwargs) as response:
+            if state_path and response.status_code == 304:
+                return
+            response.raise_for_status()
 
-    # Parse Excel file from bytes
-    workbook = load_workbook(BytesIO(response.content), data_only=True)
-    sheet = workbook.active
+            digest = hashlib.sha256()
+            for chunk in response.iter_bytes(chunk_size):
+                digest.update(chunk)
+                spool.write(chunk)
 
-    # Convert to list of tuples, skipping header row
-    rows = []
-    for i, row in enumerate(sheet.iter_rows(values_only=True)):
-        if i == 0:  # Skip header
-            continue
-        rows.append(row)
+        if state_path and not record_source_version(
+            state_path, xlsx_url, response.headers, digest.hexdigest()
+        ):
+            return
 
-    return rows
+        spool.seek(0)
+        yield from _iter_xlsx_rows(spool)
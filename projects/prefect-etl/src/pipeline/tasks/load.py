@@ -1,7 +1,119 @@
 """Load tasks — insert data into PostgreSQL."""
 
+import csv
+import io
+import json
+import math
+from collections.abc import Callable, Iterable
+from typing import TYPE_CHECKING
+
 from prefect import task
-from sqlalchemy import create_engine, text
+from sqlalchemy import text
+
+from pipeline.db import get_engine
+
+if TYPE_CHECKING:
+    import pyarrow as pa
+
+# Rows buffered per COPY FROM STDIN call in bulk mode
+COPY_CHUNK_ROWS = 50_000
+
+OCC_WELLS_COLUMNS = (
+    "api", "well_records_docs", "well_name", "well_num", "operator",
+    "well_status", "well_type", "symbol_class", "sh_lat", "sh_lon",
+    "county", "section", "township", "range", "qtr4", "qtr3", "qtr2", "qtr1",
+    "pm", "footage_ew", "ew", "footage_ns", "ns",
+)
+
+
+def _jsonb_value(value: object) -> object:
+    """Spell a non-finite float as float8 input text; JSON itself has no NaN or Infinity.
+
+    jsonb_populate_record parses a string into a float8 column with the
+    type's own input function, so the row path stores NaN and infinities
+    as the COPY paths do.
+    """
+    if isinstance(value, float) and not math.isfinite(value):
+        return "NaN" if math.isnan(value) else ("Infinity" if value > 0 else "-Infinity")
+    return value
+
+
+def occ_well_row_hash_sql(alias: str) -> str:
+    """Return the SQL expression fingerprinting a wells row's content columns.
+
+    Stored in oklahoma_wells.row_hash so the load can skip rows whose
+    content hasn't changed since they were last written. PostgreSQL
+    computes it from the values already cast to the table's column types,
+    so the row, bulk and columnar loads all store the same hash, and no
+    load hashes rows one by one in Python.
+    """
+    columns = ", ".join(f"{alias}.{col}" for col in OCC_WELLS_COLUMNS)
+    return f"md5(ROW({columns})::text)"
+
+
+def _copy_rows(
+    conn, table: str, columns: tuple[str, ...], rows: Iterable[dict],
+    chunk_size: int = COPY_CHUNK_ROWS,
+) -> int:
+    """Stream row dicts into a table with PostgreSQL COPY FROM STDIN.
+
+    Rows are serialized to CSV in chunks so only ``chunk_size`` rows are
+    buffered at a time. None is written as an unquoted empty field, which
+    COPY reads as NULL. Returns the number of rows copied.
+    """
+    copy_sql = f"COPY {table} ({', '.join(columns)}) FROM STDIN WITH (FORMAT csv)"
+    cursor = conn.connection.cursor()
+    total = 0
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    pending = 0
+
+    def flush() -> None:
+        buffer.seek(0)
+        cursor.copy_expert(copy_sql, buffer)
+        buffer.seek(0)
+        buffer.truncate()
+
+    try:
+        for row in rows:
+            writer.writerow([row.get(col) for col in columns])
+            pending += 1
+            if pending >= chunk_size:
+                flush()
+                total += pending
+                pending = 0
+        if pending:
+            flush()
+            total += pending
+    finally:
+        cursor.close()
+
+    return total
+
+
+def _copy_table(
+    conn, table: str, data: "pa.Table", chunk_size: int = COPY_CHUNK_ROWS
+) -> int:
+    """Stream a pyarrow Table into a table with COPY FROM STDIN.
+
+    Record batches are serialized with pyarrow's CSV writer, which writes
+    nulls as unquoted empty fields. Returns the number of rows copied.
+    """
+    import pyarrow.csv as pa_csv
+
+    copy_sql = f"COPY {table} ({', '.join(data.column_names)}) FROM STDIN WITH (FORMAT csv)"
+    write_options = pa_csv.WriteOptions(include_header=False)
+    cursor = conn.connection.cursor()
+    try:
+        for batch in data.to_batches(max_chunksize=chunk_size):
+            buffer = io.BytesIO()
+            pa_csv.write_csv(batch, buffer, write_options)
+            buffer.seek(0)
+            cursor.copy_expert(copy_sql, buffer)
+    finally:
+        cursor.close()
+
+    return data.num_rows
 
 
 @task(name="load_earthquake_data")
@@ -9,7 +121,8 @@ def load_earthquake_data(rows: list[dict], connection_url: str) -> int:
     """Upsert earthquake rows into PostgreSQL.
 
     Uses ON CONFLICT to make the load idempotent — safe to re-run
-    without creating duplicate rows.
+    without creating duplicate rows. An existing event is only rewritten
+    when its USGS updated stamp has changed.
     """
     if not rows:
         return 0
@@ -18,20 +131,22 @@ def load_earthquake_data(rows: list[dict], connection_url: str) -> int:
         INSERT INTO earthquakes (
             id, magnitude, place, occurred_at, longitude, latitude,
             depth_km, magnitude_type, event_type, title, detail_url,
-            felt, tsunami
+            felt, tsunami, updated
         ) VALUES (
             :id, :magnitude, :place, :occurred_at, :longitude, :latitude,
             :depth_km, :magnitude_type, :event_type, :title, :detail_url,
-            :felt, :tsunami
+            :felt, :tsunami, :updated
         )
         ON CONFLICT (id) DO UPDATE SET
             magnitude = EXCLUDED.magnitude,
             place = EXCLUDED.place,
             felt = EXCLUDED.felt,
-            tsunami = EXCLUDED.tsunami
+            tsunami = EXCLUDED.tsunami,
+            updated = EXCLUDED.updated
+        WHERE earthquakes.updated IS DISTINCT FROM EXCLUDED.updated
     """)
 
-    engine = create_engine(connection_url)
+    engine = get_engine(connection_url)
     with engine.connect() as conn:
         for row in rows:
             conn.execute(upsert_sql, row)
@@ -45,7 +160,9 @@ def load_weather_data(rows: list[dict], connection_url: str) -> int:
     """Upsert weather forecast rows into PostgreSQL.
 
     Uses ON CONFLICT to make the load idempotent — safe to re-run
-    without creating duplicate rows.
+    without creating duplicate rows. All rows are sent in one statement
+    as column arrays expanded with unnest(), so loading hundreds of
+    locations is a single round-trip. Rows sharing an id keep the last one.
     """
     if not rows:
         return 0
@@ -54,9 +171,15 @@ def load_weather_data(rows: list[dict], connection_url: str) -> int:
         INSERT INTO weather_forecasts (
             id, latitude, longitude, forecast_time, temperature_f,
             relative_humidity, wind_speed_mph
-        ) VALUES (
-            :id, :latitude, :longitude, :forecast_time, :temperature_f,
-            :relative_humidity, :wind_speed_mph
+        )
+        SELECT * FROM unnest(
+            CAST(:id AS TEXT[]),
+            CAST(:latitude AS DOUBLE PRECISION[]),
+            CAST(:longitude AS DOUBLE PRECISION[]),
+            CAST(:forecast_time AS TIMESTAMP WITH TIME ZONE[]),
+            CAST(:temperature_f AS REAL[]),
+            CAST(:relative_humidity AS REAL[]),
+            CAST(:wind_speed_mph AS REAL[])
         )
         ON CONFLICT (id) DO UPDATE SET
             temperature_f = EXCLUDED.temperature_f,
@@ -64,37 +187,67 @@ def load_weather_data(rows: list[dict], connection_url: str) -> int:
             wind_speed_mph = EXCLUDED.wind_speed_mph
     """)
 
-    engine = create_engine(connection_url)
+    # ON CONFLICT can't touch the same id twice in one statement
+    unique_rows = list({row["id"]: row for row in rows}.values())
+    columns = {
+        col: [row[col] for row in unique_rows]
+        for col in (
+            "id", "latitude", "longitude", "forecast_time", "temperature_f",
+            "relative_humidity", "wind_speed_mph",
+        )
+    }
+
+    engine = get_engine(connection_url)
     with engine.connect() as conn:
-        for row in rows:
-            conn.execute(upsert_sql, row)
+        conn.execute(upsert_sql, columns)
         conn.commit()
 
-    return len(rows)
+    return len(unique_rows)
 
 
 @task(name="load_occ_wells_data")
-def load_occ_wells_data(rows: list[dict], connection_url: str) -> int:
+def load_occ_wells_data(
+    rows: list[dict], connection_url: str, bulk: bool = False
+) -> dict[str, int]:
     """Upsert Oklahoma wells rows into PostgreSQL.
 
     Uses ON CONFLICT to make the load idempotent — safe to re-run
-    without creating duplicate rows.
+    without creating duplicate rows. Each row carries a content
+    fingerprint in row_hash; existing rows are only rewritten when
+    their fingerprint changed, so unchanged wells generate no writes.
+
+    With bulk=True, rows are streamed into a temporary staging table with
+    COPY FROM STDIN and merged into oklahoma_wells with a single
+    INSERT ... SELECT ... ON CONFLICT statement instead of one round-trip
+    per row.
+
+    Returns counts of inserted, updated and unchanged rows.
     """
+    counts = {"inserted": 0, "updated": 0, "unchanged": 0}
     if not rows:
-        return 0
+        return counts
 
-    upsert_sql = text("""
+    if bulk:
+        return _bulk_load_occ_wells(
+            connection_url,
+            lambda conn: _copy_rows(conn, "oklahoma_wells_stage", OCC_WELLS_COLUMNS, rows),
+        )
+
+    # The row is passed as JSON and typed by jsonb_populate_record, so the
+    # fingerprint sees the same column types as the staged bulk loads
+    upsert_sql = text(f"""
         INSERT INTO oklahoma_wells (
             api, well_records_docs, well_name, well_num, operator,
             well_status, well_type, symbol_class, sh_lat, sh_lon,
             county, section, township, range, qtr4, qtr3, qtr2, qtr1,
-            pm, footage_ew, ew, footage_ns, ns
-        ) VALUES (
-            :api, :well_records_docs, :well_name, :well_num, :operator,
-            :well_status, :well_type, :symbol_class, :sh_lat, :sh_lon,
-            :county, :section, :township, :range, :qtr4, :qtr3, :qtr2, :qtr1,
-            :pm, :footage_ew, :ew, :footage_ns, :ns
+            pm, footage_ew, ew, footage_ns, ns, row_hash
         )
+        SELECT
+            r.api, r.well_records_docs, r.well_name, r.well_num, r.operator,
+            r.well_status, r.well_type, r.symbol_class, r.sh_lat, r.sh_lon,
+            r.county, r.section, r.township, r.range, r.qtr4, r.qtr3, r.qtr2, r.qtr1,
+            r.pm, r.footage_ew, r.ew, r.footage_ns, r.ns, {occ_well_row_hash_sql("r")}
+        FROM jsonb_populate_record(NULL::oklahoma_wells, CAST(:row AS JSONB)) AS r
         ON CONFLICT (api) DO UPDATE SET
             well_records_docs = EXCLUDED.well_records_docs,
             well_name = EXCLUDED.well_name,
@@ -117,16 +270,133 @@ def load_occ_wells_data(rows: list[dict], connection_url: str) -> int:
             footage_ew = EXCLUDED.footage_ew,
             ew = EXCLUDED.ew,
             footage_ns = EXCLUDED.footage_ns,
-            ns = EXCLUDED.ns
+            ns = EXCLUDED.ns,
+            row_hash = EXCLUDED.row_hash
+        WHERE oklahoma_wells.row_hash IS DISTINCT FROM EXCLUDED.row_hash
+        RETURNING (xmax = 0) AS inserted
     """)
 
-    engine = create_engine(connection_url)
+    engine = get_engine(connection_url)
     with engine.connect() as conn:
         for row in rows:
-            conn.execute(upsert_sql, row)
+            payload = json.dumps(
+                {col: _jsonb_value(row.get(col)) for col in OCC_WELLS_COLUMNS},
+                default=str,
+                allow_nan=False,
+            )
+            written = conn.execute(upsert_sql, {"row": payload}).first()
+            if written is None:
+                counts["unchanged"] += 1
+            elif written.inserted:
+                counts["inserted"] += 1
+            else:
+                counts["updated"] += 1
         conn.commit()
 
-    return len(rows)
+    return counts
+
+
+@task(name="load_occ_wells_columnar")
+def load_occ_wells_columnar(table: "pa.Table", connection_url: str) -> dict[str, int]:
+    """Upsert a columnar wells table from transform_occ_wells_columnar.
+
+    The columns are written straight to COPY FROM STDIN with pyarrow's
+    CSV writer and merged like bulk=True in load_occ_wells_data. Row
+    fingerprints are computed by the merge (see occ_well_row_hash_sql),
+    so switching between the row and columnar engines doesn't rewrite
+    unchanged wells, and no column is converted back to Python objects.
+
+    Returns counts of inserted, updated and unchanged rows.
+    """
+    if table.num_rows == 0:
+        return {"inserted": 0, "updated": 0, "unchanged": 0}
+
+    staged = table.select(list(OCC_WELLS_COLUMNS))
+
+    return _bulk_load_occ_wells(
+        connection_url, lambda conn: _copy_table(conn, "oklahoma_wells_stage", staged)
+    )
+
+
+def _bulk_load_occ_wells(
+    connection_url: str, copy_into_stage: Callable[..., int]
+) -> dict[str, int]:
+    """Fill a staging table with copy_into_stage, then merge into oklahoma_wells.
+
+    copy_into_stage receives the open connection and returns the number
+    of rows it copied into oklahoma_wells_stage; the merge computes each
+    row's row_hash from the staged columns. The staging table carries
+    a load sequence so that when an API number appears more than once in
+    the file the last row wins, matching the row-by-row upsert. The
+    staging table is dropped on commit.
+    """
+    create_stage_sql = text("""
+        CREATE TEMP TABLE oklahoma_wells_stage (
+            LIKE oklahoma_wells,
+            load_seq BIGSERIAL
+        ) ON COMMIT DROP
+    """)
+
+    merge_sql = text(f"""
+        WITH merged AS (
+            INSERT INTO oklahoma_wells (
+                api, well_records_docs, well_name, well_num, operator,
+                well_status, well_type, symbol_class, sh_lat, sh_lon,
+                county, section, township, range, qtr4, qtr3, qtr2, qtr1,
+                pm, footage_ew, ew, footage_ns, ns, row_hash
+            )
+            SELECT DISTINCT ON (s.api)
+                s.api, s.well_records_docs, s.well_name, s.well_num, s.operator,
+                s.well_status, s.well_type, s.symbol_class, s.sh_lat, s.sh_lon,
+                s.county, s.section, s.township, s.range, s.qtr4, s.qtr3, s.qtr2, s.qtr1,
+                s.pm, s.footage_ew, s.ew, s.footage_ns, s.ns, {occ_well_row_hash_sql("s")}
+            FROM oklahoma_wells_stage s
+            ORDER BY s.api, s.load_seq DESC
+            ON CONFLICT (api) DO UPDATE SET
+                well_records_docs = EXCLUDED.well_records_docs,
+                well_name = EXCLUDED.well_name,
+                well_num = EXCLUDED.well_num,
+                operator = EXCLUDED.operator,
+                well_status = EXCLUDED.well_status,
+                well_type = EXCLUDED.well_type,
+                symbol_class = EXCLUDED.symbol_class,
+                sh_lat = EXCLUDED.sh_lat,
+                sh_lon = EXCLUDED.sh_lon,
+                county = EXCLUDED.county,
+                section = EXCLUDED.section,
+                township = EXCLUDED.township,
+                range = EXCLUDED.range,
+                qtr4 = EXCLUDED.qtr4,
+                qtr3 = EXCLUDED.qtr3,
+                qtr2 = EXCLUDED.qtr2,
+                qtr1 = EXCLUDED.qtr1,
+                pm = EXCLUDED.pm,
+                footage_ew = EXCLUDED.footage_ew,
+                ew = EXCLUDED.ew,
+                footage_ns = EXCLUDED.footage_ns,
+                ns = EXCLUDED.ns,
+                row_hash = EXCLUDED.row_hash
+            WHERE oklahoma_wells.row_hash IS DISTINCT FROM EXCLUDED.row_hash
+            RETURNING (xmax = 0) AS inserted
+        )
+        SELECT
+            COUNT(*) FILTER (WHERE inserted)      AS inserted,
+            COUNT(*) FILTER (WHERE NOT inserted)  AS updated
+        FROM merged
+    """)
+
+    engine = get_engine(connection_url)
+    with engine.connect() as conn:
+        conn.execute(create_stage_sql)
+        copied = copy_into_stage(conn)
+        merged = conn.execute(merge_sql).one()
+        conn.commit()
+
+    return {
+        "inserted": merged.inserted,
+        "updated": merged.updated,
+        "unchanged": copied - merged.inserted - merged.updated,
+    }
 
 
 @task(name="load_well_transfers")
@@ -188,7 +458,7 @@ def load_well_transfers(rows: list[dict], connection_url: str) -> int:
             to_operator_phone = EXCLUDED.to_operator_phone
     """)
 
-    engine = create_engine(connection_url)
+    engine = get_engine(connection_url)
     with engine.connect() as conn:
         for row in rows:
             conn.execute(upsert_sql, row)
@@ -2,10 +2,18 @@
 
 import csv
 import io
+import multiprocessing
+from collections.abc import Iterable, Iterator
+from concurrent.futures import ProcessPoolExecutor
 from datetime import date, datetime, timezone
+from itertools import repeat
+from typing import TYPE_CHECKING
 
 from prefect import task
 
+if TYPE_CHECKING:
+    import pyarrow as pa
+
 
 @task(name="transform_earthquake_data")
 def transform_earthquake_data(raw_data: dict, min_magnitude: float = 0.0) -> list[dict]:
@@ -41,6 +49,11 @@ def transform_earthquake_data(raw_data: dict, min_magnitude: float = 0.0) -> lis
             "detail_url": props.get("url"),
             "felt": props.get("felt"),
             "tsunami": props.get("tsunami"),
+            "updated": (
+                datetime.fromtimestamp(props["updated"] / 1000, tz=timezone.utc)
+                if props.get("updated") is not None
+                else None
+            ),
         }
         rows.append(row)
 
@@ -96,70 +109,233 @@ def transform_weather_data(raw_data: dict) -> list[dict]:
     return rows
 
 
+def _occ_to_float(value: str | None) -> float | None:
+    """Convert an OCC CSV cell to float, or None if blank or unparseable."""
+    if not value or not value.strip():
+        return None
+    try:
+        return float(value.strip())
+    except ValueError:
+        return None
+
+
+def _occ_to_text(value: str | None) -> str | None:
+    """Strip an OCC CSV cell, or return None if blank."""
+    if not value:
+        return None
+    stripped = value.strip()
+    return stripped if stripped else None
+
+
+def _transform_occ_well_row(csv_row: dict) -> dict | None:
+    """Map one OCC wells CSV record to an oklahoma_wells row dict.
+
+    Returns None when the API number is empty so callers can skip it.
+    """
+    api = (csv_row.get("API") or "").strip()
+    if not api:
+        return None
+
+    return {
+        "api": api,
+        "well_records_docs": _occ_to_text(csv_row.get("WELL_RECORDS_DOCS")),
+        "well_name": _occ_to_text(csv_row.get("WELL_NAME")),
+        "well_num": _occ_to_text(csv_row.get("WELL_NUM")),
+        "operator": _occ_to_text(csv_row.get("OPERATOR")),
+        "well_status": _occ_to_text(csv_row.get("WELLSTATUS")),
+        "well_type": _occ_to_text(csv_row.get("WELLTYPE")),
+        "symbol_class": _occ_to_text(csv_row.get("SYMBOL_CLASS")),
+        "sh_lat": _occ_to_float(csv_row.get("SH_LAT")),
+        "sh_lon": _occ_to_float(csv_row.get("SH_LON")),
+        "county": _occ_to_text(csv_row.get("COUNTY")),
+        "section": _occ_to_text(csv_row.get("SECTION")),
+        "township": _occ_to_text(csv_row.get("TOWNSHIP")),
+        "range": _occ_to_text(csv_row.get("RANGE")),
+        "qtr4": _occ_to_text(csv_row.get("QTR4")),
+        "qtr3": _occ_to_text(csv_row.get("QTR3")),
+        "qtr2": _occ_to_text(csv_row.get("QTR2")),
+        "qtr1": _occ_to_text(csv_row.get("QTR1")),
+        "pm": _occ_to_text(csv_row.get("PM")),
+        "footage_ew": _occ_to_float(csv_row.get("FOOTAGE_EW")),
+        "ew": _occ_to_text(csv_row.get("EW")),
+        "footage_ns": _occ_to_float(csv_row.get("FOOTAGE_NS")),
+        "ns": _occ_to_text(csv_row.get("NS")),
+    }
+
+
+def _split_csv_records(csv_text: str, start: int, parts: int) -> list[str]:
+    """Split csv_text[start:] into roughly equal newline-aligned chunks.
+
+    A newline only counts as a record boundary when an even number of
+    quote characters precede it, so quoted fields spanning lines are
+    never cut in half.
+    """
+    step = max((len(csv_text) - start) // parts, 1)
+    bounds = [start]
+    quotes = 0
+    scanned = start
+    next_target = start + step
+
+    while len(bounds) < parts:
+        pos = csv_text.find("\n", next_target)
+        if pos == -1:
+            break
+        quotes += csv_text.count('"', scanned, pos)
+        scanned = pos
+        if quotes % 2:
+            # Inside a quoted field — try the next newline
+            next_target = pos + 1
+            continue
+        bounds.append(pos + 1)
+        next_target = pos + 1 + step
+
+    bounds.append(len(csv_text))
+    return [csv_text[a:b] for a, b in zip(bounds, bounds[1:]) if a < b]
+
+
+def _transform_occ_wells_chunk(fieldnames: list[str] | None, chunk: str) -> list[dict]:
+    """Transform a slice of the OCC wells CSV.
+
+    With fieldnames=None the chunk's first line is read as the header;
+    process pool workers pass the header parsed once by the parent.
+    """
+    rows = []
+    for csv_row in csv.DictReader(io.StringIO(chunk), fieldnames=fieldnames):
+        row = _transform_occ_well_row(csv_row)
+        if row is not None:
+            rows.append(row)
+    return rows
+
+
 @task(name="transform_occ_wells_data")
-def transform_occ_wells_data(csv_text: str) -> list[dict]:
+def transform_occ_wells_data(csv_text: str, workers: int = 1) -> list[dict]:
     """Parse CSV text into a list of row dictionaries.
 
     Each row maps directly to a column in the oklahoma_wells table.
     Skips rows where API is empty or None.
+
+    With workers > 1, the CSV body is split into newline-aligned chunks
+    that are parsed in a ProcessPoolExecutor. Results are concatenated in
+    file order, so the output is identical to the serial path.
     """
-    rows = []
-    reader = csv.DictReader(io.StringIO(csv_text))
+    if workers <= 1:
+        return _transform_occ_wells_chunk(None, csv_text)
 
-    for csv_row in reader:
-        # Skip rows where API is empty or None
-        api = csv_row.get("API", "").strip()
-        if not api:
-            continue
+    header_end = csv_text.find("\n") + 1
+    if header_end == 0:
+        return []
+    fieldnames = next(csv.reader([csv_text[:header_end]]))
 
-        # Helper to convert to float or None
-        def to_float(value: str) -> float | None:
-            if not value or not value.strip():
-                return None
-            try:
-                return float(value.strip())
-            except ValueError:
-                return None
+    # More chunks than workers so a slow chunk doesn't leave cores idle
+    chunks = _split_csv_records(csv_text, header_end, workers * 4)
+    rows = []
+    # spawn, not fork: Prefect runs background threads that fork() could deadlock
+    context = multiprocessing.get_context("spawn")
+    with ProcessPoolExecutor(max_workers=workers, mp_context=context) as pool:
+        for chunk_rows in pool.map(_transform_occ_wells_chunk, repeat(fieldnames), chunks):
+            rows.extend(chunk_rows)
 
-        # Helper to strip text or return None
-        def to_text(value: str) -> str | None:
-            if not value:
-                return None
-            stripped = value.strip()
-            return stripped if stripped else None
+    return rows
 
-        row = {
-            "api": api,
-            "well_records_docs": to_text(csv_row.get("WELL_RECORDS_DOCS")),
-            "well_name": to_text(csv_row.get("WELL_NAME")),
-            "well_num": to_text(csv_row.get("WELL_NUM")),
-            "operator": to_text(csv_row.get("OPERATOR")),
-            "well_status": to_text(csv_row.get("WELLSTATUS")),
-            "well_type": to_text(csv_row.get("WELLTYPE")),
-            "symbol_class": to_text(csv_row.get("SYMBOL_CLASS")),
-            "sh_lat": to_float(csv_row.get("SH_LAT")),
-            "sh_lon": to_float(csv_row.get("SH_LON")),
-            "county": to_text(csv_row.get("COUNTY")),
-            "section": to_text(csv_row.get("SECTION")),
-            "township": to_text(csv_row.get("TOWNSHIP")),
-            "range": to_text(csv_row.get("RANGE")),
-            "qtr4": to_text(csv_row.get("QTR4")),
-            "qtr3": to_text(csv_row.get("QTR3")),
-            "qtr2": to_text(csv_row.get("QTR2")),
-            "qtr1": to_text(csv_row.get("QTR1")),
-            "pm": to_text(csv_row.get("PM")),
-            "footage_ew": to_float(csv_row.get("FOOTAGE_EW")),
-            "ew": to_text(csv_row.get("EW")),
-            "footage_ns": to_float(csv_row.get("FOOTAGE_NS")),
-            "ns": to_text(csv_row.get("NS")),
-        }
-        rows.append(row)
 
-    return rows
+def iter_occ_wells_batches(lines: Iterable[str], batch_size: int) -> Iterator[list[dict]]:
+    """Parse CSV lines incrementally and yield lists of at most batch_size rows.
+
+    Applies the same mapping as transform_occ_wells_data, but only one
+    batch of row dicts is held in memory at a time. Lines must keep their
+    newline terminators so quoted fields spanning lines parse correctly.
+    """
+    batch = []
+    for csv_row in csv.DictReader(lines):
+        row = _transform_occ_well_row(csv_row)
+        if row is None:
+            continue
+        batch.append(row)
+        if len(batch) >= batch_size:
+            yield batch
+            batch = []
+
+    if batch:
+        yield batch
+
+
+# OCC wells CSV header → oklahoma_wells column, in table column order
+_OCC_WELLS_SOURCE_COLUMNS = {
+    "API": "api",
+    "WELL_RECORDS_DOCS": "well_records_docs",
+    "WELL_NAME": "well_name",
+    "WELL_NUM": "well_num",
+    "OPERATOR": "operator",
+    "WELLSTATUS": "well_status",
+    "WELLTYPE": "well_type",
+    "SYMBOL_CLASS": "symbol_class",
+    "SH_LAT": "sh_lat",
+    "SH_LON": "sh_lon",
+    "COUNTY": "county",
+    "SECTION": "section",
+    "TOWNSHIP": "township",
+    "RANGE": "range",
+    "QTR4": "qtr4",
+    "QTR3": "qtr3",
+    "QTR2": "qtr2",
+    "QTR1": "qtr1",
+    "PM": "pm",
+    "FOOTAGE_EW": "footage_ew",
+    "EW": "ew",
+    "FOOTAGE_NS": "footage_ns",
+    "NS": "ns",
+}
+_OCC_WELLS_FLOAT_COLUMNS = {"sh_lat", "sh_lon", "footage_ew", "footage_ns"}
+# Low-cardinality text columns stored as dictionary arrays
+_OCC_WELLS_DICTIONARY_COLUMNS = {"operator", "well_status", "well_type", "symbol_class", "county"}
+# Strings float() accepts; anything else becomes null, as in _occ_to_float
+_FLOAT_PATTERN = r"(?i)^[+-]?((\d+(\.\d*)?|\.\d+)(e[+-]?\d+)?|inf(inity)?|nan)$"
+
+
+@task(name="transform_occ_wells_columnar")
+def transform_occ_wells_columnar(csv_text: str) -> "pa.Table":
+    """Parse CSV text into a pyarrow Table with one typed array per column.
+
+    Columnar alternative to transform_occ_wells_data. Columns are named and
+    ordered like the oklahoma_wells table: footages and coordinates are
+    float64, low-cardinality text columns are dictionary-encoded, and the
+    strip / blank-to-null rules run as vectorized compute kernels instead
+    of per-cell Python calls. Skips rows where API is empty or None.
+
+    Requires the optional ``columnar`` extra (pyarrow).
+    """
+    import pyarrow as pa
+    import pyarrow.compute as pc
+    import pyarrow.csv as pa_csv
+
+    source = pa_csv.read_csv(
+        pa.py_buffer(csv_text.encode()),
+        parse_options=pa_csv.ParseOptions(newlines_in_values=True),
+        convert_options=pa_csv.ConvertOptions(
+            include_columns=list(_OCC_WELLS_SOURCE_COLUMNS),
+            include_missing_columns=True,
+            column_types={name: pa.string() for name in _OCC_WELLS_SOURCE_COLUMNS},
+        ),
+    )
+
+    null_text = pa.scalar(None, pa.string())
+    columns = {}
+    for source_name, column in _OCC_WELLS_SOURCE_COLUMNS.items():
+        values = pc.utf8_trim_whitespace(source[source_name].cast(pa.string()))
+        values = pc.if_else(pc.equal(values, ""), null_text, values)
+        if column in _OCC_WELLS_FLOAT_COLUMNS:
+            numeric = pc.match_substring_regex(values, _FLOAT_PATTERN)
+            values = pc.if_else(numeric, values, null_text).cast(pa.float64())
+        elif column in _OCC_WELLS_DICTIONARY_COLUMNS:
+            values = pc.dictionary_encode(values)
+        columns[column] = values
+
+    table = pa.table(columns)
+    return table.filter(pc.is_valid(table["api"]))
 
 
 @task(name="transform_well_transfers")
-def transform_well_transfers(raw_rows: list[tuple]) -> list[dict]:
+def transform_well_transfers(raw_rows: Iterable[tuple]) -> list[dict]:
     """Transform Excel row tuples into database row dictionaries.
 
     Maps 32 Excel columns to snake_case database columns with proper type conversions.
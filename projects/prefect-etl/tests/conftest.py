@@ -3,6 +3,8 @@
 import pytest
 from prefect.testing.utilities import prefect_test_harness
 
+from pipeline.db import dispose_engines
+
 
 @pytest.fixture(autouse=True, scope="session")
 def prefect_test_fixture():
@@ -13,3 +15,10 @@ def prefect_test_fixture():
     """
     with prefect_test_harness():
         yield
+
+
+@pytest.fixture(autouse=True)
+def reset_engine_registry():
+    """Drop engines cached by pipeline.db so mocked engines don't leak between tests."""
+    yield
+    dispose_engines()
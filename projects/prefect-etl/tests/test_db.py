@@ -0,0 +1,69 @@
+"""Tests for the shared engine registry."""
+
+from unittest.mock import MagicMock, patch
+
+from pipeline.db import check_connection, dispose_engines, get_engine, get_watermark
+
+
+def test_get_engine_reuses_engine_per_url():
+    """The same URL should return the same engine; a different URL gets its own."""
+    with patch("pipeline.db.create_engine", side_effect=lambda url, **kw: MagicMock()) as mock:
+        first = get_engine("postgresql+psycopg2://a")
+        again = get_engine("postgresql+psycopg2://a")
+        other = get_engine("postgresql+psycopg2://b")
+
+    assert first is again
+    assert first is not other
+    assert mock.call_count == 2
+
+
+def test_get_engine_applies_pool_settings():
+    """Engines should be created with the configured pool options."""
+    with patch("pipeline.db.create_engine") as mock_create:
+        get_engine("postgresql+psycopg2://fake")
+
+    kwargs = mock_create.call_args[1]
+    assert kwargs["pool_pre_ping"] is True
+    assert set(kwargs) == {"pool_size", "max_overflow", "pool_pre_ping", "pool_recycle"}
+
+
+def test_dispose_engines_disposes_and_clears():
+    """dispose_engines should dispose every cached engine and forget it."""
+    with patch("pipeline.db.create_engine", side_effect=lambda url, **kw: MagicMock()) as mock:
+        engine = get_engine("postgresql+psycopg2://fake")
+        dispose_engines()
+        new_engine = get_engine("postgresql+psycopg2://fake")
+
+    engine.dispose.assert_called_once()
+    assert new_engine is not engine
+    assert mock.call_count == 2
+
+
+def test_check_connection_uses_shared_engine():
+    """check_connection should run SELECT 1 on the registry engine."""
+    mock_conn = MagicMock()
+    mock_engine = MagicMock()
+    mock_engine.connect.return_value.__enter__ = MagicMock(return_value=mock_conn)
+    mock_engine.connect.return_value.__exit__ = MagicMock(return_value=False)
+
+    with patch("pipeline.db.create_engine", return_value=mock_engine) as mock_create:
+        assert check_connection("postgresql+psycopg2://fake") is True
+        assert check_connection("postgresql+psycopg2://fake") is True
+
+    mock_create.assert_called_once()
+    assert mock_conn.execute.call_count == 2
+
+
+def test_get_watermark_returns_column_maximum():
+    """get_watermark should select MAX(column) and return the scalar."""
+    mock_conn = MagicMock()
+    mock_conn.execute.return_value.scalar.return_value = "2024-01-01T00:00:00+00:00"
+    mock_engine = MagicMock()
+    mock_engine.connect.return_value.__enter__ = MagicMock(return_value=mock_conn)
+    mock_engine.connect.return_value.__exit__ = MagicMock(return_value=False)
+
+    with patch("pipeline.db.create_engine", return_value=mock_engine):
+        result = get_watermark("earthquakes", "updated", "postgresql+psycopg2://fake")
+
+    assert result == "2024-01-01T00:00:00+00:00"
+    assert str(mock_conn.execute.call_args.args[0]) == "SELECT MAX(updated) FROM earthquakes"
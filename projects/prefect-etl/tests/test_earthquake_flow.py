@@ -1,5 +1,6 @@
 """End-to-end tests for the earthquake ETL flow."""
 
+from datetime import datetime, timezone
 from unittest.mock import MagicMock, patch
 
 import pytest
@@ -29,7 +30,7 @@ MOCK_GEOJSON = {
 }
 
 
-@patch("pipeline.tasks.load.create_engine")
+@patch("pipeline.tasks.load.get_engine")
 @patch("pipeline.db.create_engine")
 @patch("pipeline.tasks.extract.httpx.get")
 def test_earthquake_flow_end_to_end(mock_get, mock_db_create_engine, mock_load_create_engine):
@@ -82,3 +83,56 @@ def test_earthquake_flow_fails_on_connection_error(mock_create_engine):
             connection_url="postgresql+psycopg2://fake",
             min_magnitude=0.0,
         )
+
+
+@patch("pipeline.flows.earthquake_flow.load_earthquake_data")
+@patch("pipeline.flows.earthquake_flow.extract_earthquake_window")
+@patch("pipeline.flows.earthquake_flow.get_watermark")
+@patch("pipeline.flows.earthquake_flow.check_connection")
+def test_earthquake_flow_incremental_queries_since_watermark(
+    mock_check, mock_watermark, mock_window, mock_load
+):
+    """Incremental mode should ask only for events updated after the watermark."""
+    watermark = datetime(2024, 1, 1, tzinfo=timezone.utc)
+    mock_watermark.return_value = watermark
+    mock_window.map.return_value.result.return_value = [MOCK_GEOJSON]
+    mock_load.return_value = 1
+
+    result = earthquake_etl_flow(
+        connection_url="postgresql+psycopg2://fake",
+        incremental=True,
+    )
+
+    assert result == 1
+    mock_watermark.assert_called_once_with("earthquakes", "updated", "postgresql+psycopg2://fake")
+    args, kwargs = mock_window.map.call_args
+    assert len(args[1]) == 1
+    assert kwargs["updated_after"].value == watermark
+    rows = mock_load.call_args.args[0]
+    assert [row["id"] for row in rows] == ["test1"]
+
+
+@patch("pipeline.flows.earthquake_flow.load_earthquake_data")
+@patch("pipeline.flows.earthquake_flow.extract_earthquake_window")
+@patch("pipeline.flows.earthquake_flow.check_connection")
+def test_earthquake_flow_backfill_maps_chunked_windows(mock_check, mock_window, mock_load):
+    """A backfill should split the range into chunk_hours windows fetched in parallel."""
+    mock_window.map.return_value.result.return_value = [MOCK_GEOJSON, {"features": []}]
+    mock_load.return_value = 1
+
+    earthquake_etl_flow(
+        connection_url="postgresql+psycopg2://fake",
+        backfill_start=datetime(2024, 1, 1),
+        backfill_end=datetime(2024, 1, 3, 12),
+        chunk_hours=24,
+    )
+
+    args, kwargs = mock_window.map.call_args
+    starts, ends = args[1], args[2]
+    assert starts == [
+        datetime(2024, 1, 1, tzinfo=timezone.utc),
+        datetime(2024, 1, 2, tzinfo=timezone.utc),
+        datetime(2024, 1, 3, tzinfo=timezone.utc),
+    ]
+    assert ends[-1] == datetime(2024, 1, 3, 12, tzinfo=timezone.utc)
+    assert kwargs["updated_after"].value is None
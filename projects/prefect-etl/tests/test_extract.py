@@ -1,12 +1,19 @@
 """Tests for the extract task."""
 
+from datetime import datetime, timedelta, timezone
 from unittest.mock import MagicMock, patch
 
+import pytest
+
 from pipeline.tasks.extract import (
     extract_earthquake_data,
+    extract_earthquake_window,
     extract_occ_wells_data,
     extract_weather_data,
+    extract_weather_locations,
     extract_well_transfers,
+    stream_occ_wells_lines,
+    stream_well_transfers_rows,
 )
 
 
@@ -47,6 +54,82 @@ def test_extract_calls_correct_url():
     mock_get.assert_called_once_with("https://my-custom-url.com/data", timeout=30.0)
 
 
+def test_extract_earthquake_window_sends_fdsn_params():
+    """The window and watermark should become FDSN query parameters."""
+    mock_response = MagicMock()
+    mock_response.json.return_value = {"features": [{"id": "a"}]}
+    mock_response.raise_for_status = MagicMock()
+
+    with patch("pipeline.tasks.extract.httpx.get", return_value=mock_response) as mock_get:
+        result = extract_earthquake_window.fn(
+            "https://fake.usgs.gov/query",
+            datetime(2024, 1, 1, tzinfo=timezone.utc),
+            datetime(2024, 1, 2, tzinfo=timezone.utc),
+            updated_after=datetime(2024, 1, 1, 12, tzinfo=timezone.utc),
+            min_magnitude=2.5,
+        )
+
+    assert result["features"] == [{"id": "a"}]
+    params = mock_get.call_args.kwargs["params"]
+    assert params["starttime"] == "2024-01-01T00:00:00.000"
+    assert params["endtime"] == "2024-01-02T00:00:00.000"
+    assert params["updatedafter"] == "2024-01-01T12:00:00.000"
+    assert params["minmagnitude"] == 2.5
+    assert params["format"] == "geojson"
+
+
+def test_extract_earthquake_window_splits_full_pages():
+    """A window that returns limit events should be halved and deduplicated."""
+    pages = [
+        [{"id": "a"}, {"id": "b"}],  # full page for the whole day
+        [{"id": "a"}],  # first half
+        [{"id": "a"}, {"id": "c"}],  # second half, "a" sits on the boundary
+        [{"id": "c"}],  # first quarter of the second half
+        [],
+    ]
+
+    def fake_get(url, params, timeout):
+        response = MagicMock()
+        response.json.return_value = {"features": pages.pop(0)}
+        return response
+
+    with patch("pipeline.tasks.extract.httpx.get", side_effect=fake_get) as mock_get:
+        result = extract_earthquake_window.fn(
+            "https://fake.usgs.gov/query",
+            datetime(2024, 1, 1, tzinfo=timezone.utc),
+            datetime(2024, 1, 2, tzinfo=timezone.utc),
+            limit=2,
+        )
+
+    assert mock_get.call_count == 5
+    assert [feature["id"] for feature in result["features"]] == ["a", "c"]
+    first_half, second_half = (call.kwargs["params"] for call in mock_get.call_args_list[1:3])
+    assert first_half["endtime"] == "2024-01-01T11:59:59.999"
+    assert second_half["starttime"] == "2024-01-01T12:00:00.000"
+
+
+def test_extract_earthquake_window_full_millisecond_raises():
+    """A window too small to split that still fills a page should fail, not truncate."""
+    mock_response = MagicMock()
+    mock_response.json.return_value = {"features": [{"id": "a"}, {"id": "b"}]}
+    start = datetime(2024, 1, 1, tzinfo=timezone.utc)
+
+    with patch("pipeline.tasks.extract.httpx.get", return_value=mock_response) as mock_get:
+        with pytest.raises(RuntimeError, match="page limit of 2"):
+            extract_earthquake_window.fn(
+                "https://fake.usgs.gov/query", start, start + timedelta(milliseconds=1), limit=2
+            )
+
+    windows = [
+        (call.kwargs["params"]["starttime"], call.kwargs["params"]["endtime"])
+        for call in mock_get.call_args_list
+    ]
+    assert windows == [
+        ("2024-01-01T00:00:00.000", "2024-01-01T00:00:00.001"),
+        ("2024-01-01T00:00:00.000", "2024-01-01T00:00:00.000"),
+    ]
+
+
 def test_extract_weather_returns_dict():
     """extract_weather_data should return parsed JSON as a dict."""
     # Create a fake HTTP response
@@ -85,6 +168,46 @@ def test_extract_weather_calls_correct_url():
     mock_get.assert_called_once_with("https://api.open-meteo.com/v1/forecast", timeout=30.0)
 
 
+def test_extract_weather_locations_fetches_concurrently_with_limit():
+    """Each location should be fetched once, in order, with bounded concurrency."""
+    import asyncio
+    from functools import partial
+
+    import httpx
+
+    in_flight = 0
+    peak = 0
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        nonlocal in_flight, peak
+        in_flight += 1
+        peak = max(peak, in_flight)
+        await asyncio.sleep(0.01)
+        in_flight -= 1
+        params = request.url.params
+        return httpx.Response(
+            200,
+            json={
+                "latitude": float(params["latitude"]),
+                "longitude": float(params["longitude"]),
+                "hourly": {},
+            },
+        )
+
+    client = partial(httpx.AsyncClient, transport=httpx.MockTransport(handler))
+    locations = [(float(i), -float(i)) for i in range(10)]
+
+    with patch("pipeline.tasks.extract.httpx.AsyncClient", client):
+        result = extract_weather_locations.fn(
+            "https://api.open-meteo.com/v1/forecast?latitude=1&longitude=2&hourly=temperature_2m",
+            locations,
+            max_concurrency=3,
+        )
+
+    assert [(r["latitude"], r["longitude"]) for r in result] == locations
+    assert 1 < peak <= 3
+
+
 def test_extract_occ_wells_returns_csv_text():
     """extract_occ_wells_data should return CSV text as a string."""
     # Create a fake HTTP response with CSV text
@@ -113,6 +236,60 @@ def test_extract_occ_wells_calls_correct_url():
     mock_get.assert_called_once_with("https://oklahoma.gov/occ/wells.csv", timeout=120.0)
 
 
+def test_stream_occ_wells_lines_reassembles_chunks():
+    """stream_occ_wells_lines should yield whole lines even when chunks split them."""
+    mock_response = MagicMock()
+    mock_response.encoding = "utf-8"
+    mock_response.iter_bytes.return_value = iter(
+        [b"API,WELL_NA", b"ME\n35001,", b"TEST\n35002,LAST"]
+    )
+    mock_response.raise_for_status = MagicMock()
+    mock_stream = MagicMock()
+    mock_stream.return_value.__enter__ = MagicMock(return_value=mock_response)
+    mock_stream.return_value.__exit__ = MagicMock(return_value=False)
+
+    with patch("pipeline.tasks.extract.httpx.stream", mock_stream):
+        lines = list(stream_occ_wells_lines("https://oklahoma.gov/occ/wells.csv"))
+
+    assert lines == ["API,WELL_NAME\n", "35001,TEST\n", "35002,LAST"]
+    mock_stream.assert_called_once_with("GET", "https://oklahoma.gov/occ/wells.csv", timeout=120.0)
+
+
+def test_extract_occ_wells_returns_none_on_not_modified(tmp_path):
+    """A 304 response should short-circuit to None when change detection is on."""
+    mock_response = MagicMock()
+    mock_response.status_code = 304
+
+    with patch("pipeline.tasks.extract.httpx.get", return_value=mock_response):
+        result = extract_occ_wells_data.fn(
+            "https://fake-url.com/wells.csv", state_path=str(tmp_path / "state.json")
+        )
+
+    assert result is None
+    mock_response.raise_for_status.assert_not_called()
+
+
+def test_extract_occ_wells_returns_none_when_hash_unchanged(tmp_path):
+    """A 200 with the same bytes as the last loaded version should return None."""
+    from pipeline.state import mark_source_loaded
+
+    state_path = str(tmp_path / "state.json")
+    mock_response = MagicMock()
+    mock_response.status_code = 200
+    mock_response.headers = {"etag": '"v1"'}
+    mock_response.content = b"API\n3500100002\n"
+    mock_response.text = "API\n3500100002\n"
+
+    with patch("pipeline.tasks.extract.httpx.get", return_value=mock_response) as mock_get:
+        first = extract_occ_wells_data.fn("https://fake-url.com/wells.csv", state_path=state_path)
+        mark_source_loaded(state_path, "https://fake-url.com/wells.csv")
+        second = extract_occ_wells_data.fn("https://fake-url.com/wells.csv", state_path=state_path)
+
+    assert first == "API\n3500100002\n"
+    assert second is None
+    assert mock_get.call_args[1]["headers"] == {"If-None-Match": '"v1"'}
+
+
 def test_extract_well_transfers_returns_list_of_tuples():
     """extract_well_transfers should return list of row tuples from Excel."""
     from io import BytesIO
@@ -182,3 +359,70 @@ def test_extract_well_transfers_calls_correct_url():
         extract_well_transfers.fn("https://oklahoma.gov/transfers.xlsx")
 
     mock_get.assert_called_once_with("https://oklahoma.gov/transfers.xlsx", timeout=60.0)
+
+
+def _transfers_workbook_bytes(rows):
+    """Build an .xlsx file with a header row followed by rows."""
+    from io import BytesIO
+
+    from openpyxl import Workbook
+
+    wb = Workbook()
+    ws = wb.active
+    ws.append(["EventDate", "API Number", "WellName"])
+    for row in rows:
+        ws.append(row)
+    excel_bytes = BytesIO()
+    wb.save(excel_bytes)
+    return excel_bytes.getvalue()
+
+
+def _mock_stream(content, chunk_size=1000):
+    """Mock httpx.stream serving content in chunk_size pieces."""
+    mock_response = MagicMock()
+    mock_response.status_code = 200
+    mock_response.headers = {}
+    mock_response.iter_bytes.return_value = iter(
+        [content[i : i + chunk_size] for i in range(0, len(content), chunk_size)]
+    )
+    mock_stream = MagicMock()
+    mock_stream.return_value.__enter__ = MagicMock(return_value=mock_response)
+    mock_stream.return_value.__exit__ = MagicMock(return_value=False)
+    return mock_stream
+
+
+def test_stream_well_transfers_rows_yields_rows_lazily():
+    """stream_well_transfers_rows should spool the download and yield data rows."""
+    content = _transfers_workbook_bytes(
+        [["2026-01-12", "3503702931", "SMITH"], ["2026-01-13", "3503702932", "JONES"]]
+    )
+    mock_stream = _mock_stream(content)
+
+    with patch("pipeline.tasks.extract.httpx.stream", mock_stream):
+        rows = stream_well_transfers_rows("https://oklahoma.gov/transfers.xlsx")
+        assert not isinstance(rows, list)
+        result = list(rows)
+
+    assert result == [
+        ("2026-01-12", "3503702931", "SMITH"),
+        ("2026-01-13", "3503702932", "JONES"),
+    ]
+    mock_stream.assert_called_once_with("GET", "https://oklahoma.gov/transfers.xlsx", timeout=120.0)
+
+
+def test_stream_well_transfers_rows_skips_unchanged_source(tmp_path):
+    """A second download with identical bytes should yield nothing."""
+    from pipeline.state import mark_source_loaded
+
+    content = _transfers_workbook_bytes([["2026-01-12", "3503702931", "SMITH"]])
+    state_path = str(tmp_path / "state.json")
+    url = "https://oklahoma.gov/transfers.xlsx"
+
+    with patch("pipeline.tasks.extract.httpx.stream", _mock_stream(content)):
+        first = list(stream_well_transfers_rows(url, state_path=state_path))
+    mark_source_loaded(state_path, url)
+    with patch("pipeline.tasks.extract.httpx.stream", _mock_stream(content)):
+        second = list(stream_well_transfers_rows(url, state_path=state_path))
+
+    assert len(first) == 1
+    assert second == []
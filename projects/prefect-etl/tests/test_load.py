@@ -1,13 +1,17 @@
 """Tests for the load task."""
 
+import json
 from datetime import date
 from unittest.mock import MagicMock, patch
 
 from pipeline.tasks.load import (
+    OCC_WELLS_COLUMNS,
+    _copy_rows,
     load_earthquake_data,
     load_occ_wells_data,
     load_weather_data,
     load_well_transfers,
+    occ_well_row_hash_sql,
 )
 
 SAMPLE_ROWS = [
@@ -25,6 +29,7 @@ SAMPLE_ROWS = [
         "detail_url": "https://example.com",
         "felt": None,
         "tsunami": 0,
+        "updated": "2024-01-01T00:05:00+00:00",
     },
 ]
 
@@ -42,7 +47,7 @@ def test_load_executes_and_returns_count():
     mock_engine.connect.return_value.__enter__ = MagicMock(return_value=mock_conn)
     mock_engine.connect.return_value.__exit__ = MagicMock(return_value=False)
 
-    with patch("pipeline.tasks.load.create_engine", return_value=mock_engine):
+    with patch("pipeline.tasks.load.get_engine", return_value=mock_engine):
         result = load_earthquake_data.fn(SAMPLE_ROWS, "postgresql+psycopg2://fake")
 
     assert result == 1
@@ -50,6 +55,21 @@ def test_load_executes_and_returns_count():
     mock_conn.commit.assert_called_once()
 
 
+def test_load_earthquakes_skips_unchanged_updated_stamp():
+    """The upsert should only rewrite events whose updated stamp changed."""
+    mock_conn = MagicMock()
+    mock_engine = MagicMock()
+    mock_engine.connect.return_value.__enter__ = MagicMock(return_value=mock_conn)
+    mock_engine.connect.return_value.__exit__ = MagicMock(return_value=False)
+
+    with patch("pipeline.tasks.load.get_engine", return_value=mock_engine):
+        load_earthquake_data.fn(SAMPLE_ROWS, "postgresql+psycopg2://fake")
+
+    sql = str(mock_conn.execute.call_args.args[0])
+    assert "updated = EXCLUDED.updated" in sql
+    assert "WHERE earthquakes.updated IS DISTINCT FROM EXCLUDED.updated" in sql
+
+
 SAMPLE_WEATHER_ROWS = [
     {
         "id": "40.71_-73.99_2024-01-01T00:00",
@@ -69,6 +89,28 @@ def test_load_weather_returns_zero_for_empty_rows():
     assert result == 0
 
 
+def test_load_weather_sends_one_batched_statement():
+    """All rows should go in a single unnest() upsert with duplicate ids collapsed."""
+    mock_conn = MagicMock()
+    mock_engine = MagicMock()
+    mock_engine.connect.return_value.__enter__ = MagicMock(return_value=mock_conn)
+    mock_engine.connect.return_value.__exit__ = MagicMock(return_value=False)
+    rows = [
+        dict(SAMPLE_WEATHER_ROWS[0], id=f"site_{i % 3}", temperature_f=float(i))
+        for i in range(5)
+    ]
+
+    with patch("pipeline.tasks.load.get_engine", return_value=mock_engine):
+        result = load_weather_data.fn(rows, "postgresql+psycopg2://fake")
+
+    assert result == 3
+    mock_conn.execute.assert_called_once()
+    sql, params = mock_conn.execute.call_args[0]
+    assert "unnest(" in str(sql)
+    assert params["id"] == ["site_0", "site_1", "site_2"]
+    assert params["temperature_f"] == [3.0, 4.0, 2.0]
+
+
 def test_load_weather_executes_and_returns_count():
     """Should execute SQL for each row and return the count."""
     mock_conn = MagicMock()
@@ -76,7 +118,7 @@ def test_load_weather_executes_and_returns_count():
     mock_engine.connect.return_value.__enter__ = MagicMock(return_value=mock_conn)
     mock_engine.connect.return_value.__exit__ = MagicMock(return_value=False)
 
-    with patch("pipeline.tasks.load.create_engine", return_value=mock_engine):
+    with patch("pipeline.tasks.load.get_engine", return_value=mock_engine):
         result = load_weather_data.fn(SAMPLE_WEATHER_ROWS, "postgresql+psycopg2://fake")
 
     assert result == 1
@@ -114,26 +156,121 @@ SAMPLE_OCC_WELLS_ROWS = [
 
 
 def test_load_occ_wells_returns_zero_for_empty_rows():
-    """Should return 0 immediately when given no rows — no DB calls."""
+    """Should return zero counts immediately when given no rows — no DB calls."""
     result = load_occ_wells_data.fn([], "postgresql+psycopg2://fake")
-    assert result == 0
+    assert result == {"inserted": 0, "updated": 0, "unchanged": 0}
 
 
 def test_load_occ_wells_executes_and_returns_count():
-    """Should execute SQL for each row and return the count."""
+    """Should execute SQL for each row and return the counts."""
     mock_conn = MagicMock()
+    mock_conn.execute.return_value.first.return_value = MagicMock(inserted=True)
     mock_engine = MagicMock()
     mock_engine.connect.return_value.__enter__ = MagicMock(return_value=mock_conn)
     mock_engine.connect.return_value.__exit__ = MagicMock(return_value=False)
 
-    with patch("pipeline.tasks.load.create_engine", return_value=mock_engine):
+    with patch("pipeline.tasks.load.get_engine", return_value=mock_engine):
         result = load_occ_wells_data.fn(SAMPLE_OCC_WELLS_ROWS, "postgresql+psycopg2://fake")
 
-    assert result == 1
+    assert result == {"inserted": 1, "updated": 0, "unchanged": 0}
     assert mock_conn.execute.call_count == 1
+    sql, params = mock_conn.execute.call_args[0]
+    assert json.loads(params["row"])["api"] == SAMPLE_OCC_WELLS_ROWS[0]["api"]
+    assert "jsonb_populate_record(NULL::oklahoma_wells" in str(sql)
+    assert occ_well_row_hash_sql("r") in str(sql)
     mock_conn.commit.assert_called_once()
 
 
+def test_load_occ_wells_sends_non_finite_floats_as_float8_text():
+    """NaN and infinite cells must not become JSON the JSONB cast rejects."""
+    row = {
+        **SAMPLE_OCC_WELLS_ROWS[0],
+        "sh_lat": float("nan"), "sh_lon": float("-inf"), "footage_ew": float("inf"),
+    }
+    mock_conn = MagicMock()
+    mock_conn.execute.return_value.first.return_value = MagicMock(inserted=True)
+    mock_engine = MagicMock()
+    mock_engine.connect.return_value.__enter__ = MagicMock(return_value=mock_conn)
+    mock_engine.connect.return_value.__exit__ = MagicMock(return_value=False)
+
+    with patch("pipeline.tasks.load.get_engine", return_value=mock_engine):
+        load_occ_wells_data.fn([row], "postgresql+psycopg2://fake")
+
+    payload = mock_conn.execute.call_args[0][1]["row"]
+    assert "NaN," not in payload and "Infinity," not in payload
+    sent = json.loads(payload)
+    assert (sent["sh_lat"], sent["sh_lon"], sent["footage_ew"]) == ("NaN", "-Infinity", "Infinity")
+    assert sent["footage_ns"] == 990.0
+
+
+def test_load_occ_wells_counts_updated_and_unchanged():
+    """Rows skipped by the row_hash guard return nothing and count as unchanged."""
+    mock_conn = MagicMock()
+    mock_conn.execute.return_value.first.side_effect = [MagicMock(inserted=False), None]
+    mock_engine = MagicMock()
+    mock_engine.connect.return_value.__enter__ = MagicMock(return_value=mock_conn)
+    mock_engine.connect.return_value.__exit__ = MagicMock(return_value=False)
+
+    with patch("pipeline.tasks.load.get_engine", return_value=mock_engine):
+        result = load_occ_wells_data.fn(SAMPLE_OCC_WELLS_ROWS * 2, "postgresql+psycopg2://fake")
+
+    assert result == {"inserted": 0, "updated": 1, "unchanged": 1}
+    sql = str(mock_conn.execute.call_args[0][0])
+    assert "IS DISTINCT FROM EXCLUDED.row_hash" in sql
+
+
+def test_occ_well_row_hash_covers_every_content_column():
+    """The SQL fingerprint should hash every content column as one typed row."""
+    expression = occ_well_row_hash_sql("s")
+    assert expression.startswith("md5(ROW(s.api, s.well_records_docs,")
+    assert expression.endswith("s.footage_ns, s.ns)::text)")
+    assert expression.count("s.") == len(OCC_WELLS_COLUMNS)
+
+
+def test_load_occ_wells_bulk_copies_and_merges_once():
+    """Bulk mode should COPY rows into staging and merge with a single statement."""
+    mock_conn = MagicMock()
+    mock_conn.execute.return_value.one.return_value = MagicMock(inserted=1, updated=1)
+    mock_cursor = mock_conn.connection.cursor.return_value
+    mock_engine = MagicMock()
+    mock_engine.connect.return_value.__enter__ = MagicMock(return_value=mock_conn)
+    mock_engine.connect.return_value.__exit__ = MagicMock(return_value=False)
+
+    with patch("pipeline.tasks.load.get_engine", return_value=mock_engine):
+        result = load_occ_wells_data.fn(
+            SAMPLE_OCC_WELLS_ROWS * 3, "postgresql+psycopg2://fake", bulk=True
+        )
+
+    assert result == {"inserted": 1, "updated": 1, "unchanged": 1}
+    # CREATE TEMP TABLE + one merge, regardless of row count
+    assert mock_conn.execute.call_count == 2
+    merge_sql = str(mock_conn.execute.call_args_list[1][0][0])
+    assert "ON CONFLICT (api)" in merge_sql
+    assert occ_well_row_hash_sql("s") in merge_sql
+    mock_cursor.copy_expert.assert_called_once()
+    assert "row_hash" not in mock_cursor.copy_expert.call_args[0][0]
+    mock_conn.commit.assert_called_once()
+
+
+def test_copy_rows_writes_csv_with_nulls_and_chunks():
+    """_copy_rows should serialize None as empty fields and flush per chunk."""
+    mock_conn = MagicMock()
+    mock_cursor = mock_conn.connection.cursor.return_value
+    payloads = []
+    mock_cursor.copy_expert.side_effect = lambda sql, buf: payloads.append(buf.read())
+
+    rows = [dict(SAMPLE_OCC_WELLS_ROWS[0], api=str(i), well_num=None) for i in range(5)]
+    copied = _copy_rows(mock_conn, "stage", OCC_WELLS_COLUMNS, rows, chunk_size=2)
+
+    assert copied == 5
+    assert mock_cursor.copy_expert.call_count == 3
+    sql = mock_cursor.copy_expert.call_args[0][0]
+    assert sql.startswith("COPY stage (api, well_records_docs,")
+    first_line = payloads[0].splitlines()[0]
+    assert first_line.startswith("0,http://example.com,PENN MUTUAL LIFE,,")
+    mock_cursor.close.assert_called_once()
+
+
 SAMPLE_WELL_TRANSFER_ROWS = [
     {
         "event_date": date(2026, 1, 12),
@@ -185,7 +322,7 @@ def test_load_well_transfers_executes_and_returns_count():
     mock_engine.connect.return_value.__enter__ = MagicMock(return_value=mock_conn)
     mock_engine.connect.return_value.__exit__ = MagicMock(return_value=False)
 
-    with patch("pipeline.tasks.load.create_engine", return_value=mock_engine):
+    with patch("pipeline.tasks.load.get_engine", return_value=mock_engine):
         result = load_well_transfers.fn(
             SAMPLE_WELL_TRANSFER_ROWS, "postgresql+psycopg2://fake"
         )
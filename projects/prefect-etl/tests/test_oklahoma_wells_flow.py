@@ -1,6 +1,8 @@
 """Tests for the Oklahoma wells ETL flow."""
 
-from unittest.mock import patch
+from unittest.mock import MagicMock, patch
+
+import pytest
 
 from pipeline.flows.oklahoma_wells_flow import oklahoma_wells_etl_flow
 
@@ -17,7 +19,7 @@ def test_flow_composes_tasks_and_returns_loaded_count():
         # Configure mock return values
         mock_extract.return_value = "API,WELL_NAME\n3500100002,TEST\n"
         mock_transform.return_value = [{"api": "3500100002", "well_name": "TEST"}]
-        mock_load.return_value = 1
+        mock_load.return_value = {"inserted": 1, "updated": 0, "unchanged": 0}
 
         # Run the flow
         result = oklahoma_wells_etl_flow(
@@ -41,12 +43,95 @@ def test_flow_uses_default_config():
         patch("pipeline.flows.oklahoma_wells_flow.check_connection"),
         patch("pipeline.flows.oklahoma_wells_flow.extract_occ_wells_data") as mock_extract,
         patch("pipeline.flows.oklahoma_wells_flow.transform_occ_wells_data"),
-        patch("pipeline.flows.oklahoma_wells_flow.load_occ_wells_data"),
+        patch("pipeline.flows.oklahoma_wells_flow.load_occ_wells_data") as mock_load,
     ):
         mock_extract.return_value = "API\n"
+        mock_load.return_value = {"inserted": 0, "updated": 0, "unchanged": 0}
 
         # Run without explicit arguments
         oklahoma_wells_etl_flow()
 
         # Verify extract was called (config would have been used)
         mock_extract.assert_called_once()
+
+
+def test_flow_stream_mode_loads_each_batch():
+    """In stream mode the flow should load batches without the full-file extract task."""
+    with (
+        patch("pipeline.flows.oklahoma_wells_flow.check_connection"),
+        patch("pipeline.flows.oklahoma_wells_flow.extract_occ_wells_data") as mock_extract,
+        patch("pipeline.flows.oklahoma_wells_flow.stream_occ_wells_lines") as mock_stream,
+        patch("pipeline.flows.oklahoma_wells_flow.load_occ_wells_data") as mock_load,
+    ):
+        mock_stream.return_value = iter(
+            ["API,WELL_NAME\n", "3500100001,A\n", "3500100002,B\n", "3500100003,C\n"]
+        )
+        mock_load.side_effect = lambda batch, url, bulk: {
+            "inserted": len(batch), "updated": 0, "unchanged": 0
+        }
+
+        result = oklahoma_wells_etl_flow(
+            csv_url="https://fake-url.com/wells.csv",
+            connection_url="postgresql+psycopg2://fake",
+            stream=True,
+            batch_size=2,
+        )
+
+        mock_extract.assert_not_called()
+        assert mock_load.call_count == 2
+        assert result == 3
+
+
+def test_flow_exits_early_when_source_unchanged(tmp_path):
+    """When extract reports the source unchanged, nothing should be transformed or loaded."""
+    with (
+        patch("pipeline.flows.oklahoma_wells_flow.check_connection"),
+        patch("pipeline.flows.oklahoma_wells_flow.extract_occ_wells_data") as mock_extract,
+        patch("pipeline.flows.oklahoma_wells_flow.transform_occ_wells_data") as mock_transform,
+        patch("pipeline.flows.oklahoma_wells_flow.load_occ_wells_data") as mock_load,
+        patch("pipeline.flows.oklahoma_wells_flow.mark_source_loaded") as mock_mark,
+    ):
+        mock_extract.return_value = None
+
+        result = oklahoma_wells_etl_flow(
+            csv_url="https://fake-url.com/wells.csv",
+            connection_url="postgresql+psycopg2://fake",
+            state_path=str(tmp_path / "state.json"),
+        )
+
+        assert result == 0
+        mock_transform.assert_not_called()
+        mock_load.assert_not_called()
+        mock_mark.assert_not_called()
+
+
+def test_flow_columnar_mode_uses_columnar_tasks():
+    """columnar=True should route through the columnar transform and load tasks."""
+    with (
+        patch("pipeline.flows.oklahoma_wells_flow.check_connection"),
+        patch("pipeline.flows.oklahoma_wells_flow.extract_occ_wells_data") as mock_extract,
+        patch("pipeline.flows.oklahoma_wells_flow.transform_occ_wells_data") as mock_transform,
+        patch(
+            "pipeline.flows.oklahoma_wells_flow.transform_occ_wells_columnar"
+        ) as mock_columnar,
+        patch("pipeline.flows.oklahoma_wells_flow.load_occ_wells_columnar") as mock_load,
+    ):
+        mock_extract.return_value = "API\n3500100002\n"
+        mock_columnar.return_value = MagicMock(num_rows=1)
+        mock_load.return_value = {"inserted": 0, "updated": 1, "unchanged": 0}
+
+        result = oklahoma_wells_etl_flow(
+            csv_url="https://fake-url.com/wells.csv",
+            connection_url="postgresql+psycopg2://fake",
+            columnar=True,
+        )
+
+        mock_transform.assert_not_called()
+        mock_load.assert_called_once_with(mock_columnar.return_value, "postgresql+psycopg2://fake")
+        assert result == 1
+
+
+def test_flow_rejects_stream_with_columnar():
+    """Streaming and columnar modes are mutually exclusive."""
+    with pytest.raises(ValueError, match="columnar"):
+        oklahoma_wells_etl_flow(stream=True, columnar=True)
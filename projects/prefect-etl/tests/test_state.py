@@ -0,0 +1,47 @@
+"""Tests for the source change-detection state store."""
+
+from pipeline.state import (
+    conditional_headers,
+    mark_source_loaded,
+    record_source_version,
+    sha256_hex,
+)
+
+URL = "https://oklahoma.gov/occ/wells.csv"
+
+
+def test_conditional_headers_empty_without_state(tmp_path):
+    """No state file means no conditional headers."""
+    assert conditional_headers(str(tmp_path / "state.json"), URL) == {}
+
+
+def test_pending_version_only_used_after_mark_loaded(tmp_path):
+    """Validators should only be sent once the flow has marked the load complete."""
+    state_path = str(tmp_path / "state.json")
+    headers = {"etag": '"abc"', "last-modified": "Wed, 01 Jan 2025 00:00:00 GMT"}
+
+    assert record_source_version(state_path, URL, headers, sha256_hex(b"v1")) is True
+    assert conditional_headers(state_path, URL) == {}
+
+    mark_source_loaded(state_path, URL)
+    assert conditional_headers(state_path, URL) == {
+        "If-None-Match": '"abc"',
+        "If-Modified-Since": "Wed, 01 Jan 2025 00:00:00 GMT",
+    }
+
+
+def test_record_source_version_detects_unchanged_hash(tmp_path):
+    """Identical content should report unchanged even without validators."""
+    state_path = str(tmp_path / "state.json")
+    record_source_version(state_path, URL, {}, sha256_hex(b"v1"))
+    mark_source_loaded(state_path, URL)
+
+    assert record_source_version(state_path, URL, {}, sha256_hex(b"v1")) is False
+    assert record_source_version(state_path, URL, {}, sha256_hex(b"v2")) is True
+
+
+def test_mark_source_loaded_without_pending_is_noop(tmp_path):
+    """Marking a URL that was never recorded should not create state."""
+    state_path = tmp_path / "state.json"
+    mark_source_loaded(str(state_path), URL)
+    assert not state_path.exists()
@@ -1,8 +1,9 @@
 """Tests for the transform task."""
 
-from datetime import date, datetime
+from datetime import date, datetime, timezone
 
 from pipeline.tasks.transform import (
+    iter_occ_wells_batches,
     transform_earthquake_data,
     transform_occ_wells_data,
     transform_weather_data,
@@ -19,6 +20,7 @@ SAMPLE_GEOJSON = {
                 "mag": 4.5,
                 "place": "10km NW of Somewhere",
                 "time": 1700000000000,  # epoch milliseconds
+                "updated": 1700003600000,
                 "magType": "ml",
                 "type": "earthquake",
                 "title": "M 4.5 - 10km NW of Somewhere",
@@ -76,6 +78,13 @@ def test_transform_converts_timestamp():
     assert occurred_at.month == 11
 
 
+def test_transform_converts_updated_stamp():
+    """Should convert the updated epoch to a datetime, or None when missing."""
+    result = transform_earthquake_data.fn(SAMPLE_GEOJSON)
+    assert result[0]["updated"] == datetime(2023, 11, 14, 23, 13, 20, tzinfo=timezone.utc)
+    assert result[1]["updated"] is None
+
+
 def test_transform_filters_by_min_magnitude():
     """Should exclude events below min_magnitude."""
     result = transform_earthquake_data.fn(SAMPLE_GEOJSON, min_magnitude=2.0)
@@ -265,6 +274,53 @@ def test_transform_occ_wells_strips_whitespace():
     assert result[0]["well_name"] == "TEST WELL"
 
 
+def test_iter_occ_wells_batches_matches_serial_transform():
+    """Streaming batches should contain exactly the rows of the serial transform."""
+    lines = SAMPLE_OCC_CSV.splitlines(keepends=True)
+    batches = list(iter_occ_wells_batches(lines, batch_size=1))
+
+    assert all(len(batch) == 1 for batch in batches)
+    assert [row for batch in batches for row in batch] == transform_occ_wells_data.fn(
+        SAMPLE_OCC_CSV
+    )
+
+
+def test_iter_occ_wells_batches_handles_quoted_newlines():
+    """Quoted fields spanning lines should parse as a single record."""
+    lines = ['API,WELL_NAME\n', '3500100002,"TWO\n', 'LINES"\n']
+    batches = list(iter_occ_wells_batches(lines, batch_size=10))
+    assert batches == [[transform_occ_wells_data.fn("".join(lines))[0]]]
+    assert batches[0][0]["well_name"] == "TWO\nLINES"
+
+
+def test_transform_occ_wells_parallel_matches_serial():
+    """The process-pool path should return exactly the serial output, in order."""
+    body = "".join(
+        f'35001{i:05d},"NAME {i}\nSECOND LINE",{i}.5\n'
+        if i % 7 == 0
+        else f"35001{i:05d},N{i},{i}\n"
+        for i in range(200)
+    )
+    csv_text = "API,WELL_NAME,SH_LAT\n" + body
+
+    serial = transform_occ_wells_data.fn(csv_text)
+    parallel = transform_occ_wells_data.fn(csv_text, workers=2)
+
+    assert len(serial) == 200
+    assert parallel == serial
+
+
+def test_split_csv_records_respects_quoted_newlines():
+    """Chunks should only break at newlines outside quoted fields."""
+    from pipeline.tasks.transform import _split_csv_records
+
+    csv_text = 'H\n"a\nb"\n"c\nd"\ne\n'
+    chunks = _split_csv_records(csv_text, 2, parts=4)
+
+    assert "".join(chunks) == csv_text[2:]
+    assert all(chunk.count('"') % 2 == 0 for chunk in chunks)
+
+
 def test_transform_occ_wells_handles_empty_csv():
     """Should return an empty list when CSV has only headers."""
     result = transform_occ_wells_data.fn("API,WELL_NAME\n")
@@ -19,7 +19,7 @@ MOCK_WEATHER_DATA = {
 }
 
 
-@patch("pipeline.tasks.load.create_engine")
+@patch("pipeline.tasks.load.get_engine")
 @patch("pipeline.db.create_engine")
 @patch("pipeline.tasks.extract.httpx.get")
 def test_weather_flow_end_to_end(mock_get, mock_db_create_engine, mock_load_create_engine):
@@ -54,8 +54,8 @@ def test_weather_flow_end_to_end(mock_get, mock_db_create_engine, mock_load_crea
     # Verify check_connection was called
     mock_db_create_engine.assert_called_once()
     mock_check_conn.execute.assert_called_once()
-    # Verify load happened (2 rows)
-    assert mock_conn.execute.call_count == 2
+    # Verify load happened (2 rows in one batched statement)
+    mock_conn.execute.assert_called_once()
     mock_conn.commit.assert_called_once()
 
 
@@ -70,3 +70,30 @@ def test_weather_flow_fails_on_connection_error(mock_create_engine):
             api_url="https://fake-weather-api.com",
             connection_url="postgresql+psycopg2://fake",
         )
+
+
+@patch("pipeline.flows.weather_flow.load_weather_data")
+@patch("pipeline.flows.weather_flow.extract_weather_locations")
+@patch("pipeline.flows.weather_flow.extract_weather_data")
+@patch("pipeline.flows.weather_flow.check_connection")
+def test_weather_flow_multiple_locations(mock_check, mock_single, mock_multi, mock_load):
+    """A locations list should fetch concurrently and load every site's rows at once."""
+    second_site = dict(MOCK_WEATHER_DATA, latitude=35.47, longitude=-97.52)
+    mock_multi.return_value = [MOCK_WEATHER_DATA, second_site]
+    mock_load.side_effect = lambda rows, url: len(rows)
+
+    result = weather_forecast_etl_flow(
+        api_url="https://fake.open-meteo.com",
+        connection_url="postgresql+psycopg2://fake",
+        locations=[(40.71, -73.99), (35.47, -97.52)],
+        max_concurrency=5,
+    )
+
+    assert result == 4
+    mock_single.assert_not_called()
+    mock_multi.assert_called_once_with(
+        "https://fake.open-meteo.com", [(40.71, -73.99), (35.47, -97.52)], 5
+    )
+    mock_load.assert_called_once()
+    loaded_ids = {row["id"] for row in mock_load.call_args[0][0]}
+    assert "35.47_-97.52_2024-01-01T00:00" in loaded_ids
@@ -99,7 +99,7 @@ def create_mock_excel_response():
     return excel_bytes.read()
 
 
-@patch("pipeline.tasks.load.create_engine")
+@patch("pipeline.tasks.load.get_engine")
 @patch("pipeline.db.create_engine")
 @patch("pipeline.tasks.extract.httpx.get")
 def test_well_transfers_flow_end_to_end(
@@ -152,3 +152,52 @@ def test_well_transfers_flow_fails_on_connection_error(mock_create_engine):
             xlsx_url="https://fake.oklahoma.gov/transfers.xlsx",
             connection_url="postgresql+psycopg2://fake",
         )
+
+
+@patch("pipeline.tasks.load.get_engine")
+@patch("pipeline.db.create_engine")
+@patch("pipeline.tasks.extract.httpx.get")
+def test_well_transfers_flow_skips_unchanged_source(
+    mock_get, mock_db_create_engine, mock_load_create_engine, tmp_path
+):
+    """Second run with identical bytes should load nothing."""
+    mock_response = MagicMock()
+    mock_response.status_code = 200
+    mock_response.headers = {}
+    mock_response.content = create_mock_excel_response()
+    mock_get.return_value = mock_response
+
+    state_path = str(tmp_path / "state.json")
+    first = well_transfers_etl_flow(
+        xlsx_url="https://fake.oklahoma.gov/transfers.xlsx",
+        connection_url="postgresql+psycopg2://fake",
+        state_path=state_path,
+    )
+    second = well_transfers_etl_flow(
+        xlsx_url="https://fake.oklahoma.gov/transfers.xlsx",
+        connection_url="postgresql+psycopg2://fake",
+        state_path=state_path,
+    )
+
+    assert first == 1
+    assert second == 0
+
+
+@patch("pipeline.flows.well_transfers_flow.load_well_transfers")
+@patch("pipeline.flows.well_transfers_flow.stream_well_transfers_rows")
+@patch("pipeline.flows.well_transfers_flow.check_connection")
+def test_well_transfers_flow_stream_loads_in_batches(mock_check, mock_stream, mock_load):
+    """Stream mode should transform and load batch_size rows at a time."""
+    raw_row = (datetime(2026, 1, 12), "3503702931", "SMITH")
+    mock_stream.return_value = iter([raw_row] * 5)
+    mock_load.side_effect = lambda rows, url: len(rows)
+
+    result = well_transfers_etl_flow(
+        xlsx_url="https://fake.oklahoma.gov/transfers.xlsx",
+        connection_url="postgresql+psycopg2://fake",
+        stream=True,
+        batch_size=2,
+    )
+
+    assert result == 5
+    assert [len(call.args[0]) for call in mock_load.call_args_list] == [2, 2, 1]